@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Benchmark: threaded Flask server vs the asyncio serving mode under many live dashboard connections
+"""
+import os
+import sys
+import json
+import time
+import asyncio
+import logging
+import argparse
+import threading
+import subprocess
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+POLL_CONCURRENCY = 50  # Clients polling /api/sensor_data
+POLL_SECONDS = 3.0
+READINGS = 8  # Collector ticks published while the streams are open
+READING_INTERVAL = 0.25  # Seconds between them
+OPEN_CONCURRENCY = 100  # Streams being opened at once
+
+# ---- Load client (runs in its own process, so it does not share the server's GIL) ----
+
+async def _get(reader, writer, path):
+    """One request; False if the server closes the connection after it"""
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: bench\r\n\r\n".encode())
+    head = await reader.readuntil(b'\r\n\r\n')
+    length = int(head.split(b'Content-Length: ', 1)[1].split(b'\r\n', 1)[0])
+    await reader.readexactly(length)
+    return b'Connection: close' not in head
+
+async def poll(host, port, seconds, concurrency):
+    """Requests/s and latency of /api/sensor_data, reusing connections when the server allows it"""
+    latencies = []
+    deadline = time.perf_counter() + seconds
+
+    async def worker():
+        writer = None
+        try:
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                if writer is None:
+                    reader, writer = await asyncio.open_connection(host, port)
+                if not await _get(reader, writer, '/api/sensor_data'):
+                    writer.close()
+                    writer = None
+                latencies.append(time.perf_counter() - start)
+        finally:
+            if writer is not None:
+                writer.close()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    latencies.sort()
+    return {
+        'requests_per_s': len(latencies) / (time.perf_counter() - started),
+        'p50_ms': latencies[len(latencies) // 2] * 1000,
+        'p99_ms': latencies[int(len(latencies) * 0.99)] * 1000,
+    }
+
+async def open_stream(host, port, semaphore):
+    """An /api/stream connection, returned once its initial reading arrived"""
+    async with semaphore:
+        reader, writer = await asyncio.open_connection(host, port)
+        writer.write(b"GET /api/stream HTTP/1.1\r\nHost: bench\r\n\r\n")
+        await reader.readuntil(b'event: reading\n')
+        return reader, writer
+
+async def receive_readings(reader, latencies, expected, timeout):
+    """Records the delay from each reading's tick timestamp to its arrival"""
+    buffer = b''
+    received = 0
+    deadline = time.time() + timeout
+    while received < expected and time.time() < deadline:
+        try:
+            data = await asyncio.wait_for(reader.read(65536), deadline - time.time())
+        except asyncio.TimeoutError:
+            break
+        if not data:
+            break
+        buffer += data
+        *events, buffer = buffer.split(b'\n\n')
+        for event in events:
+            if b'event: reading' not in event:
+                continue
+            payload = json.loads(event.split(b'data: ', 1)[1])
+            latencies.append(time.time() - datetime.fromisoformat(payload['timestamp']).timestamp())
+            received += 1
+    return received
+
+async def client(host, port, streams, poll_seconds):
+    results = {'poll': await poll(host, port, poll_seconds, POLL_CONCURRENCY)}
+
+    semaphore = asyncio.Semaphore(OPEN_CONCURRENCY)
+    started = time.perf_counter()
+    connections = await asyncio.gather(*(open_stream(host, port, semaphore) for _ in range(streams)))
+    results['open_s'] = time.perf_counter() - started
+    print('READY', flush=True)  # The server process now publishes READINGS ticks
+
+    latencies = []
+    timeout = READINGS * READING_INTERVAL + 30
+    received = await asyncio.gather(*(receive_readings(reader, latencies, READINGS, timeout)
+                                      for reader, _ in connections))
+    latencies.sort()
+    results['fanout'] = {
+        'delivered': sum(received),
+        'expected': READINGS * streams,
+        'p50_ms': latencies[len(latencies) // 2] * 1000 if latencies else None,
+        'p99_ms': latencies[int(len(latencies) * 0.99)] * 1000 if latencies else None,
+    }
+    results['poll_with_streams'] = await poll(host, port, poll_seconds, POLL_CONCURRENCY)
+    for _, writer in connections:
+        writer.close()
+    print(json.dumps(results), flush=True)
+
+# ---- Server side ----
+
+def rss_mb():
+    with open('/proc/self/status') as status:
+        for line in status:
+            if line.startswith('VmRSS:'):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+def start_threaded(web):
+    from werkzeug.serving import make_server
+    server = make_server('127.0.0.1', 0, web.app, threaded=True)
+    server.request_queue_size = 2048
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server.server_address[:2], server.shutdown
+
+def start_asyncio(web):
+    from src.async_server import start_in_thread
+    server = start_in_thread()
+    return server.address, lambda: None
+
+def run_mode(web, mode, streams, poll_seconds):
+    address, stop = (start_asyncio if mode == 'asyncio' else start_threaded)(web)
+    web._publish_snapshot(web.devices.default, time.time(), {'temperature': 95.0}, {'pressure': 1.0}, 100.0)
+    baseline_threads = threading.active_count()
+    process = subprocess.Popen([sys.executable, __file__, '--client', address[0], str(address[1]),
+                                str(streams), str(poll_seconds)], stdout=subprocess.PIPE, text=True)
+    try:
+        line = process.stdout.readline()
+        if line.strip() != 'READY':
+            raise RuntimeError(f"Load client failed in {mode} mode")
+        threads, memory = threading.active_count() - baseline_threads, rss_mb()
+        for i in range(READINGS):
+            time.sleep(READING_INTERVAL)
+            web._publish_snapshot(web.devices.default, time.time(), {'temperature': 95.0 + i}, {'pressure': 1.0}, 100.0)
+        results = json.loads(process.stdout.readline())
+        process.wait(timeout=60)
+    finally:
+        if process.poll() is None:
+            process.kill()
+        stop()
+    results.update(mode=mode, threads=threads, rss_mb=memory)
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--streams', type=int, default=1000, help='Concurrent /api/stream clients')
+    parser.add_argument('--poll-seconds', type=float, default=POLL_SECONDS)
+    parser.add_argument('--modes', default='threaded,asyncio')
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)  # No per-request log lines from werkzeug
+    from src import web_app as web
+    web.STREAM_KEEPALIVE = 1  # Threaded streams notice their client left within a second
+    print(f"{args.streams} streams, {POLL_CONCURRENCY} polling connections, {os.cpu_count()} CPU(s) "
+          f"shared by server and load client")
+    print(f"{'mode':<9} {'poll req/s':>10} {'p99 ms':>7} {'open s':>7} {'threads':>8} {'RSS MB':>7} "
+          f"{'fan-out p50/p99 ms':>19} {'delivered':>10} {'poll req/s*':>11} {'p99 ms*':>8}")
+    for mode in args.modes.split(','):
+        r = run_mode(web, mode, args.streams, args.poll_seconds)
+        fanout = r['fanout']
+        print(f"{mode:<9} {r['poll']['requests_per_s']:>10.0f} {r['poll']['p99_ms']:>7.1f} {r['open_s']:>7.2f} "
+              f"{r['threads']:>8} {r['rss_mb']:>7.0f} "
+              f"{fanout['p50_ms']:>9.1f}/{fanout['p99_ms']:<9.1f} "
+              f"{fanout['delivered']:>5}/{fanout['expected']:<4} "
+              f"{r['poll_with_streams']['requests_per_s']:>11.0f} {r['poll_with_streams']['p99_ms']:>8.1f}")
+        time.sleep(2)  # Let the previous mode's connections wind down
+    print("* while the streams are open")
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == '--client':
+        host, port, streams, poll_seconds = sys.argv[2], int(sys.argv[3]), int(sys.argv[4]), float(sys.argv[5])
+        asyncio.run(client(host, port, streams, poll_seconds))
+    else:
+        main()
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: boiling point table lookup vs direct Antoine evaluation
+"""
+import os
+import sys
+import timeit
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.boiling_point import BOILING_POINT_TABLE, antoine_boiling_point, antoine_boiling_points
+from src.config import calculate_boiling_point, calculate_boiling_points
+
+def bench(label, func, number, items):
+    """Prints the best-of-5 cost per evaluated pressure"""
+    seconds = min(timeit.repeat(func, number=number, repeat=5))
+    per_item = seconds / number / items
+    print(f"  {label:<38} {per_item * 1e9:>8.1f} ns/pressure")
+    return per_item
+
+def main():
+    rng = np.random.default_rng(0)
+    pressures = rng.uniform(0.5, 1.5, 1_000_000)
+    scalar_inputs = pressures[:1000].tolist()
+
+    max_error = np.max(np.abs(BOILING_POINT_TABLE.lookup_array(pressures) - antoine_boiling_points(pressures)))
+    print(f"Table: {len(BOILING_POINT_TABLE.pressures)} points, max interpolation error {max_error:.2e} °C")
+
+    print("\nScalar (one reading per call):")
+    n = len(scalar_inputs)
+    bench("antoine_boiling_point (direct)", lambda: [antoine_boiling_point(p) for p in scalar_inputs], 200, n)
+    bench("BOILING_POINT_TABLE.lookup", lambda: [BOILING_POINT_TABLE.lookup(p) for p in scalar_inputs], 200, n)
+    bench("config.calculate_boiling_point", lambda: [calculate_boiling_point(p) for p in scalar_inputs], 200, n)
+
+    print("\nVectorized (1M pressures per call):")
+    n = len(pressures)
+    bench("antoine_boiling_points (direct)", lambda: antoine_boiling_points(pressures), 5, n)
+    bench("BOILING_POINT_TABLE.lookup_array", lambda: BOILING_POINT_TABLE.lookup_array(pressures), 5, n)
+    bench("config.calculate_boiling_points", lambda: calculate_boiling_points(pressures), 5, n)
+
+if __name__ == "__main__":
+    main()
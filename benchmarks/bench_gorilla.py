@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Gorilla block codec on simulated boil cycles (throughput and compression ratio)
+"""
+import os
+import sys
+import time
+import zlib
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.clock import VirtualClock
+from src.config import calculate_boiling_point
+from src.gorilla import encode_block, decode_block
+from src.pressure_sensor import PressureSensor
+from src.segment_store import READING_DTYPE
+from src.simple_temperature_sensor_precision import AnalyticTemperatureSensor
+
+SAMPLE_INTERVAL = 3.0  # Seconds, as in web_app's collector
+PRECISION = {'temperature': 1, 'pressure': 4, 'boiling_point': 2}
+
+def simulate_boil_cycles(cycles=20, hold_seconds=600, cool_seconds=1800, seed=42):
+    """Heat to boiling, hold, cool down; one reading every SAMPLE_INTERVAL virtual seconds"""
+    clock = VirtualClock(start_time=1_700_000_000.0)
+    sensor = AnalyticTemperatureSensor(clock=clock, seed=seed)
+    pressure_sensor = PressureSensor("bench_pressure", clock=clock, seed=seed + 1)
+    pressure_sensor.failure_probability = 0.0
+
+    rows = []
+    def sample():
+        pressure = pressure_sensor.get_pressure() or 1.0
+        rows.append((clock.time(), sensor.get_temperature(), pressure,
+                     calculate_boiling_point(pressure), sensor.is_heating))
+        clock.advance(SAMPLE_INTERVAL)
+
+    for _ in range(cycles):
+        sensor.start_heating()
+        while sensor.get_temperature() < calculate_boiling_point(pressure_sensor.current_pressure):
+            sample()
+        for _ in range(int(hold_seconds / SAMPLE_INTERVAL)):
+            sample()
+        sensor.stop_heating()
+        for _ in range(int(cool_seconds / SAMPLE_INTERVAL)):
+            sample()
+    clock.detach()
+    return np.array(rows, dtype=READING_DTYPE)
+
+def throughput(func, records, repeat=3):
+    best = min(_timed(func) for _ in range(repeat))
+    return len(records) / best
+
+def _timed(func):
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+def main():
+    records = simulate_boil_cycles()
+    raw = records.nbytes
+    print(f"Simulated {len(records):,} readings ({len(records) * SAMPLE_INTERVAL / 3600:.1f} h of boil cycles), "
+          f"{raw:,} bytes raw ({records.dtype.itemsize} B/reading)")
+
+    lossless = encode_block(records)
+    rounded = encode_block(records, PRECISION)
+    assert np.array_equal(decode_block(lossless), records)
+
+    print("\nCompression:")
+    print(f"  {'zlib level 6 (raw records)':<34} {len(zlib.compress(records.tobytes(), 6)):>9,} bytes  "
+          f"{raw / len(zlib.compress(records.tobytes(), 6)):5.1f}x")
+    print(f"  {'Gorilla, lossless':<34} {len(lossless):>9,} bytes  {raw / len(lossless):5.1f}x")
+    print(f"  {'Gorilla, sensor resolution':<34} {len(rounded):>9,} bytes  {raw / len(rounded):5.1f}x")
+
+    print("\nBits per value (Gorilla, sensor resolution):")
+    for name in records.dtype.names:
+        column = np.empty(len(records), dtype=[('timestamp', '<f8')] + ([(name, records.dtype[name])] if name != 'timestamp' else []))
+        column['timestamp'] = records['timestamp']
+        if name != 'timestamp':
+            column[name] = records[name]
+            size = len(encode_block(column, PRECISION)) - len(encode_block(column[['timestamp']]))
+        else:
+            size = len(encode_block(column))
+        print(f"  {name:<14} {size * 8 / len(records):6.2f}")
+
+    print("\nThroughput:")
+    print(f"  encode  {throughput(lambda: encode_block(records, PRECISION), records):>12,.0f} readings/s")
+    print(f"  decode  {throughput(lambda: decode_block(rounded), records):>12,.0f} readings/s")
+
+if __name__ == "__main__":
+    main()
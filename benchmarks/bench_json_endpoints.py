@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Benchmark: /api/sensor_data and /api/alarms/status with per-request jsonify vs pre-encoded bodies (Flask test client)
+"""
+import os
+import sys
+import json
+import time
+import logging
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+REQUESTS = 5000
+ACTIVE_ALARMS = 20
+
+def requests_per_second(client, path, requests=REQUESTS):
+    client.get(path)  # Warm-up (and first encoding of cached bodies)
+    start = time.perf_counter()
+    for _ in range(requests):
+        response = client.get(path)
+    assert response.status_code == 200, (path, response.status_code)
+    return requests / (time.perf_counter() - start)
+
+def handler_microseconds(app, path, repeat=REQUESTS):
+    """Time in the view function alone, without the test client's and Flask's per-request work"""
+    with app.test_request_context(path):
+        view = app.view_functions[app.url_map.bind('localhost').match(path)[0]]
+        start = time.perf_counter()
+        for _ in range(repeat):
+            view()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+def encodes_per_second(encode, value, repeat=20000):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        encode(value)
+    return repeat / (time.perf_counter() - start)
+
+def main():
+    logging.disable(logging.INFO)
+    from flask import jsonify
+    from src import web_app as web
+    from src import json_codec
+    device = web.devices.default
+
+    # The previous implementations, as extra routes on the same app
+    @web.app.route('/api/bench/jsonify/sensor_data')
+    def jsonify_sensor_data():
+        snapshot = device.latest_snapshot
+        return jsonify(web._sensor_payload(snapshot.temp_data, snapshot.pressure_data,
+                                           snapshot.boiling_point, snapshot.timestamp))
+
+    @web.app.route('/api/bench/jsonify/alarms_status')
+    def jsonify_alarm_status():
+        return jsonify(device.alarm_manager.get_status())
+
+    web._publish_snapshot(device, time.time(), device.temperature_sensor.get_data(1.0),
+                          device.pressure_sensor.get_sensor_data(), 100.0)
+    device.alarm_manager.sound_enabled = False
+    device.alarm_manager.configure_alarm('temperature_only', threshold=50.0)
+    for i in range(ACTIVE_ALARMS):
+        device.alarm_manager._create_alarm('TEMPERATURE', f"🌡️ Temperatura atingiu {60 + i:.1f}°C (limite: 50.0°C)",
+                                           {'current_value': 60.0 + i, 'threshold': 50.0})
+        time.sleep(0.002)  # Alarm ids are millisecond timestamps
+
+    client = web.app.test_client()
+    print(f"JSON backend: {json_codec.BACKEND}; {REQUESTS} requests per row, "
+          f"{ACTIVE_ALARMS} active alarms")
+    print(f"{'endpoint':<20} {'jsonify req/s':>14} {'pre-encoded req/s':>18} {'speedup':>8} "
+          f"{'handler µs before/after':>24}")
+    for name, before, after in [
+        ('/api/sensor_data', '/api/bench/jsonify/sensor_data', '/api/sensor_data'),
+        ('/api/alarms/status', '/api/bench/jsonify/alarms_status', '/api/alarms/status'),
+    ]:
+        old, new = requests_per_second(client, before), requests_per_second(client, after)
+        handler = f"{handler_microseconds(web.app, before):.1f}/{handler_microseconds(web.app, after):.1f}"
+        print(f"{name:<20} {old:>14.0f} {new:>18.0f} {new / old:>7.1f}x {handler:>24}")
+
+    # Encoding alone, for the bodies that still get encoded (once per tick or alarm change)
+    status = device.alarm_manager.get_status()
+    stdlib = json.JSONEncoder(default=str, separators=(',', ':'), ensure_ascii=False)
+    print(f"\n{'encode only':<20} {'json/s':>14} {json_codec.BACKEND + '/s':>18}")
+    for name, value in [('sensor payload', json.loads(device.latest_snapshot.body)), ('alarm status', status)]:
+        old = encodes_per_second(lambda v: stdlib.encode(v).encode(), value)
+        new = encodes_per_second(json_codec.dumps, value)
+        print(f"{name:<20} {old:>14.0f} {new:>18.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,7 @@ class ThermometerAPI {
         this.maxRetries = CONFIG.MAX_RETRY_ATTEMPTS;
         this.retryDelay = CONFIG.RETRY_DELAY;
         this.isConnected = false;
+        this.etagCache = new Map();  // GET url -> { etag, data } for If-None-Match revalidation
         
         // Initialize connection check
         this.checkConnection();
@@ -25,15 +26,31 @@ class ThermometerAPI {
         
         const requestOptions = { ...defaultOptions, ...options };
         
+        // Versioned endpoints answer 304 when nothing changed: reuse the parsed body
+        const cached = requestOptions.method === 'GET' ? this.etagCache.get(url) : undefined;
+        if (cached) {
+            requestOptions.headers = { ...requestOptions.headers, 'If-None-Match': cached.etag };
+            requestOptions.cache = 'no-store';
+        }
+        
         for (let attempt = 0; attempt <= this.maxRetries; attempt++) {
             try {
                 const response = await fetch(url, requestOptions);
                 
+                if (response.status === 304 && cached) {
+                    this.isConnected = true;
+                    this.retryCount = 0;
+                    return cached.data;
+                }
                 if (!response.ok) {
                     throw new Error(`HTTP ${response.status}: ${response.statusText}`);
                 }
                 
                 const data = await response.json();
+                const etag = response.headers.get('ETag');
+                if (etag && requestOptions.method === 'GET') {
+                    this.etagCache.set(url, { etag, data });
+                }
                 this.isConnected = true;
                 this.retryCount = 0;
                 return data;
@@ -84,10 +101,80 @@ class ThermometerAPI {
         }
     }
     
-    // Get historical sensor data
-    async getHistoricalData() {
+    // Sensor data, alarm status and system status in one request (/api/dashboard).
+    // fields: any of 'sensor_data', 'alarms', 'system_status' (default: all)
+    async getDashboard(fields = null) {
+        try {
+            const query = fields ? `?fields=${encodeURIComponent(fields.join(','))}` : '';
+            const data = await this.request(`/dashboard${query}`);
+            return {
+                success: true,
+                data: data
+            };
+        } catch (error) {
+            return {
+                success: false,
+                error: error.message,
+                data: {
+                    sensor_data: this.getSimulatedData(),
+                    alarms: { active_alarms_count: 0, active_alarms: [] },
+                    system_status: null
+                }
+            };
+        }
+    }
+    
+    // Live updates over Server-Sent Events (/api/stream).
+    // handlers: { onReading, onAlarm, onStatus, onResync, onUnavailable }
+    // Returns false when the browser has no EventSource; onUnavailable is called
+    // if the server refuses the stream, so the caller can fall back to polling.
+    openStream(handlers = {}) {
+        if (typeof EventSource === 'undefined') {
+            return false;
+        }
+        this.closeStream();
+        
+        const source = new EventSource(`${this.baseURL}/stream`);
+        const listen = (event, handler) => {
+            if (!handler) return;
+            source.addEventListener(event, (message) => {
+                this.isConnected = true;
+                handler(JSON.parse(message.data));
+            });
+        };
+        listen('reading', handlers.onReading);
+        listen('alarm', handlers.onAlarm);
+        listen('status', handlers.onStatus);
+        listen('resync', handlers.onResync);
+        
+        source.onerror = () => {
+            // CONNECTING: the browser reconnects by itself; CLOSED: no stream here (404/503)
+            if (source.readyState === EventSource.CLOSED) {
+                this.isConnected = false;
+                this.closeStream();
+                if (handlers.onUnavailable) handlers.onUnavailable();
+            }
+        };
+        this.eventSource = source;
+        return true;
+    }
+    
+    closeStream() {
+        if (this.eventSource) {
+            this.eventSource.close();
+            this.eventSource = null;
+        }
+    }
+    
+    // Get historical sensor data (optional { points, from, to } with epoch seconds)
+    async getHistoricalData(options = {}) {
         try {
-            const data = await this.request('/historical_data');
+            const params = new URLSearchParams();
+            ['points', 'from', 'to'].forEach(key => {
+                if (options[key] !== undefined && options[key] !== null) params.set(key, options[key]);
+            });
+            const query = params.toString();
+            const data = await this.request(`/historical_data${query ? `?${query}` : ''}`);
             return {
                 success: true,
                 data: data
@@ -430,6 +517,7 @@ class ThermometerAPI {
     getConnectionStatus() {
         return {
             connected: this.isConnected,
+            streaming: Boolean(this.eventSource),
             baseURL: this.baseURL,
             retryCount: this.retryCount
         };
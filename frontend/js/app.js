@@ -35,8 +35,8 @@ class SmartThermometerApp {    constructor() {
         this.ui.updateSystemStatus('stopped');
         this.ui.updateDeviceInfo();
         
-        // Start data polling
-        this.startPolling();
+        // Live updates: server push when available, polling otherwise
+        this.startLiveUpdates();
         
         console.log('Dashboard initialized successfully');
     }    async loadSettings() {
@@ -231,6 +231,37 @@ class SmartThermometerApp {    constructor() {
         }
     }
 
+    startLiveUpdates() {
+        const streaming = this.api.openStream({
+            onReading: (data) => this.handleSensorData(data),
+            onAlarm: (alarm) => this.ui.showNotification(`New alarm: ${alarm.message}`, 'warning'),
+            onStatus: (status) => this.handleStatus(status),
+            onResync: () => this.loadAlarms(),
+            onUnavailable: () => {
+                console.warn('Event stream unavailable, falling back to polling');
+                this.startPolling();
+            }
+        });
+        if (!streaming) {
+            this.startPolling();
+        }
+    }
+
+    handleSensorData(data) {
+        this.sensorData = data;
+        this.ui.updateSensorReadings(data);
+        this.charts.updateCharts(data);
+        this.ui.updateConnectionStatus(true);
+    }
+
+    handleStatus(status) {
+        const alarms = (status.alarms && status.alarms.active_alarms) || [];
+        if (alarms.length !== this.alarms.length) {
+            this.alarms = alarms;
+            this.ui.updateAlarmsDisplay(this.alarms);
+        }
+    }
+
     startPolling(interval = null) {
         // Clear existing interval
         if (this.updateInterval) {
@@ -249,19 +280,15 @@ class SmartThermometerApp {    constructor() {
         this.updateData();
     }    async updateData() {
         try {
-            // Get sensor data
-            const sensorResponse = await this.api.getSensorData();
-            if (sensorResponse && sensorResponse.success) {
-                this.sensorData = sensorResponse.data;
-                this.ui.updateSensorReadings(sensorResponse.data);
-                this.charts.updateCharts(sensorResponse.data);
-                this.ui.updateConnectionStatus(true);
+            // Sensor data and alarms in one request; a 304 returns the same object, so nothing to redraw
+            const response = await this.api.getDashboard(['sensor_data', 'alarms']);
+            const sensorData = response && response.success ? response.data.sensor_data : null;
+            if (sensorData && sensorData !== this.sensorData) {
+                this.handleSensorData(sensorData);
             }
 
-            // Get alarms
-            const alarmsResponse = await this.api.getAlarms();
-            if (alarmsResponse && alarmsResponse.success) {
-                const alarms = alarmsResponse.data || [];
+            if (response && response.success) {
+                const alarms = (response.data.alarms && response.data.alarms.active_alarms) || [];
                 if (alarms.length !== this.alarms.length) {
                     this.alarms = alarms;
                     this.ui.updateAlarmsDisplay(this.alarms);
@@ -282,6 +309,7 @@ class SmartThermometerApp {    constructor() {
 
     // Cleanup method
     destroy() {
+        this.api.closeStream();
         if (this.updateInterval) {
             clearInterval(this.updateInterval);
         }
@@ -97,28 +97,45 @@ const PHYSICS = {
     calculateBoilingPoint(pressureAtm) {
         if (pressureAtm <= 0) return 0;
         
-        // Simplified Antoine equation approximation
-        const baseTemp = 100.0;  // °C at 1 atm
-        const pressureFactor = 25.0;  // Temperature change per atm
+        // Antoine equation for water (P in mmHg, T in °C), same as the backend
+        const A = 8.07131;
+        const B = 1730.63;
+        const C = 233.426;
         
-        return baseTemp + pressureFactor * (pressureAtm - 1.0);
+        return B / (A - Math.log10(pressureAtm * 760.0)) - C;
+    },
+    
+    // ISA layers, same constants and limits as src/barometric.py
+    ISA: {
+        MIN_ALTITUDE: -610,
+        TROPOPAUSE_ALTITUDE: 11000,
+        MAX_ALTITUDE: 20000,
+        SCALE_HEIGHT: 288.15 / 0.0065,   // ~44330.8 m
+        EXPONENT: 5.255788,
+        TROPOPAUSE_PRESSURE: 0.223367,   // atm at 11 km
+        STRATOSPHERE_DECAY: 1.576858e-4  // 1/m, isothermal layer at 216.65 K
     },
     
     // Convert altitude to pressure
     altitudeToPressure(altitudeMeters) {
-        if (altitudeMeters <= 0) return 1.0;
-        
-        // Simplified barometric formula
-        const pressureDrop = altitudeMeters * 0.00012;
-        return Math.max(0.3, 1.0 - pressureDrop);
+        // ISA barometric formula: troposphere, then the isothermal layer up to 20 km
+        const isa = this.ISA;
+        const altitude = Math.min(Math.max(altitudeMeters, isa.MIN_ALTITUDE), isa.MAX_ALTITUDE);
+        if (altitude <= isa.TROPOPAUSE_ALTITUDE) {
+            return Math.pow(1.0 - altitude / isa.SCALE_HEIGHT, isa.EXPONENT);
+        }
+        return isa.TROPOPAUSE_PRESSURE * Math.exp(-isa.STRATOSPHERE_DECAY * (altitude - isa.TROPOPAUSE_ALTITUDE));
     },
     
     // Convert pressure to altitude
     pressureToAltitude(pressureAtm) {
-        if (pressureAtm >= 1.0) return 0.0;
+        const isa = this.ISA;
+        if (pressureAtm <= 0) return isa.MAX_ALTITUDE;
         
-        const altitude = (1.0 - pressureAtm) / 0.00012;
-        return Math.max(0, altitude);
+        const altitude = pressureAtm >= isa.TROPOPAUSE_PRESSURE
+            ? isa.SCALE_HEIGHT * (1.0 - Math.pow(pressureAtm, 1.0 / isa.EXPONENT))
+            : isa.TROPOPAUSE_ALTITUDE + Math.log(isa.TROPOPAUSE_PRESSURE / pressureAtm) / isa.STRATOSPHERE_DECAY;
+        return Math.min(Math.max(0, altitude), isa.MAX_ALTITUDE);
     },
     
     // Temperature conversion utilities
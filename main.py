@@ -11,12 +11,14 @@ import logging
 from datetime import datetime
 
 # Import all modules
-from src.config import Config, DEVICE_ID, DEVICE_NAME
-from src.simple_temperature_sensor_precision import PrecisionTemperatureSensor
+from src.config import Config, DEVICE_ID, DEVICE_NAME, calculate_boiling_point
+from src.clock import VirtualClock, get_clock, set_clock, parse_speed
+from src.simple_temperature_sensor_precision import create_temperature_sensor
 from src.pressure_sensor import PressureSensor, ALTITUDE_PRESETS
 from src.mqtt_client import MQTTClient
 from src.smart_alarm_manager import SmartAlarmManager
 from src.web_app import app as web_app, initialize_systems, start_data_collection, stop_data_collection
+from src.async_server import run as run_async_server
 from src.mobile_app import mobile_app
 
 # Configure logging
@@ -42,6 +44,7 @@ class SmartThermometerSystem:
         # System status
         self.start_time = datetime.now()
         self.data_points_collected = 0
+        self.alarms_triggered = []
         
         logger.info(f"Smart Thermometer System initialized - Device: {DEVICE_NAME} ({DEVICE_ID})")
     
@@ -50,8 +53,9 @@ class SmartThermometerSystem:
         try:
             # Initialize sensors
             logger.info("Initializing sensors...")
-            self.temperature_sensor = PrecisionTemperatureSensor(f"{DEVICE_ID}_temp")
-            self.pressure_sensor = PressureSensor(f"{DEVICE_ID}_pressure")
+            seed = Config.SIMULATION_SEED
+            self.temperature_sensor = create_temperature_sensor(Config.TEMPERATURE_ENGINE, seed=seed)
+            self.pressure_sensor = PressureSensor(f"{DEVICE_ID}_pressure", seed=None if seed is None else seed + 1)
             
             # Initialize MQTT client
             logger.info("Initializing MQTT client...")
@@ -64,9 +68,8 @@ class SmartThermometerSystem:
             logger.info("Initializing alarm manager...")
             self.alarm_manager = SmartAlarmManager(self.mqtt_client)
             
-            # Set up default alarm configurations
-            self.alarm_manager.set_temperature_alarm(Config.DEFAULT_ALARM_TEMPERATURE)
-            self.alarm_manager.set_boiling_point_alarm(True)
+            # Set up default alarm configuration: wait for boiling, then time the cook
+            self.alarm_manager.configure_alarm('boiling_then_time', duration=Config.DEFAULT_ALARM_TIME)
             
             logger.info("All systems initialized successfully")
             return True
@@ -75,13 +78,17 @@ class SmartThermometerSystem:
             logger.error(f"Failed to initialize systems: {e}")
             return False
     
-    def start(self):
+    def start(self, heating=False):
         """Start the thermometer system"""
         if not self.initialize():
             logger.error("Failed to initialize system")
             return False
         
+        if heating:
+            self.temperature_sensor.set_heating(True)
+        
         self.running = True
+        self.start_time = datetime.fromtimestamp(get_clock().time())
         
         # Start alarm monitoring
         self.alarm_manager.start_monitoring()
@@ -111,11 +118,15 @@ class SmartThermometerSystem:
         if self.simulation_thread and self.simulation_thread.is_alive():
             self.simulation_thread.join(timeout=5)
         
+        if self.temperature_sensor:
+            self.temperature_sensor.stop_simulation()
+        
         logger.info("System shutdown complete")
     
     def _simulation_loop(self):
         """Main simulation loop"""
         logger.info("Starting sensor simulation loop")
+        clock = get_clock()
         
         while self.running:
             try:
@@ -124,14 +135,12 @@ class SmartThermometerSystem:
                 current_pressure = pressure_data['pressure'] if pressure_data['pressure'] else 1.0
                 
                 # Get temperature reading
-                temp_data = self.temperature_sensor.get_sensor_data(current_pressure)
-                current_temp = temp_data['temperature']
+                temp_data = self.temperature_sensor.get_data(current_pressure)
+                boiling_point = calculate_boiling_point(current_pressure)
                 
                 # Check alarms
-                if current_temp is not None:
-                    self.alarm_manager.check_temperature_alarms(current_temp, current_pressure)
-                else:
-                    self.alarm_manager.check_temperature_alarms(None)  # Sensor failure
+                triggered = self.alarm_manager.check_alarms(temp_data, pressure_data, boiling_point)
+                self.alarms_triggered.extend(triggered)
                 
                 # Publish to MQTT if connected
                 if self.mqtt_client and self.mqtt_client.is_connected:
@@ -144,21 +153,21 @@ class SmartThermometerSystem:
                 if self.data_points_collected % 20 == 0:  # Every 20 readings
                     self._log_status(temp_data, pressure_data)
                 
-                time.sleep(Config.SENSOR_UPDATE_INTERVAL)
+                clock.sleep(Config.SENSOR_UPDATE_INTERVAL)
                 
             except Exception as e:
                 logger.error(f"Error in simulation loop: {e}")
-                time.sleep(5)  # Wait longer on error
+                clock.sleep(5)  # Wait longer on error
     
     def _log_status(self, temp_data, pressure_data):
         """Log current system status"""
-        uptime = datetime.now() - self.start_time
+        uptime = datetime.fromtimestamp(get_clock().time()) - self.start_time
         
         temp_str = f"{temp_data['temperature']:.1f}°C" if temp_data['temperature'] else "ERROR"
         pressure_str = f"{pressure_data['pressure']:.3f} atm" if pressure_data['pressure'] else "ERROR"
         heating_str = "ON" if temp_data.get('is_heating', False) else "OFF"
         
-        alarm_status = self.alarm_manager.get_alarm_status()
+        alarm_status = self.alarm_manager.get_status()
         active_alarms = alarm_status['active_alarms_count']
         
         logger.info(f"STATUS: Temp={temp_str} | Pressure={pressure_str} | Heating={heating_str} | "
@@ -169,15 +178,17 @@ class SmartThermometerSystem:
         if not self.running:
             return {"status": "stopped"}
         
-        uptime = datetime.now() - self.start_time
+        uptime = datetime.fromtimestamp(get_clock().time()) - self.start_time
         
         # Get current sensor readings
         pressure_data = self.pressure_sensor.get_sensor_data() if self.pressure_sensor else {}
         current_pressure = pressure_data.get('pressure', 1.0) if pressure_data else 1.0
-        temp_data = self.temperature_sensor.get_sensor_data(current_pressure) if self.temperature_sensor else {}
+        temp_data = self.temperature_sensor.get_data(current_pressure) if self.temperature_sensor else {}
+        if temp_data and self.temperature_sensor:
+            temp_data['target_temperature'] = self.temperature_sensor.get_target_temperature()
         
         # Get alarm status
-        alarm_status = self.alarm_manager.get_alarm_status() if self.alarm_manager else {}
+        alarm_status = self.alarm_manager.get_status() if self.alarm_manager else {}
         
         # Get MQTT status
         mqtt_status = self.mqtt_client.get_connection_status() if self.mqtt_client else {'connected': False}
@@ -278,19 +289,19 @@ def run_cli_interface():
                     print("Usage: altitude <meters>")
                     
             elif command == "alarms":
-                alarm_status = system.alarm_manager.get_alarm_status()
+                alarm_status = system.alarm_manager.get_status()
                 active_alarms = alarm_status.get('active_alarms', [])
                 
                 if active_alarms:
                     print(f"\nActive alarms ({len(active_alarms)}):")
                     for alarm in active_alarms:
                         print(f"  - {alarm['type']}: {alarm['message']}")
-                        print(f"    Time: {alarm['datetime']}")
+                        print(f"    Time: {datetime.fromtimestamp(alarm['timestamp']).isoformat()}")
                 else:
                     print("No active alarms")
                     
             elif command == "reset":
-                system.temperature_sensor.reset_sensor()
+                system.temperature_sensor.reset_temperature()
                 system.pressure_sensor.reset_sensor()
                 system.alarm_manager.clear_all_alarms()
                 print("All sensors and alarms reset")
@@ -314,7 +325,17 @@ def main():
     parser.add_argument('--host', default=Config.WEB_HOST, help='Host to bind to')
     parser.add_argument('--port', type=int, help='Port to bind to')
     parser.add_argument('--debug', action='store_true', help='Enable debug mode')
+    parser.add_argument('--server', choices=['threaded', 'asyncio'], default=Config.WEB_SERVER,
+                       help='Web mode server: Flask threads, or one asyncio event loop for many live clients')
     parser.add_argument('--no-mqtt', action='store_true', help='Disable MQTT connection')
+    parser.add_argument('--speed', default='1x',
+                       help="Simulation speed for cli/simulation modes, e.g. '100x', or 'max' for as fast as possible")
+    parser.add_argument('--engine', choices=['thread', 'analytic'], default=Config.TEMPERATURE_ENGINE,
+                       help='Temperature simulation engine (analytic computes on read, no thread)')
+    parser.add_argument('--seed', type=int, default=Config.SIMULATION_SEED,
+                       help='Seed for sensor noise (same seed -> same trace)')
+    parser.add_argument('--duration', type=float,
+                       help='Stop the simulation after this many simulated seconds')
     
     args = parser.parse_args()
     
@@ -324,6 +345,17 @@ def main():
     
     print(f"Starting {DEVICE_NAME} in {args.mode} mode...")
     
+    Config.TEMPERATURE_ENGINE = args.engine
+    Config.SIMULATION_SEED = args.seed
+    
+    if args.mode in ('cli', 'simulation'):
+        try:
+            speed = parse_speed(args.speed)
+        except ValueError:
+            parser.error(f"Invalid --speed value: {args.speed}")
+        if speed != 1.0:
+            set_clock(VirtualClock(speed))
+    
     try:
         if args.mode == 'web':
             # Run web interface
@@ -332,7 +364,10 @@ def main():
             
             port = args.port or Config.WEB_PORT
             print(f"Web interface available at http://{args.host}:{port}")
-            web_app.run(host=args.host, port=port, debug=args.debug)
+            if args.server == 'asyncio':
+                run_async_server(args.host, port)
+            else:
+                web_app.run(host=args.host, port=port, debug=args.debug)
             
         elif args.mode == 'mobile':
             # Run mobile interface
@@ -349,14 +384,23 @@ def main():
                 return 1
                 
         elif args.mode == 'simulation':
-            # Run simulation only
-            if system.start():
+            # Run simulation only (a full cook cycle: heat, boil, time the boil)
+            clock = get_clock()
+            sim_start = clock.time()
+            real_start = time.time()
+            if system.start(heating=True):
                 print("Simulation running... Press Ctrl+C to stop")
                 try:
-                    while True:
-                        time.sleep(1)
+                    # Sleeping on the shared clock keeps this check in step with simulated time
+                    while args.duration is None or clock.time() - sim_start < args.duration:
+                        clock.sleep(Config.SENSOR_UPDATE_INTERVAL)
                 except KeyboardInterrupt:
                     pass
+                clock.detach()
+                
+                print(f"Simulated {clock.time() - sim_start:.0f}s in {time.time() - real_start:.2f}s real time")
+                for alarm in system.alarms_triggered:
+                    print(f"  - {alarm['type']} at +{alarm['timestamp'] - sim_start:.0f}s: {alarm['message']}")
             else:
                 logger.error("Failed to start system")
                 return 1
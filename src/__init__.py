@@ -9,7 +9,8 @@ __description__ = "IoT Smart Thermometer for Food Monitoring"
 
 # Package imports
 from .config import Config, DEVICE_ID, DEVICE_NAME
-from .simple_temperature_sensor_precision import PrecisionTemperatureSensor
+from .simple_temperature_sensor_precision import PrecisionTemperatureSensor, AnalyticTemperatureSensor, create_temperature_sensor
+from .fleet_simulator import FleetTemperatureSimulator
 from .pressure_sensor import PressureSensor
 from .mqtt_client import MQTTClient
 from .smart_alarm_manager import SmartAlarmManager
@@ -19,6 +20,9 @@ __all__ = [
     'DEVICE_ID', 
     'DEVICE_NAME',
     'PrecisionTemperatureSensor',
+    'AnalyticTemperatureSensor',
+    'create_temperature_sensor',
+    'FleetTemperatureSimulator',
     'PressureSensor', 
     'MQTTClient',
     'SmartAlarmManager'
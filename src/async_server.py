@@ -0,0 +1,491 @@
+"""
+Asyncio serving mode for the web dashboard
+One event loop serves the live routes as coroutines; every other route runs the Flask app on a small thread pool
+"""
+import sys
+import json
+import struct
+import asyncio
+import logging
+import functools
+import threading
+import contextvars
+from io import BytesIO
+from http import HTTPStatus
+from urllib.parse import unquote_to_bytes
+from concurrent.futures import ThreadPoolExecutor
+from werkzeug.datastructures import Headers
+from werkzeug.http import parse_etags
+try:
+    from . import web_app as web
+    from .broadcaster import Broadcaster, format_sse
+    from .ws_protocol import (FrameParser, WebSocketError, encode_frame, close_frame, handshake_response,
+                              is_upgrade_request, OP_TEXT, OP_PING, OP_PONG, OP_CLOSE, CLOSE_NORMAL)
+except ImportError:
+    import web_app as web
+    from broadcaster import Broadcaster, format_sse
+    from ws_protocol import (FrameParser, WebSocketError, encode_frame, close_frame, handshake_response,
+                             is_upgrade_request, OP_TEXT, OP_PING, OP_PONG, OP_CLOSE, CLOSE_NORMAL)
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+MAX_HEADER_BYTES = 64 * 1024  # Request line plus headers
+MAX_BODY_BYTES = 1 << 20
+IDLE_TIMEOUT = 75  # Seconds a keep-alive connection may sit idle between requests
+BACKLOG = 2048  # Pending connections: a burst of reconnecting dashboards overflows the default 100
+WSGI_WORKERS = 8  # Threads running the Flask routes
+PREFETCH_BYTES = 64 * 1024  # Flask response bytes collected per thread-pool hop
+
+_END = object()
+
+
+class BadRequest(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class HTTPRequest:
+    __slots__ = ('method', 'path', 'query', 'version', 'headers', 'body', 'peer')
+
+    def __init__(self, method, path, query, version, headers, body, peer):
+        self.method = method
+        self.path = path
+        self.query = query
+        self.version = version
+        self.headers = headers  # werkzeug Headers: case-insensitive
+        self.body = body
+        self.peer = peer
+
+    @property
+    def keep_alive(self):
+        connection = self.headers.get('Connection', '').lower()
+        if self.version == 'HTTP/1.0':
+            return 'keep-alive' in connection
+        return 'close' not in connection
+
+
+async def read_request(reader, peer=None):
+    """Next request on a connection, or None if the client closed it between requests"""
+    try:
+        head = await reader.readuntil(b'\r\n\r\n')
+    except asyncio.IncompleteReadError as e:
+        if e.partial.strip():
+            raise BadRequest(400, "Incomplete request")
+        return None
+    except asyncio.LimitOverrunError:
+        raise BadRequest(431, "Request headers too large")
+
+    lines = head.decode('latin-1').split('\r\n')
+    try:
+        method, target, version = lines[0].split(' ')
+    except ValueError:
+        raise BadRequest(400, "Malformed request line")
+    if not version.startswith('HTTP/1.'):
+        raise BadRequest(505, f"Unsupported protocol: {version}")
+    headers = Headers()
+    for line in lines[1:]:
+        if not line:
+            continue
+        name, separator, value = line.partition(':')
+        if not separator:
+            raise BadRequest(400, "Malformed header line")
+        headers.add(name.strip(), value.strip())
+
+    if 'chunked' in headers.get('Transfer-Encoding', '').lower():
+        raise BadRequest(501, "Chunked request bodies are not supported")
+    try:
+        length = int(headers.get('Content-Length') or 0)
+    except ValueError:
+        raise BadRequest(400, "Invalid Content-Length")
+    if length > MAX_BODY_BYTES:
+        raise BadRequest(413, "Request body too large")
+    body = await reader.readexactly(length) if length else b''
+    path, _, query = target.partition('?')
+    return HTTPRequest(method, path, query, version, headers, body, peer)
+
+def _head(status, headers):
+    """Status line and headers; status is a code or a WSGI status string ('200 OK')"""
+    if isinstance(status, int):
+        status = f"{status} {HTTPStatus(status).phrase}"
+    lines = [f"HTTP/1.1 {status}"] + [f"{name}: {value}" for name, value in headers]
+    return ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1')
+
+
+class AsyncDashboardServer:
+    """
+    HTTP/1.1 server on one asyncio event loop, in front of web_app.
+
+    /api/sensor_data, /api/stream (SSE), their /api/devices/<id>/ versions
+    and /api/ws (WebSocket) run on the loop itself, from the collector's
+    in-memory snapshots: an open stream is a coroutine and a queue, not a
+    thread. Every other route (history,
+    controls, static files, ...) is the Flask app running on a small thread
+    pool, so the routes and their responses are the same as in threaded mode.
+
+    Live events reach the loop through one listener per device broadcaster:
+    each event crosses threads once and is then fanned out to the loop's own
+    subscriptions (one hub per device), with the same coalescing and drop
+    accounting as the threaded server's.
+    """
+
+    def __init__(self, host, port, workers=WSGI_WORKERS, queue_size=None):
+        self.host = host
+        self.port = port
+        self.address = None
+        self.connections = 0
+        self.pool = ThreadPoolExecutor(workers, thread_name_prefix='wsgi')
+        self.hubs = {device.device_id: Broadcaster(queue_size or device.events.queue_size) for device in web.devices}
+        self._relays = {device_id: functools.partial(self._relay, hub) for device_id, hub in self.hubs.items()}
+        self.loop = None
+        self.server = None
+        # Read-only workers have no collector snapshot: everything goes through Flask
+        self.routes = {}
+        if not web.HISTORY_READER:
+            self.routes['/api/ws'] = self._websocket
+            # Every device's paths, resolved up front: routing stays one dict lookup
+            for device in web.devices:
+                prefixes = [f'/api/devices/{device.device_id}']
+                if device.device_id == web.devices.default_id:
+                    prefixes.append('/api')
+                for prefix in prefixes:
+                    self.routes[f'{prefix}/sensor_data'] = functools.partial(self._sensor_data, device)
+                    self.routes[f'{prefix}/stream'] = functools.partial(self._stream, device)
+
+    async def start(self):
+        self.loop = asyncio.get_running_loop()
+        self.server = await asyncio.start_server(self._serve_connection, self.host, self.port,
+                                                 limit=MAX_HEADER_BYTES, backlog=BACKLOG)
+        self.address = self.server.sockets[0].getsockname()[:2]
+        for device in web.devices:
+            device.events.add_listener(self._relays[device.device_id])
+        logger.info(f"Asyncio dashboard server on http://{self.address[0]}:{self.address[1]}")
+        return self.address
+
+    async def serve_forever(self):
+        if self.server is None:
+            await self.start()
+        try:
+            await self.server.serve_forever()
+        finally:
+            await self.close()
+
+    async def close(self):
+        for device in web.devices:
+            device.events.remove_listener(self._relays[device.device_id])
+        if self.server is not None:
+            self.server.close()
+        self.pool.shutdown(wait=False)
+
+    def stats(self):
+        return {'connections': self.connections, 'stream': self.hubs[web.devices.default_id].stats(),
+                'devices': len(self.hubs), 'workers': self.pool._max_workers}
+
+    def _relay(self, hub, event, data, event_id, coalesce_key):
+        """Device broadcaster listener, called from the publishing thread: one hop into the loop per event"""
+        self.loop.call_soon_threadsafe(hub.publish, event, data, event_id, coalesce_key)
+
+    async def _serve_connection(self, reader, writer):
+        peer = writer.get_extra_info('peername')
+        self.connections += 1
+        try:
+            while True:
+                try:
+                    request = await asyncio.wait_for(read_request(reader, peer), IDLE_TIMEOUT)
+                except BadRequest as e:
+                    body = json.dumps({'error': str(e)}).encode()
+                    writer.write(_head(e.status, [('Content-Type', 'application/json'),
+                                                  ('Content-Length', str(len(body))), ('Connection', 'close')]) + body)
+                    await writer.drain()
+                    break
+                if request is None:
+                    break
+                handler = self.routes.get(request.path) if request.method == 'GET' else None
+                keep_alive = await (handler or self._wsgi)(request, reader, writer)
+                if not keep_alive:
+                    break
+        except (asyncio.TimeoutError, ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except Exception as e:
+            logger.error(f"Error serving {peer}: {e}")
+        finally:
+            self.connections -= 1
+            writer.close()
+
+    def _cors_headers(self, request):
+        """What Flask-CORS adds to web_app's /api/* responses, for the routes served on the loop"""
+        origin = request.headers.get('Origin')
+        if origin in web.CORS_ORIGINS:
+            return [('Access-Control-Allow-Origin', origin), ('Access-Control-Expose-Headers', 'ETag'),
+                    ('Vary', 'Origin')]
+        return []
+
+    async def _send(self, request, writer, status, headers, body=b''):
+        keep_alive = request.keep_alive
+        headers = headers + self._cors_headers(request)
+        if status != 304:
+            headers.append(('Content-Length', str(len(body))))
+        headers.append(('Connection', 'keep-alive' if keep_alive else 'close'))
+        writer.write(_head(status, headers) + body)
+        await writer.drain()
+        return keep_alive
+
+    async def _sensor_data(self, device, request, reader, writer):
+        """web_app.get_sensor_data without leaving the loop: the snapshot body and its ETag"""
+        snapshot = device.latest_snapshot
+        if snapshot is None:
+            body = json.dumps({'error': 'No reading collected yet'}).encode()
+            return await self._send(request, writer, 503, [('Content-Type', 'application/json')], body)
+        etag = web._etag(snapshot.seq)
+        headers = [('ETag', f'"{etag}"'), ('Cache-Control', 'no-cache')]
+        if parse_etags(request.headers.get('If-None-Match')).contains_weak(etag):
+            return await self._send(request, writer, 304, headers)
+        return await self._send(request, writer, 200, headers + [('Content-Type', 'application/json')],
+                                snapshot.body)
+
+    async def _stream(self, device, request, reader, writer):
+        """web_app.stream_events as a coroutine"""
+        hub = self.hubs[device.device_id]
+        wake = asyncio.Event()
+        subscription = hub.subscribe(notify=wake.set)
+        # SSE clients never send anything more: end of input means they left
+        disconnected = asyncio.ensure_future(reader.read(1))
+        disconnected.add_done_callback(lambda _: wake.set())
+        try:
+            writer.write(_head(200, [('Content-Type', 'text/event-stream; charset=utf-8'),
+                                     ('Cache-Control', 'no-cache'), ('X-Accel-Buffering', 'no'),
+                                     ('Connection', 'close')] + self._cors_headers(request)))
+            writer.write(b'retry: 3000\n\n')
+            snapshot = device.latest_snapshot
+            if snapshot is not None:
+                writer.write(format_sse('reading', snapshot.body, snapshot.seq).encode())
+            writer.write(format_sse('status', web._status_payload(device)).encode())
+            await writer.drain()
+            while not disconnected.done():
+                try:
+                    await asyncio.wait_for(wake.wait(), web.STREAM_KEEPALIVE)
+                except asyncio.TimeoutError:
+                    writer.write(b': keepalive\n\n')
+                    await writer.drain()
+                    continue
+                wake.clear()
+                dropped = subscription.take_dropped()
+                if dropped:
+                    writer.write(format_sse('resync', {'dropped': dropped}).encode())
+                while True:
+                    message = subscription.get(timeout=0)
+                    if message is None:
+                        break
+                    writer.write(message.encode())
+                # A slow client holds this coroutine here while its queue coalesces
+                await writer.drain()
+        finally:
+            hub.unsubscribe(subscription)
+            disconnected.cancel()
+        return False
+
+    async def _websocket(self, request, reader, writer):
+        """web_app.live_channel as a coroutine; client messages (control commands) run on the pool"""
+        if not is_upgrade_request(request.headers):
+            body = json.dumps({'error': 'WebSocket handshake without Sec-WebSocket-Key'}).encode()
+            return await self._send(request, writer, 400, [('Content-Type', 'application/json')], body)
+        writer.write(handshake_response(request.headers['Sec-WebSocket-Key']))
+
+        session = web._channel_session()
+        session_lock = asyncio.Lock()
+        wake = asyncio.Event()
+        subscriptions = [(device_id, hub.subscribe(raw=True, notify=wake.set)) for device_id, hub in self.hubs.items()]
+        parser = FrameParser()
+
+        def send(frames):
+            for frame in frames:
+                writer.write(encode_frame(json.dumps(frame, default=str)))
+
+        async def receive():
+            """Handles client frames until the client closes; returns its close code"""
+            while True:
+                data = await reader.read(65536)
+                if not data:
+                    return CLOSE_NORMAL
+                for opcode, payload in parser.feed(data):
+                    if opcode == OP_TEXT:
+                        async with session_lock:
+                            frames = await self.loop.run_in_executor(
+                                self.pool, session.handle, payload.decode('utf-8', errors='replace'))
+                        send(frames)
+                        await writer.drain()
+                    elif opcode == OP_PING:
+                        writer.write(encode_frame(payload, OP_PONG))
+                    elif opcode == OP_CLOSE:
+                        return struct.unpack('!H', payload[:2])[0] if len(payload) >= 2 else CLOSE_NORMAL
+
+        receiver = asyncio.ensure_future(receive())
+        receiver.add_done_callback(lambda _: wake.set())
+        code = CLOSE_NORMAL
+        try:
+            while not receiver.done():
+                try:
+                    await asyncio.wait_for(wake.wait(), web.STREAM_KEEPALIVE)
+                except asyncio.TimeoutError:
+                    writer.write(encode_frame(b'', OP_PING))
+                    await writer.drain()
+                    continue
+                wake.clear()
+                frames = []
+                async with session_lock:
+                    for device_id, subscription in subscriptions:
+                        while True:
+                            item = subscription.get(timeout=0)
+                            if item is None:
+                                break
+                            event, data, _ = item
+                            if event == 'alarm':
+                                frames += session.alarm(device_id, data)
+                            else:
+                                frames += session.updates([device_id])
+                send(frames)
+                await writer.drain()
+            error = receiver.exception()
+            if isinstance(error, WebSocketError):
+                code = error.code
+            elif error is not None and not isinstance(error, ConnectionError):
+                logger.error(f"WebSocket session failed: {error}")
+        finally:
+            for device_id, subscription in subscriptions:
+                self.hubs[device_id].unsubscribe(subscription)
+            receiver.cancel()
+            try:
+                writer.write(close_frame(code))
+                await writer.drain()
+            except ConnectionError:
+                pass
+        return False
+
+    async def _wsgi(self, request, reader, writer):
+        """Any other route: the Flask app on the thread pool, its body streamed back in chunks"""
+        # Each hop may land on a different pool thread. All of them run in this one context, so a
+        # stream_with_context body finds the request context it pushed and pops it where it started
+        context = contextvars.copy_context()
+        status, headers, chunks, iterator, result = await self.loop.run_in_executor(
+            self.pool, context.run, self._call_app, self._environ(request))
+        prefetch = None
+        try:
+            code = int(status.split(' ', 1)[0])
+            bodyless = request.method == 'HEAD' or code in (204, 304) or code < 200
+            has_length = any(name.lower() == 'content-length' for name, _ in headers)
+            keep_alive = request.keep_alive and (has_length or bodyless or request.version == 'HTTP/1.1')
+            chunked = keep_alive and not has_length and not bodyless
+            headers = [(name, value) for name, value in headers if name.lower() != 'connection']
+            if chunked:
+                headers.append(('Transfer-Encoding', 'chunked'))
+            headers.append(('Connection', 'keep-alive' if keep_alive else 'close'))
+            writer.write(_head(status, headers))
+            while True:
+                for chunk in chunks:
+                    if chunk and not bodyless:
+                        writer.write(b'%x\r\n%s\r\n' % (len(chunk), chunk) if chunked else chunk)
+                await writer.drain()
+                if iterator is None:
+                    break
+                prefetch = self.pool.submit(context.run, self._prefetch, iterator)
+                chunks, iterator = await asyncio.wrap_future(prefetch)
+            if chunked:
+                writer.write(b'0\r\n\r\n')
+                await writer.drain()
+            return keep_alive
+        finally:
+            if hasattr(result, 'close'):
+                close = functools.partial(self.pool.submit, context.run, result.close)
+                if prefetch is None or prefetch.done():
+                    close()
+                else:
+                    # Cancelled mid-prefetch: a context runs on one thread at a time, so close after it
+                    prefetch.add_done_callback(lambda _: close())
+
+    def _call_app(self, environ):
+        """Runs on the pool: calls the app and collects the first chunks of its body"""
+        response = []
+
+        def start_response(status, headers, exc_info=None):
+            response[:] = [status, headers]
+            return lambda data: None  # The legacy write() callable: unused by Flask
+
+        result = web.app(environ, start_response)
+        chunks, iterator = self._prefetch(iter(result))
+        status, headers = response
+        return status, headers, chunks, iterator, result
+
+    @staticmethod
+    def _prefetch(iterator):
+        """Up to PREFETCH_BYTES of body chunks, and the iterator if there is more (else None)"""
+        chunks, size = [], 0
+        while size < PREFETCH_BYTES:
+            chunk = next(iterator, _END)
+            if chunk is _END:
+                return chunks, None
+            chunks.append(chunk)
+            size += len(chunk)
+        return chunks, iterator
+
+    def _environ(self, request):
+        host, port = self.address
+        peer = request.peer or ('', 0)
+        environ = {
+            'REQUEST_METHOD': request.method,
+            'SCRIPT_NAME': '',
+            'PATH_INFO': unquote_to_bytes(request.path).decode('latin-1'),
+            'QUERY_STRING': request.query,
+            'SERVER_NAME': host,
+            'SERVER_PORT': str(port),
+            'SERVER_PROTOCOL': request.version,
+            'REMOTE_ADDR': peer[0],
+            'REMOTE_PORT': str(peer[1]),
+            'wsgi.version': (1, 0),
+            'wsgi.url_scheme': 'http',
+            'wsgi.input': BytesIO(request.body),
+            'wsgi.errors': sys.stderr,
+            'wsgi.multithread': True,
+            'wsgi.multiprocess': False,
+            'wsgi.run_once': False,
+        }
+        for name, value in request.headers.items():
+            key = name.upper().replace('-', '_')
+            if key not in ('CONTENT_TYPE', 'CONTENT_LENGTH'):
+                key = 'HTTP_' + key
+            environ[key] = f"{environ[key]},{value}" if key in environ else value
+        return environ
+
+
+def run(host, port, workers=WSGI_WORKERS):
+    """Serves the dashboard until interrupted; the collector keeps running in its own thread"""
+    server = AsyncDashboardServer(host, port, workers)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+def start_in_thread(host='127.0.0.1', port=0, workers=WSGI_WORKERS):
+    """Starts a server on its own event loop thread (tests, benchmarks); returns it once listening"""
+    server = AsyncDashboardServer(host, port, workers)
+    started = threading.Event()
+
+    async def main():
+        await server.start()
+        started.set()
+        await server.serve_forever()
+
+    threading.Thread(target=lambda: asyncio.run(main()), name='async-server', daemon=True).start()
+    if not started.wait(10):
+        raise RuntimeError("Asyncio server did not start")
+    return server
+
+if __name__ == "__main__":
+    import urllib.request
+    server = start_in_thread()
+    host, port = server.address
+    web._publish_snapshot(web.devices.default, 1000.0, {'temperature': 21.5}, {'pressure': 1.0}, 100.0)
+    for path in ('/api/sensor_data', '/api/alarms/status'):
+        with urllib.request.urlopen(f"http://{host}:{port}{path}") as response:
+            print(path, response.status, response.headers.get('ETag'), response.read()[:80])
+    print(server.stats())
@@ -0,0 +1,63 @@
+"""
+International Standard Atmosphere (ISA) barometric model
+Altitude <-> pressure conversion for scalars and NumPy arrays
+"""
+import math
+import numpy as np
+
+# ISA sea-level reference and layer constants
+SEA_LEVEL_PRESSURE_ATM = 1.0
+SEA_LEVEL_TEMPERATURE_K = 288.15
+LAPSE_RATE_K_PER_M = 0.0065
+GRAVITY = 9.80665
+MOLAR_MASS_AIR = 0.0289644
+GAS_CONSTANT = 8.3144598
+
+TROPOPAUSE_ALTITUDE_M = 11000.0
+MAX_ALTITUDE_M = 20000.0   # Top of the isothermal layer covered here
+MIN_ALTITUDE_M = -610.0    # Lowest altitude defined by ISA
+
+_EXPONENT = GRAVITY * MOLAR_MASS_AIR / (GAS_CONSTANT * LAPSE_RATE_K_PER_M)   # ~5.2559
+_INV_EXPONENT = 1.0 / _EXPONENT
+_SCALE_HEIGHT_FACTOR = SEA_LEVEL_TEMPERATURE_K / LAPSE_RATE_K_PER_M          # ~44330.8 m
+_TROPOPAUSE_TEMPERATURE_K = SEA_LEVEL_TEMPERATURE_K - LAPSE_RATE_K_PER_M * TROPOPAUSE_ALTITUDE_M
+_TROPOPAUSE_PRESSURE_ATM = SEA_LEVEL_PRESSURE_ATM * (_TROPOPAUSE_TEMPERATURE_K / SEA_LEVEL_TEMPERATURE_K) ** _EXPONENT
+_STRATOSPHERE_DECAY = GRAVITY * MOLAR_MASS_AIR / (GAS_CONSTANT * _TROPOPAUSE_TEMPERATURE_K)
+
+def altitude_to_pressure(altitude_meters):
+    """ISA pressure (atm) at a geopotential altitude, clamped to the modelled range"""
+    altitude = min(max(altitude_meters, MIN_ALTITUDE_M), MAX_ALTITUDE_M)
+    if altitude <= TROPOPAUSE_ALTITUDE_M:
+        return SEA_LEVEL_PRESSURE_ATM * (1.0 - altitude / _SCALE_HEIGHT_FACTOR) ** _EXPONENT
+    return _TROPOPAUSE_PRESSURE_ATM * math.exp(-_STRATOSPHERE_DECAY * (altitude - TROPOPAUSE_ALTITUDE_M))
+
+def pressure_to_altitude(pressure_atm):
+    """Closed-form ISA inverse: altitude (m) at which the standard pressure equals pressure_atm"""
+    if pressure_atm <= 0:
+        return MAX_ALTITUDE_M
+    if pressure_atm >= _TROPOPAUSE_PRESSURE_ATM:
+        altitude = _SCALE_HEIGHT_FACTOR * (1.0 - (pressure_atm / SEA_LEVEL_PRESSURE_ATM) ** _INV_EXPONENT)
+    else:
+        altitude = TROPOPAUSE_ALTITUDE_M + math.log(_TROPOPAUSE_PRESSURE_ATM / pressure_atm) / _STRATOSPHERE_DECAY
+    return min(max(altitude, MIN_ALTITUDE_M), MAX_ALTITUDE_M)
+
+def altitudes_to_pressures(altitudes_meters):
+    """Vectorized altitude_to_pressure"""
+    altitudes = np.clip(np.asarray(altitudes_meters, dtype=np.float64), MIN_ALTITUDE_M, MAX_ALTITUDE_M)
+    troposphere = SEA_LEVEL_PRESSURE_ATM * (1.0 - np.minimum(altitudes, TROPOPAUSE_ALTITUDE_M) / _SCALE_HEIGHT_FACTOR) ** _EXPONENT
+    stratosphere = _TROPOPAUSE_PRESSURE_ATM * np.exp(-_STRATOSPHERE_DECAY * (altitudes - TROPOPAUSE_ALTITUDE_M))
+    return np.where(altitudes <= TROPOPAUSE_ALTITUDE_M, troposphere, stratosphere)
+
+def pressures_to_altitudes(pressures_atm):
+    """
+    Vectorized pressure_to_altitude, e.g. estimated altitude for a whole
+    history window or many devices in one call. Missing readings (NaN) stay NaN.
+    """
+    pressures = np.asarray(pressures_atm, dtype=np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        safe = np.where(pressures > 0, pressures, np.nan)
+        troposphere = _SCALE_HEIGHT_FACTOR * (1.0 - (safe / SEA_LEVEL_PRESSURE_ATM) ** _INV_EXPONENT)
+        stratosphere = TROPOPAUSE_ALTITUDE_M + np.log(_TROPOPAUSE_PRESSURE_ATM / safe) / _STRATOSPHERE_DECAY
+        altitudes = np.where(safe >= _TROPOPAUSE_PRESSURE_ATM, troposphere, stratosphere)
+    altitudes = np.where(pressures <= 0, MAX_ALTITUDE_M, altitudes)
+    return np.clip(altitudes, MIN_ALTITUDE_M, MAX_ALTITUDE_M)
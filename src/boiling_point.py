@@ -0,0 +1,77 @@
+"""
+Water boiling point model for IoT Smart Thermometer
+Antoine equation backed by a precomputed interpolation table
+"""
+import math
+import numpy as np
+
+# Antoine constants for water (P in mmHg, T in °C)
+ANTOINE_A = 8.07131
+ANTOINE_B = 1730.63
+ANTOINE_C = 233.426
+MMHG_PER_ATM = 760.0
+
+def antoine_boiling_point(pressure_atm):
+    """Direct Antoine evaluation: temperature (°C) at which water vapour pressure equals pressure_atm"""
+    if pressure_atm <= 0:
+        return 0
+    return ANTOINE_B / (ANTOINE_A - math.log10(pressure_atm * MMHG_PER_ATM)) - ANTOINE_C
+
+def antoine_boiling_points(pressures_atm):
+    """Direct Antoine evaluation over a NumPy array (non-positive pressures map to 0)"""
+    pressures = np.asarray(pressures_atm, dtype=np.float64)
+    result = np.zeros_like(pressures)
+    valid = pressures > 0
+    result[valid] = ANTOINE_B / (ANTOINE_A - np.log10(pressures[valid] * MMHG_PER_ATM)) - ANTOINE_C
+    return result
+
+
+class BoilingPointTable:
+    """
+    Dense lookup table of the Antoine curve with linear interpolation on a
+    uniform grid (index computed directly, no search). Pressures outside the
+    table fall back to direct evaluation.
+
+    In CPython the direct Antoine formula is already cheaper than a table
+    lookup (see benchmarks/bench_boiling_point.py), so calculate_boiling_point
+    evaluates it directly; the table is kept for models that are expensive to
+    evaluate and as the benchmark baseline.
+    """
+
+    def __init__(self, p_min=0.05, p_max=3.0, step=0.001):
+        self.p_min = p_min
+        self.step = step
+        self._inv_step = 1.0 / step
+        count = int(round((p_max - p_min) / step)) + 1
+        self.p_max = p_min + (count - 1) * step
+
+        self.pressures = p_min + np.arange(count) * step
+        self.temperatures = antoine_boiling_points(self.pressures)
+        self._slopes = np.diff(self.temperatures)
+        self._values = self.temperatures.tolist()  # Python floats for the scalar path
+        self._slope_values = self._slopes.tolist()
+        self._last_index = count - 1
+
+    def lookup(self, pressure_atm):
+        """Scalar lookup"""
+        position = (pressure_atm - self.p_min) * self._inv_step
+        index = int(position)
+        if position < 0 or index >= self._last_index:
+            return antoine_boiling_point(pressure_atm)
+        return self._values[index] + self._slope_values[index] * (position - index)
+
+    def lookup_array(self, pressures_atm):
+        """Vectorized lookup for history windows or whole fleets"""
+        pressures = np.asarray(pressures_atm, dtype=np.float64)
+        position = (pressures - self.p_min) * self._inv_step
+        index = position.astype(np.intp)
+        np.clip(index, 0, self._last_index - 1, out=index)
+        result = self.temperatures[index] + self._slopes[index] * (position - index)
+        outside = (pressures < self.p_min) | (pressures > self.p_max)
+        if outside.any():
+            result[outside] = antoine_boiling_points(pressures[outside])
+        return result
+
+
+# Shared default table
+BOILING_POINT_TABLE = BoilingPointTable()
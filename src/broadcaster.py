@@ -0,0 +1,177 @@
+"""
+Fan-out of live collector events to streaming clients
+One broadcaster, a bounded queue per subscriber, newest-wins coalescing for slow consumers
+"""
+import json
+import threading
+import logging
+from collections import OrderedDict
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DEFAULT_QUEUE_SIZE = 64  # Pending messages per subscriber
+
+
+def format_sse(event, data, event_id=None):
+    """One Server-Sent Events message; data is a JSON-serializable object or pre-serialized JSON text/bytes"""
+    if isinstance(data, bytes):
+        data = data.decode()
+    elif not isinstance(data, str):
+        data = json.dumps(data, default=str)
+    lines = [f"id: {event_id}"] if event_id is not None else []
+    lines.append(f"event: {event}")
+    lines.extend(f"data: {line}" for line in data.split('\n'))
+    return '\n'.join(lines) + '\n\n'
+
+
+class Subscription:
+    """
+    Pending messages of one client. A message published with a coalesce key
+    replaces a still-pending message with the same key in place (a client
+    that is behind only gets the newest reading). Messages without a key
+    queue up; when the queue is full the oldest is dropped and counted, so
+    the client can be told to resynchronize.
+
+    `notify`, if given, is called after every put() (e.g. to wake a
+    coroutine instead of a thread blocked in get()).
+    """
+
+    def __init__(self, queue_size=DEFAULT_QUEUE_SIZE, raw=False, notify=None):
+        self.queue_size = queue_size
+        self.raw = raw  # Receives (event, data, event_id) tuples instead of SSE text
+        self.notify = notify
+        self.dropped = 0
+        self.coalesced = 0
+        self.closed = False
+        self._pending = OrderedDict()  # key -> message; unkeyed messages get a unique key
+        self._counter = 0
+        self._condition = threading.Condition()
+
+    def put(self, message, coalesce_key=None):
+        with self._condition:
+            if coalesce_key is not None and coalesce_key in self._pending:
+                self._pending[coalesce_key] = message
+                self.coalesced += 1
+            else:
+                if len(self._pending) >= self.queue_size:
+                    self._pending.popitem(last=False)
+                    self.dropped += 1
+                if coalesce_key is None:
+                    self._counter += 1
+                    coalesce_key = ('seq', self._counter)
+                self._pending[coalesce_key] = message
+            self._condition.notify()
+        if self.notify is not None:
+            self.notify()
+
+    def get(self, timeout=None):
+        """Oldest pending message, or None after `timeout` seconds (or once closed)"""
+        with self._condition:
+            if not self._pending and not self.closed:
+                self._condition.wait(timeout)
+            if not self._pending:
+                return None
+            return self._pending.popitem(last=False)[1]
+
+    def take_dropped(self):
+        """Messages dropped since the last call"""
+        with self._condition:
+            dropped, self.dropped = self.dropped, 0
+            return dropped
+
+    def close(self):
+        with self._condition:
+            self.closed = True
+            self._condition.notify_all()
+
+
+class Broadcaster:
+    """
+    Publishers call publish() from any thread; each message is formatted
+    once and handed to every subscriber's queue, so publishing never blocks
+    on a slow client. Raw subscribers (e.g. WebSocket sessions that encode
+    their own frames) get the unformatted event instead. Listeners get every
+    event as published, coalesce key included, to relay it elsewhere (e.g.
+    into an event loop).
+    """
+
+    def __init__(self, queue_size=DEFAULT_QUEUE_SIZE):
+        self.queue_size = queue_size
+        self.published = 0
+        self._subscribers = set()
+        self._listeners = []
+        self._lock = threading.Lock()
+
+    def subscribe(self, raw=False, notify=None):
+        subscription = Subscription(self.queue_size, raw, notify)
+        with self._lock:
+            self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscribers.discard(subscription)
+        subscription.close()
+
+    def add_listener(self, listener):
+        """listener(event, data, event_id, coalesce_key) runs in the publishing thread: it must not block"""
+        with self._lock:
+            self._listeners.append(listener)
+
+    def remove_listener(self, listener):
+        with self._lock:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+    def publish(self, event, data, event_id=None, coalesce_key=None):
+        """Sends one event to every subscriber; returns the number of subscribers reached"""
+        with self._lock:
+            subscribers = list(self._subscribers)
+            listeners = list(self._listeners)
+            self.published += 1
+        for listener in listeners:
+            try:
+                listener(event, data, event_id, coalesce_key)
+            except Exception as e:
+                logger.warning(f"Broadcast listener failed: {e}")
+        if not subscribers:
+            return 0
+        message = None
+        for subscription in subscribers:
+            if subscription.raw:
+                subscription.put((event, data, event_id), coalesce_key)
+                continue
+            if message is None:
+                message = format_sse(event, data, event_id)
+            subscription.put(message, coalesce_key)
+        return len(subscribers)
+
+    def __len__(self):
+        return len(self._subscribers)
+
+    def stats(self):
+        with self._lock:
+            subscribers = list(self._subscribers)
+        return {
+            'subscribers': len(subscribers),
+            'listeners': len(self._listeners),
+            'published': self.published,
+            'queue_size': self.queue_size,
+            'dropped': sum(s.dropped for s in subscribers),
+            'coalesced': sum(s.coalesced for s in subscribers),
+        }
+
+if __name__ == "__main__":
+    broadcaster = Broadcaster(queue_size=3)
+    client = broadcaster.subscribe()
+    for i in range(5):
+        broadcaster.publish('reading', {'temperature': 20 + i}, event_id=i, coalesce_key='reading')
+    for i in range(5):
+        broadcaster.publish('alarm', {'id': f'alarm_{i}'})
+    print(f"dropped={client.dropped} coalesced={client.coalesced}")
+    while True:
+        message = client.get(timeout=0)
+        if message is None:
+            break
+        print(message, end='')
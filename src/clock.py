@@ -0,0 +1,143 @@
+"""
+Clock abstraction for IoT Smart Thermometer
+Lets sensors, alarms and the collector run on real or simulated time
+"""
+import time
+import threading
+import logging
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class SystemClock:
+    """Real wall-clock time"""
+
+    speed = 1.0
+
+    def time(self):
+        return time.time()
+
+    def sleep(self, seconds):
+        if seconds > 0:
+            time.sleep(seconds)
+
+    def detach(self):
+        pass
+
+
+class VirtualClock:
+    """
+    Simulated time for replaying cook cycles faster than real time.
+
+    With a numeric speed the clock runs `speed` times faster than wall time
+    and sleep() is shortened accordingly. With speed=None the clock runs as
+    fast as possible: virtual time only moves when every thread that sleeps
+    on this clock is asleep, and then jumps straight to the earliest wake-up.
+    """
+
+    def __init__(self, speed=None, start_time=None):
+        if speed is not None and speed <= 0:
+            raise ValueError("speed must be positive (or None for as fast as possible)")
+        self.speed = speed
+        self._start_real = time.monotonic()
+        self._start_virtual = time.time() if start_time is None else float(start_time)
+        self._offset = 0.0
+        self._now = self._start_virtual
+
+        # Estado do escalonador (modo o mais rápido possível)
+        self._cond = threading.Condition()
+        self._sleepers = {}  # thread ident -> virtual wake-up time
+        self._participants = {}
+
+    @property
+    def as_fast_as_possible(self):
+        return self.speed is None
+
+    def time(self):
+        if self.speed is None:
+            return self._now
+        return self._start_virtual + (time.monotonic() - self._start_real) * self.speed + self._offset
+
+    def sleep(self, seconds):
+        if self.speed is not None:
+            if seconds > 0:
+                time.sleep(seconds / self.speed)
+            return
+
+        if seconds <= 0:
+            return
+        thread = threading.current_thread()
+        with self._cond:
+            self._participants[thread.ident] = thread
+            self._sleepers[thread.ident] = self._now + seconds
+            try:
+                while thread.ident in self._sleepers:
+                    self._prune_participants()
+                    if len(self._sleepers) >= len(self._participants):
+                        # Everyone is asleep: jump to the earliest wake-up and release those sleepers
+                        self._now = max(self._now, min(self._sleepers.values()))
+                        for ident, wake_at in list(self._sleepers.items()):
+                            if wake_at <= self._now:
+                                del self._sleepers[ident]
+                        self._cond.notify_all()
+                    else:
+                        self._cond.wait(0.05)
+            finally:
+                self._sleepers.pop(thread.ident, None)
+
+    def advance(self, seconds):
+        """Moves virtual time forward manually (useful in tests)"""
+        with self._cond:
+            if self.speed is None:
+                self._now += seconds
+                for ident, wake_at in list(self._sleepers.items()):
+                    if wake_at <= self._now:
+                        del self._sleepers[ident]
+            else:
+                self._offset += seconds
+            self._cond.notify_all()
+
+    def detach(self):
+        """Stops the calling thread from holding back virtual time"""
+        with self._cond:
+            ident = threading.get_ident()
+            self._participants.pop(ident, None)
+            self._sleepers.pop(ident, None)
+            self._cond.notify_all()
+
+    def _prune_participants(self):
+        for ident, thread in list(self._participants.items()):
+            if not thread.is_alive():
+                del self._participants[ident]
+                self._sleepers.pop(ident, None)
+
+
+def parse_speed(value):
+    """
+    Parses a --speed argument: '100x' or '100' -> 100.0,
+    'max'/'asap'/'inf' -> None (as fast as possible)
+    """
+    text = str(value).strip().lower()
+    if text in ('max', 'asap', 'inf', 'fast'):
+        return None
+    if text.endswith('x'):
+        text = text[:-1]
+    speed = float(text)
+    if speed <= 0:
+        raise ValueError("Speed must be positive")
+    return speed
+
+
+# Shared clock used by every module unless one is passed explicitly
+_clock = SystemClock()
+
+def get_clock():
+    """Returns the shared clock"""
+    return _clock
+
+def set_clock(clock):
+    """Replaces the shared clock (call before creating sensors)"""
+    global _clock
+    _clock = clock
+    logger.info(f"Clock set to {type(clock).__name__} (speed: {getattr(clock, 'speed', 1.0) or 'max'})")
+    return clock
@@ -0,0 +1,185 @@
+"""
+Negotiated response compression for the Flask dashboard
+gzip (and brotli, when installed) by Accept-Encoding, above a size threshold, with compressed bodies cached by ETag
+"""
+import zlib
+import logging
+import threading
+from collections import OrderedDict
+from flask import request
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5  # Dynamic responses: well under the ~20x slower quality 11, most of its ratio
+DEFAULT_MIN_SIZE = 1024  # Smaller bodies fit in a packet or two either way
+CACHE_ENTRIES = 64  # Compressed bodies kept, keyed by (URL, ETag, encoding)
+CACHE_MAX_BODY = 4 << 20  # ETagged streamed bodies up to this size are buffered to use the cache
+COMPRESSIBLE_TYPES = ('text/', 'application/json', 'application/x-ndjson', 'application/javascript',
+                      'application/xml', 'image/svg+xml')
+# Never compressed: each event must reach the client as soon as it is written
+UNBUFFERED_TYPES = ('text/event-stream',)
+
+ENCODINGS = ('br', 'gzip') if brotli is not None else ('gzip',)  # Server preference order
+
+def parse_accept_encoding(header):
+    """{coding: q} from an Accept-Encoding header value"""
+    codings = {}
+    for part in (header or '').split(','):
+        name, *params = [item.strip() for item in part.split(';')]
+        if not name:
+            continue
+        q = 1.0
+        for param in params:
+            key, _, value = param.partition('=')
+            if key.strip().lower() == 'q':
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        codings[name.lower()] = q
+    return codings
+
+def negotiate(header, encodings=ENCODINGS):
+    """Best supported content coding the client accepts, or None for identity"""
+    accepted = parse_accept_encoding(header)
+    best, best_q = None, 0.0
+    for encoding in encodings:
+        q = accepted.get(encoding, accepted.get('*', 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+def compressor(encoding):
+    """(process, finish) functions of a streaming compressor for one body"""
+    if encoding == 'br':
+        stream = brotli.Compressor(quality=BROTLI_QUALITY)
+        return stream.process, stream.finish
+    stream = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)  # wbits 31: gzip container
+    return stream.compress, stream.flush
+
+def compress(data, encoding):
+    process, finish = compressor(encoding)
+    return process(data) + finish()
+
+
+class ResponseCompressor:
+    """
+    after_request hook compressing 200 responses of compressible types whose
+    client sent a matching Accept-Encoding. Buffered bodies under `min_size`
+    are sent as-is. Streamed bodies (exports) are compressed chunk by chunk
+    as they are generated; Server-Sent Events are never compressed.
+
+    Responses with an ETag are versioned snapshots: their compressed bytes
+    are cached per (URL, ETag, encoding), so polling clients cost one compression
+    per version. As nginx does, the ETag of a compressed representation is
+    made weak; If-None-Match uses weak comparison, so 304s keep working.
+    """
+
+    def __init__(self, app=None, min_size=DEFAULT_MIN_SIZE, cache_entries=CACHE_ENTRIES):
+        self.min_size = min_size
+        self.cache_entries = cache_entries
+        self.hits = 0
+        self.misses = 0
+        self.compressed = 0
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.after_request(self.after_request)
+
+    def after_request(self, response):
+        if (response.status_code != 200 or 'Content-Encoding' in response.headers
+                or not response.mimetype.startswith(COMPRESSIBLE_TYPES)
+                or response.mimetype.startswith(UNBUFFERED_TYPES)):
+            return response
+        length = response.content_length
+        if length is not None and length < self.min_size:
+            return response
+        response.vary.add('Accept-Encoding')
+        encoding = negotiate(request.headers.get('Accept-Encoding'))
+        if encoding is None:
+            return response
+
+        etag, weak = response.get_etag()
+        if response.is_streamed and (etag is None or length is None or length > CACHE_MAX_BODY):
+            self._compress_stream(response, encoding)
+            return response
+
+        response.direct_passthrough = False  # Static files: read the file into the body
+        body = response.get_data()
+        if len(body) < self.min_size:
+            return response
+        if etag:
+            compressed = self._cached((request.full_path, etag, encoding), body, encoding)
+        else:
+            compressed = compress(body, encoding)
+        response.set_data(compressed)  # Also sets Content-Length
+        response.headers['Content-Encoding'] = encoding
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+        self.compressed += 1
+        return response
+
+    def _cached(self, key, body, encoding):
+        with self._lock:
+            compressed = self._cache.get(key)
+            if compressed is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return compressed
+        compressed = compress(body, encoding)
+        with self._lock:
+            self.misses += 1
+            self._cache[key] = compressed
+            while len(self._cache) > self.cache_entries:
+                self._cache.popitem(last=False)
+        return compressed
+
+    def _compress_stream(self, response, encoding):
+        chunks = response.response
+        process, finish = compressor(encoding)
+
+        def compressed_chunks():
+            try:
+                for chunk in chunks:
+                    data = process(chunk.encode() if isinstance(chunk, str) else chunk)
+                    if data:
+                        yield data
+                yield finish()
+            finally:
+                if hasattr(chunks, 'close'):
+                    chunks.close()
+
+        response.direct_passthrough = False
+        response.response = compressed_chunks()
+        response.headers.pop('Content-Length', None)
+        response.headers['Content-Encoding'] = encoding
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+        self.compressed += 1
+
+    def stats(self):
+        return {
+            'encodings': list(ENCODINGS),
+            'min_size': self.min_size,
+            'compressed_responses': self.compressed,
+            'cache_entries': len(self._cache),
+            'cache_hits': self.hits,
+            'cache_misses': self.misses,
+        }
+
+if __name__ == "__main__":
+    import json
+    body = json.dumps({'temperatures': [20.0 + i * 0.1 for i in range(2000)]}).encode()
+    print(f"encodings={ENCODINGS} negotiate('gzip;q=0.5, br')={negotiate('gzip;q=0.5, br')!r}")
+    for encoding in ENCODINGS:
+        print(f"{encoding}: {len(body)} -> {len(compress(body, encoding))} bytes")
@@ -3,6 +3,10 @@ Configuration management for IoT Smart Thermometer
 """
 import os
 from dotenv import load_dotenv
+try:
+    from .boiling_point import antoine_boiling_point, antoine_boiling_points
+except ImportError:
+    from boiling_point import antoine_boiling_point, antoine_boiling_points
 
 # Load environment variables
 load_dotenv()
@@ -20,6 +24,7 @@ class Config:
     WEB_HOST = os.getenv('WEB_HOST', 'localhost')
     WEB_PORT = int(os.getenv('WEB_PORT', 5000))
     WEB_DEBUG = os.getenv('WEB_DEBUG', 'False').lower() == 'true'
+    WEB_SERVER = os.getenv('WEB_SERVER', 'threaded')  # 'threaded' (Flask) or 'asyncio' (src/async_server.py)
     
     # Mobile App Configuration
     MOBILE_HOST = os.getenv('MOBILE_HOST', 'localhost')
@@ -30,6 +35,8 @@ class Config:
     TEMP_MAX = float(os.getenv('TEMP_MAX', 120.0))  # Celsius
     PRESSURE_MIN = float(os.getenv('PRESSURE_MIN', 0.5))  # atm
     PRESSURE_MAX = float(os.getenv('PRESSURE_MAX', 1.5))  # atm
+    TEMPERATURE_ENGINE = os.getenv('TEMPERATURE_ENGINE', 'thread')  # 'thread' or 'analytic'
+    SIMULATION_SEED = int(os.getenv('SIMULATION_SEED')) if os.getenv('SIMULATION_SEED') else None
     
     # Physical Constants
     WATER_BOILING_POINT_1ATM = 100.0  # Celsius at 1 atm
@@ -41,6 +48,25 @@ class Config:
     # Blynk Configuration (if using Blynk)
     BLYNK_AUTH_TOKEN = os.getenv('BLYNK_AUTH_TOKEN', '')
     
+    # Sensor history (ring buffer capacity, in samples)
+    HISTORY_CAPACITY = int(os.getenv('HISTORY_CAPACITY', 28800))  # 24 h at one sample every 3 s
+    # Persistent history: segment files under HISTORY_DIR (unset = memory only)
+    HISTORY_DIR = os.getenv('HISTORY_DIR') or None
+    HISTORY_SEGMENT_RECORDS = int(os.getenv('HISTORY_SEGMENT_RECORDS', 28800))  # Records per segment file
+    HISTORY_COMPRESSION = os.getenv('HISTORY_COMPRESSION', 'none')  # 'none' or 'gorilla' (sealed segments)
+    # SQLite history database for readings and alarms (unset = disabled)
+    HISTORY_DB = os.getenv('HISTORY_DB') or None
+    HISTORY_DB_BATCH_SIZE = int(os.getenv('HISTORY_DB_BATCH_SIZE', 100))  # Readings per commit
+    HISTORY_DB_FLUSH_MS = int(os.getenv('HISTORY_DB_FLUSH_MS', 1000))  # Max delay before pending readings are committed
+    # Retention per tier (raw, 1s, 1m, 1h, alarms), enforced by the background compactor
+    HISTORY_RETENTION = os.getenv('HISTORY_RETENTION', 'raw=24h,1s=24h,1m=30d,1h=365d,alarms=365d')
+    COMPACTION_INTERVAL = float(os.getenv('COMPACTION_INTERVAL', 300))  # Seconds between compaction passes
+    # Shared-memory history for multi-process serving (unset = per-process history)
+    HISTORY_SHARED_MEMORY = os.getenv('HISTORY_SHARED_MEMORY') or None  # Segment name prefix
+    HISTORY_SHARED_ROLE = os.getenv('HISTORY_SHARED_ROLE', 'collector')  # 'collector' (one process) or 'reader'
+    # HTTP response compression (gzip, or brotli when installed) for bodies of at least this many bytes
+    COMPRESSION_MIN_BYTES = int(os.getenv('COMPRESSION_MIN_BYTES', 1024))
+    
     # Data Update Intervals (seconds)
     SENSOR_UPDATE_INTERVAL = 2
     MQTT_PUBLISH_INTERVAL = 3
@@ -50,19 +76,24 @@ class Config:
 def calculate_boiling_point(pressure_atm):
     """
     Calculate water boiling point based on atmospheric pressure
-    Using Antoine equation approximation for water
+    Using the Antoine equation for water
     """
     if pressure_atm <= 0:
         return 0
     
-    # Simplified calculation for educational purposes
-    # Real formula would be more complex
-    base_temp = 100.0  # °C at 1 atm
-    pressure_factor = 25.0  # Temperature change per atm
-    
-    return base_temp + pressure_factor * (pressure_atm - 1.0)
+    return antoine_boiling_point(pressure_atm)
+
+def calculate_boiling_points(pressures_atm):
+    """
+    Vectorized boiling point for a NumPy array of pressures
+    (history windows, fleets). Non-positive pressures map to 0.
+    """
+    return antoine_boiling_points(pressures_atm)
 
 # Device identification
 DEVICE_ID = os.getenv('DEVICE_ID', 'smart_thermometer_001')
 DEVICE_NAME = os.getenv('DEVICE_NAME', 'Smart Food Thermometer')
 DEVICE_LOCATION = os.getenv('DEVICE_LOCATION', 'Kitchen')
+# Devices served by one dashboard/collector (comma-separated ids); DEVICE_ID is always the default one
+DEVICE_IDS = list(dict.fromkeys(
+    [DEVICE_ID] + [device_id.strip() for device_id in os.getenv('DEVICE_IDS', '').split(',') if device_id.strip()]))
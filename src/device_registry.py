@@ -0,0 +1,93 @@
+"""
+Device registry for the dashboard
+Per-device sensors, alarm manager, history and live state, looked up by device id in O(1)
+"""
+import logging
+import threading
+try:
+    from .broadcaster import Broadcaster
+    from .json_codec import EncodedCache
+except ImportError:
+    from broadcaster import Broadcaster
+    from json_codec import EncodedCache
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class Device:
+    """
+    Everything the dashboard keeps for one kettle: its sensors and alarm
+    manager (set when the systems are initialized), its history stores, the
+    collector's latest SensorSnapshot (replaced, never mutated, every tick),
+    a status version bumped by controls and alarms, and the broadcaster
+    fanning its live events out to stream and WebSocket clients.
+    """
+
+    def __init__(self, device_id, name=None, data_history=None, history_store=None, history_rollups=None):
+        self.device_id = device_id
+        self.name = name or device_id
+        self.temperature_sensor = None
+        self.pressure_sensor = None
+        self.alarm_manager = None
+        self.data_history = data_history
+        self.history_store = history_store  # Segment files, or None (memory/database only)
+        self.history_rollups = history_rollups
+        self.latest_snapshot = None
+        self.status_version = 0
+        self.events = Broadcaster()
+        # Encoded once per alarm version; the manager is part of the key, so a re-created one starts fresh
+        self.alarm_status_cache = EncodedCache(lambda: self.alarm_manager.get_status())
+        self.system_status_cache = None  # EncodedCache of the web app's status body, set by the web app
+
+    def __repr__(self):
+        return f"Device({self.device_id!r})"
+
+
+class DeviceRegistry:
+    """
+    Devices by id. The dict is replaced as a whole when a device is added,
+    so lookups (one per request) take no lock. Iteration follows
+    registration order; the default device is the one the unscoped routes
+    serve.
+    """
+
+    def __init__(self, default_id):
+        self.default_id = default_id
+        self._devices = {}
+        self._lock = threading.Lock()
+
+    def add(self, device):
+        with self._lock:
+            if device.device_id in self._devices:
+                raise ValueError(f"Device already registered: {device.device_id}")
+            devices = dict(self._devices)
+            devices[device.device_id] = device
+            self._devices = devices
+        return device
+
+    def get(self, device_id):
+        """The device with this id, or None"""
+        return self._devices.get(device_id)
+
+    @property
+    def default(self):
+        return self._devices[self.default_id]
+
+    def ids(self):
+        return list(self._devices)
+
+    def __contains__(self, device_id):
+        return device_id in self._devices
+
+    def __iter__(self):
+        return iter(self._devices.values())
+
+    def __len__(self):
+        return len(self._devices)
+
+if __name__ == "__main__":
+    registry = DeviceRegistry('kettle_01')
+    for i in range(1, 4):
+        registry.add(Device(f'kettle_{i:02d}'))
+    print(registry.default, registry.get('kettle_03'), registry.get('missing'), len(registry), registry.ids())
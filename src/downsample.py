@@ -0,0 +1,64 @@
+"""
+Largest-Triangle-Three-Buckets (LTTB) downsampling for chart series
+Keeps the visual shape of a long series in a fixed number of points
+"""
+import numpy as np
+
+def lttb_indices(x, y, threshold):
+    """
+    Indices of the `threshold` points LTTB keeps from (x, y). The first and
+    last points are always kept; each bucket in between contributes the point
+    forming the largest triangle with the previously kept point and the mean
+    of the next bucket. Bucket means and triangle areas are computed with
+    NumPy, so the Python loop runs once per output point, independent of len(x).
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+
+    # Bucket edges over the interior points [1, n - 1)
+    edges = np.floor(np.linspace(1, n - 1, threshold - 1)).astype(np.intp)
+    edges[-1] = n - 1
+
+    # Mean of every bucket at once (cumulative sums), plus the last point as the final "next bucket"
+    x_sums = np.concatenate(([0.0], np.cumsum(x)))
+    y_sums = np.concatenate(([0.0], np.cumsum(y)))
+    lengths = np.maximum(edges[1:] - edges[:-1], 1)
+    x_means = np.append((x_sums[edges[1:]] - x_sums[edges[:-1]]) / lengths, x[-1])
+    y_means = np.append((y_sums[edges[1:]] - y_sums[edges[:-1]]) / lengths, y[-1])
+
+    selected = np.empty(threshold, dtype=np.intp)
+    selected[0] = 0
+    selected[-1] = n - 1
+    a = 0
+    for i in range(threshold - 2):
+        lo, hi = edges[i], edges[i + 1]
+        if hi <= lo:
+            hi = lo + 1
+        ax, ay = x[a], y[a]
+        cx, cy = x_means[i + 1], y_means[i + 1]
+        # Twice the triangle area; the constant factor does not change the argmax
+        areas = np.abs((ax - cx) * (y[lo:hi] - ay) - (ax - x[lo:hi]) * (cy - ay))
+        a = lo + int(np.argmax(areas))
+        selected[i + 1] = a
+    return selected
+
+def lttb(x, y, threshold):
+    """Downsampled (x, y) arrays"""
+    indices = lttb_indices(x, y, threshold)
+    return np.asarray(x)[indices], np.asarray(y)[indices]
+
+if __name__ == "__main__":
+    import time
+
+    n = 1_000_000
+    x = np.arange(n, dtype=np.float64)
+    y = np.sin(x / 5000.0) + np.random.default_rng(0).normal(0, 0.05, n)
+    start = time.perf_counter()
+    indices = lttb_indices(x, y, 500)
+    elapsed = time.perf_counter() - start
+    print(f"LTTB {n:,} -> {len(indices)} points in {elapsed * 1000:.1f} ms")
+    assert indices[0] == 0 and indices[-1] == n - 1 and np.all(np.diff(indices) > 0)
@@ -0,0 +1,254 @@
+"""
+Fleet Temperature Simulator - Smart Food Thermometer
+Vectorized heating/cooling simulation for many devices in a single thread
+"""
+import time
+import threading
+import logging
+import numpy as np
+try:
+    from .clock import get_clock
+except ImportError:
+    from clock import get_clock
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class FleetTemperatureSimulator:
+    """
+    Simulates N kettles with the same model as PrecisionTemperatureSensor,
+    keeping all per-device state in NumPy arrays and advancing every device
+    in one vectorized step per tick.
+    """
+
+    def __init__(self, n_devices, device_ids=None, ambient_temp=20.0, tick_interval=0.1, autostart=True, clock=None, seed=None):
+        if n_devices <= 0:
+            raise ValueError("n_devices must be positive")
+        if device_ids is not None and len(device_ids) != n_devices:
+            raise ValueError("device_ids must have one entry per device")
+
+        self.n_devices = n_devices
+        self.device_ids = list(device_ids) if device_ids is not None else [
+            f"fleet_sensor_{i:04d}" for i in range(n_devices)
+        ]
+        self.tick_interval = tick_interval
+        self.clock = clock or get_clock()
+        self.autostart = autostart  # False: the caller drives step() manually
+
+        # Per-device state (same defaults as PrecisionTemperatureSensor)
+        self.temperature = np.full(n_devices, float(ambient_temp))
+        self.is_heating = np.zeros(n_devices, dtype=bool)
+        self.running = np.zeros(n_devices, dtype=bool)
+        self.heating_power = np.ones(n_devices)
+        self.heating_rate = np.full(n_devices, 0.8)
+        self.heat_loss_coefficient = np.full(n_devices, 0.02)
+        self.ambient_temp = np.full(n_devices, float(ambient_temp))
+        self.max_temp = np.full(n_devices, 105.0)
+        self.target_temp = np.full(n_devices, 101.0)
+
+        self._rng = np.random.default_rng(seed)  # Same seed -> same fleet trace
+        self._lock = threading.Lock()
+        self._thread = None
+        self._active = False
+        self._views = [FleetSensorView(self, i) for i in range(n_devices)]
+
+        logger.info(f"Fleet simulator initialized with {n_devices} devices")
+
+    def __len__(self):
+        return self.n_devices
+
+    def __getitem__(self, index):
+        return self._views[index]
+
+    @property
+    def sensors(self):
+        """Per-device views compatible with PrecisionTemperatureSensor"""
+        return list(self._views)
+
+    def sensor(self, device_id):
+        """Returns the view for a device id"""
+        return self._views[self.device_ids.index(device_id)]
+
+    def step(self, dt):
+        """Advances every running device by dt seconds in one vectorized pass"""
+        if dt <= 0:
+            return
+        with self._lock:
+            temp = self.temperature
+            ambient = self.ambient_temp
+            heating = self.is_heating & self.running
+            cooling = ~self.is_heating & self.running
+
+            # Aquecimento: taxa diminui conforme se aproxima do máximo
+            temp_ratio = (temp - ambient) / (self.max_temp - ambient)
+            effective_rate = self.heating_rate * (1 - temp_ratio * 0.7)
+            noise = self._rng.uniform(-0.1, 0.1, self.n_devices)
+            heated = np.minimum(temp + (effective_rate + noise) * dt, self.max_temp)
+
+            # Resfriamento natural
+            cooled = np.maximum(temp - (temp - ambient) * self.heat_loss_coefficient * dt, ambient)
+
+            np.copyto(temp, heated, where=heating)
+            np.copyto(temp, cooled, where=cooling)
+
+    def start(self):
+        """Starts the shared simulation thread"""
+        if self._active:
+            return
+        self._active = True
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        logger.info("Fleet simulation thread started")
+
+    def stop(self):
+        """Stops the shared simulation thread"""
+        self._active = False
+        if self._thread and self._thread.is_alive():
+            self._thread.join(timeout=1)
+        self.running[:] = False
+        self.is_heating[:] = False
+        logger.info("Fleet simulation thread stopped")
+
+    def _run(self):
+        last_time = self.clock.time()
+        while self._active:
+            current_time = self.clock.time()
+            self.step(current_time - last_time)
+            last_time = current_time
+            self.clock.sleep(self.tick_interval)
+
+    def get_temperatures(self):
+        """Returns a rounded copy of all device temperatures"""
+        return np.round(self.temperature, 1)
+
+
+class FleetSensorView:
+    """Single-device view exposing the PrecisionTemperatureSensor API"""
+
+    def __init__(self, fleet, index):
+        self._fleet = fleet
+        self._index = index
+
+    @property
+    def device_id(self):
+        return self._fleet.device_ids[self._index]
+
+    @property
+    def temperature(self):
+        return float(self._fleet.temperature[self._index])
+
+    @temperature.setter
+    def temperature(self, value):
+        with self._fleet._lock:
+            self._fleet.temperature[self._index] = value
+
+    @property
+    def is_heating(self):
+        return bool(self._fleet.is_heating[self._index])
+
+    @property
+    def running(self):
+        return bool(self._fleet.running[self._index])
+
+    @property
+    def heating_power(self):
+        return float(self._fleet.heating_power[self._index])
+
+    @property
+    def heating_rate(self):
+        return float(self._fleet.heating_rate[self._index])
+
+    @property
+    def heat_loss_coefficient(self):
+        return float(self._fleet.heat_loss_coefficient[self._index])
+
+    @property
+    def ambient_temp(self):
+        return float(self._fleet.ambient_temp[self._index])
+
+    @property
+    def max_temp(self):
+        return float(self._fleet.max_temp[self._index])
+
+    @property
+    def target_temp(self):
+        return float(self._fleet.target_temp[self._index])
+
+    def start_heating(self):
+        """Inicia o aquecimento simulado"""
+        if not self.is_heating:
+            self._fleet.is_heating[self._index] = True
+            self._fleet.running[self._index] = True
+            if self._fleet.autostart:
+                self._fleet.start()
+
+    def stop_heating(self):
+        """Para o aquecimento (mas continua simulação de resfriamento)"""
+        self._fleet.is_heating[self._index] = False
+
+    def stop_simulation(self):
+        """Para completamente a simulação deste dispositivo"""
+        self._fleet.running[self._index] = False
+        self._fleet.is_heating[self._index] = False
+
+    def get_temperature(self):
+        """Retorna temperatura atual"""
+        return round(self.temperature, 1)
+
+    def get_data(self, pressure=None):
+        """Retorna dados completos do sensor"""
+        is_heating = self.is_heating
+        return {
+            'temperature': self.get_temperature(),
+            'is_heating': is_heating,
+            'heating_power': self.heating_power if is_heating else 0.0,
+            'timestamp': self._fleet.clock.time(),
+            'status': 'heating' if is_heating else 'cooling' if self.temperature > self.ambient_temp else 'stable'
+        }
+
+    def set_heating_power(self, power):
+        """Define potência de aquecimento (0.0 a 2.0)"""
+        power = max(0.0, min(2.0, power))
+        with self._fleet._lock:
+            self._fleet.heating_power[self._index] = power
+            self._fleet.heating_rate[self._index] = 0.8 * power
+
+    def reset_temperature(self, temp=20.0):
+        """Reseta temperatura para valor específico"""
+        self.temperature = temp
+        self.stop_heating()
+
+    def set_target_temperature(self, target_temp):
+        """Define temperatura alvo para o sensor"""
+        self._fleet.target_temp[self._index] = target_temp
+
+    def get_target_temperature(self):
+        """Retorna temperatura alvo atual"""
+        return self.target_temp
+
+    def start_system(self):
+        """Inicia o sistema de aquecimento"""
+        self.start_heating()
+
+    def set_heating(self, enable):
+        """Liga ou desliga o aquecimento"""
+        if enable:
+            self.start_heating()
+        else:
+            self.stop_heating()
+
+if __name__ == "__main__":
+    print("Testing FleetTemperatureSimulator...")
+    fleet = FleetTemperatureSimulator(500)
+    for sensor in fleet.sensors[::2]:
+        sensor.set_heating(True)
+
+    start = time.perf_counter()
+    for _ in range(1000):
+        fleet.step(0.1)
+    elapsed = time.perf_counter() - start
+
+    print(f"1000 ticks x {len(fleet)} devices in {elapsed * 1000:.1f} ms")
+    print(f"Sample data: {fleet[0].get_data()}")
+    fleet.stop()
+    print("All tests passed!")
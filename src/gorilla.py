@@ -0,0 +1,238 @@
+"""
+Gorilla-style block codec for sensor history
+Delta-of-delta timestamps and XOR-compressed floats in a self-describing binary block
+"""
+import json
+import struct
+import numpy as np
+
+BLOCK_MAGIC = b'GRL1'
+BLOCK_HEADER = struct.Struct('<4sIH')  # magic, record count, JSON descriptor length
+
+# Column encodings
+KIND_TIME_MS = 'time_ms'  # float epoch seconds, stored as integer ms with delta-of-delta
+KIND_XOR64 = 'xor64'      # float64 XOR against the previous value
+KIND_XOR32 = 'xor32'      # float32 XOR against the previous value
+KIND_INT = 'int'          # integers with delta-of-delta
+KIND_DECIMAL = 'decimal'  # floats with a declared precision, stored as scaled integers with delta-of-delta
+
+
+class _BitWriter:
+    def __init__(self):
+        self.buffer = bytearray()
+        self._acc = 0
+        self._bits = 0
+
+    def write(self, value, nbits):
+        acc = (self._acc << nbits) | value
+        bits = self._bits + nbits
+        while bits >= 8:
+            bits -= 8
+            self.buffer.append((acc >> bits) & 0xFF)
+        self._acc = acc & ((1 << bits) - 1)
+        self._bits = bits
+
+    def getvalue(self):
+        if self._bits:
+            return bytes(self.buffer) + bytes([(self._acc << (8 - self._bits)) & 0xFF])
+        return bytes(self.buffer)
+
+
+class _BitReader:
+    def __init__(self, data, offset=0):
+        self._data = data
+        self._pos = offset
+        self._acc = 0
+        self._bits = 0
+
+    def read(self, nbits):
+        acc, bits = self._acc, self._bits
+        while bits < nbits:
+            acc = (acc << 8) | self._data[self._pos]
+            self._pos += 1
+            bits += 8
+        bits -= nbits
+        self._acc = acc & ((1 << bits) - 1)
+        self._bits = bits
+        return acc >> bits
+
+# Delta-of-delta buckets: (prefix, prefix bits, value bits), as in the Gorilla paper
+_DOD_BUCKETS = ((0b10, 2, 7), (0b110, 3, 9), (0b1110, 4, 12))
+_DOD_FALLBACK = (0b1111, 4, 64)
+
+def _wrap64(value):
+    """Two's-complement wrap to int64, so deltas of extreme int64 values still round-trip"""
+    return ((value + (1 << 63)) & ((1 << 64) - 1)) - (1 << 63)
+
+def _write_dod(writer, values):
+    previous, previous_delta = 0, 0
+    for value in values:
+        delta = _wrap64(value - previous)
+        dod = _wrap64(delta - previous_delta)
+        previous, previous_delta = value, delta
+        if dod == 0:
+            writer.write(0, 1)
+            continue
+        for prefix, prefix_bits, value_bits in _DOD_BUCKETS:
+            limit = 1 << (value_bits - 1)
+            if -limit <= dod < limit:
+                break
+        else:
+            prefix, prefix_bits, value_bits = _DOD_FALLBACK
+        writer.write(prefix, prefix_bits)
+        writer.write(dod & ((1 << value_bits) - 1), value_bits)
+
+def _read_dod(reader, count):
+    values = []
+    previous, previous_delta = 0, 0
+    for _ in range(count):
+        if reader.read(1):
+            if not reader.read(1):
+                value_bits = 7
+            elif not reader.read(1):
+                value_bits = 9
+            elif not reader.read(1):
+                value_bits = 12
+            else:
+                value_bits = 64
+            dod = reader.read(value_bits)
+            if dod >= 1 << (value_bits - 1):
+                dod -= 1 << value_bits
+            previous_delta = _wrap64(previous_delta + dod)
+        previous = _wrap64(previous + previous_delta)
+        values.append(previous)
+    return values
+
+def _write_xor(writer, words, width):
+    """Gorilla XOR scheme over unsigned integer views of the floats"""
+    length_bits = width.bit_length() - 1  # 6 for 64-bit words, 5 for 32-bit
+    if not words:
+        return
+    previous = words[0]
+    writer.write(previous, width)
+    lead_prev, trail_prev = width + 1, 0  # No usable window yet
+    for word in words[1:]:
+        xor = word ^ previous
+        previous = word
+        if xor == 0:
+            writer.write(0, 1)
+            continue
+        lead = min(width - xor.bit_length(), 31)
+        trail = (xor & -xor).bit_length() - 1
+        if lead >= lead_prev and trail >= trail_prev:
+            # Meaningful bits fit in the previous window
+            writer.write(0b10, 2)
+            writer.write(xor >> trail_prev, width - lead_prev - trail_prev)
+        else:
+            meaningful = width - lead - trail
+            writer.write(0b11, 2)
+            writer.write(lead, 5)
+            writer.write(meaningful - 1, length_bits)
+            writer.write(xor >> trail, meaningful)
+            lead_prev, trail_prev = lead, trail
+
+def _read_xor(reader, count, width):
+    length_bits = width.bit_length() - 1
+    if count == 0:
+        return []
+    previous = reader.read(width)
+    words = [previous]
+    lead, meaningful = 0, width
+    for _ in range(count - 1):
+        if reader.read(1):
+            if reader.read(1):
+                lead = reader.read(5)
+                meaningful = reader.read(length_bits) + 1
+            previous ^= reader.read(meaningful) << (width - lead - meaningful)
+        words.append(previous)
+    return words
+
+def _column_kind(name, dtype):
+    if name == 'timestamp' or name == 'timestamps':
+        return KIND_TIME_MS
+    if dtype.kind == 'f':
+        return KIND_XOR64 if dtype.itemsize == 8 else KIND_XOR32
+    if dtype.kind in 'iub':
+        return KIND_INT
+    raise TypeError(f"Unsupported column dtype {dtype} for '{name}'")
+
+def _fits_decimal(column, decimals):
+    """Scaled values must be finite and exactly representable as integers"""
+    column = column.astype(np.float64)
+    return bool(np.all(np.isfinite(column))) and \
+        (len(column) == 0 or float(np.max(np.abs(column))) * 10.0 ** decimals < 2 ** 53)
+
+def encode_block(records, precision=None):
+    """
+    Encodes a NumPy structured array column by column. `precision` maps float
+    fields to decimal places: such columns are rounded and stored as scaled
+    integers with delta-of-delta, which beats XOR on noisy decimal readings.
+    Other float columns use XOR and are lossless. Timestamps are kept to the
+    millisecond. Returns the block as bytes.
+    """
+    precision = precision or {}
+    fields = []
+    writer = _BitWriter()
+    for name in records.dtype.names:
+        dtype = records.dtype.fields[name][0]
+        kind = _column_kind(name, dtype)
+        column = records[name]
+        if kind == KIND_TIME_MS:
+            _write_dod(writer, np.round(column.astype(np.float64) * 1000.0).astype(np.int64).tolist())
+        elif kind == KIND_INT:
+            _write_dod(writer, column.astype(np.int64).tolist())
+        elif name in precision and _fits_decimal(column, precision[name]):
+            kind = KIND_DECIMAL
+            scaled = np.round(column.astype(np.float64) * 10.0 ** precision[name]).astype(np.int64)
+            _write_dod(writer, scaled.tolist())
+            fields.append([name, dtype.str, kind, precision[name]])
+            continue
+        else:
+            view = np.uint64 if kind == KIND_XOR64 else np.uint32
+            _write_xor(writer, np.ascontiguousarray(column, dtype=dtype.newbyteorder('<')).view(view).tolist(),
+                       64 if kind == KIND_XOR64 else 32)
+        fields.append([name, dtype.str, kind])
+
+    descriptor = json.dumps({'fields': fields}, separators=(',', ':')).encode()
+    return BLOCK_HEADER.pack(BLOCK_MAGIC, len(records), len(descriptor)) + descriptor + writer.getvalue()
+
+def decode_block(data):
+    """Decodes a block produced by encode_block back into a structured array"""
+    magic, count, descriptor_length = BLOCK_HEADER.unpack_from(data, 0)
+    if magic != BLOCK_MAGIC:
+        raise ValueError("Not a Gorilla history block")
+    offset = BLOCK_HEADER.size
+    fields = json.loads(bytes(data[offset:offset + descriptor_length]))['fields']
+    reader = _BitReader(data, offset + descriptor_length)
+
+    records = np.empty(count, dtype=[(field[0], field[1]) for field in fields])
+    for name, dtype_str, kind, *params in fields:
+        if kind == KIND_DECIMAL:
+            records[name] = np.array(_read_dod(reader, count), dtype=np.int64) / 10.0 ** params[0]
+        elif kind == KIND_TIME_MS:
+            records[name] = np.array(_read_dod(reader, count), dtype=np.int64) / 1000.0
+        elif kind == KIND_INT:
+            records[name] = np.array(_read_dod(reader, count), dtype=np.int64).astype(dtype_str)
+        else:
+            width = 64 if kind == KIND_XOR64 else 32
+            words = np.array(_read_xor(reader, count, width), dtype=np.uint64 if width == 64 else np.uint32)
+            records[name] = words.view(np.float64 if width == 64 else np.float32)
+    return records
+
+def history_to_records(history, fields):
+    """{'timestamps': ..., field: ...} history arrays -> structured array for encode_block"""
+    dtype = [('timestamp', '<f8')] + [(name, '<f4') for name in fields]
+    records = np.empty(len(history['timestamps']), dtype=dtype)
+    records['timestamp'] = history['timestamps']
+    for name in fields:
+        records[name] = history[name]
+    return records
+
+if __name__ == "__main__":
+    records = np.zeros(10, dtype=[('timestamp', '<f8'), ('temperature', '<f4'), ('heating', 'u1')])
+    records['timestamp'] = 1_700_000_000 + np.arange(10) * 3.0
+    records['temperature'] = np.round(20 + np.arange(10) * 0.7, 1)
+    records['heating'] = [0, 0, 1, 1, 1, 1, 1, 0, 0, 0]
+    block = encode_block(records)
+    assert np.array_equal(decode_block(block), records)
+    print(f"{records.nbytes} bytes raw -> {len(block)} bytes encoded; round trip OK")
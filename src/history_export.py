@@ -0,0 +1,124 @@
+"""
+Streaming bulk export of sensor history
+Generators that turn chunks of history arrays into CSV, NDJSON or .npz byte streams
+"""
+import io
+import json
+import zipfile
+import numpy as np
+
+# (history key, exported column name, .npz dtype)
+READING_COLUMNS = (
+    ('timestamps', 'timestamp', '<f8'),
+    ('temperatures', 'temperature', '<f4'),
+    ('pressures', 'pressure', '<f4'),
+    ('boiling_points', 'boiling_point', '<f4'),
+    ('heating', 'heating', 'u1'),
+)
+ALARM_COLUMNS = ('timestamp', 'id', 'type', 'priority', 'message')
+ALARM_DTYPE = np.dtype([('timestamp', '<f8'), ('id', '<U64'), ('type', '<U32'),
+                        ('priority', '<U16'), ('message', '<U256')])
+
+EXPORT_FORMATS = {
+    'csv': ('text/csv', 'csv'),
+    'ndjson': ('application/x-ndjson', 'ndjson'),
+    'npz': ('application/octet-stream', 'npz'),
+}
+
+def reading_columns(has_heating):
+    return [column for column in READING_COLUMNS if has_heating or column[0] != 'heating']
+
+def _chunk_rows(chunk, columns, decimals=4):
+    """Row tuples of plain Python values for one chunk of history arrays"""
+    values = []
+    for key, _, dtype in columns:
+        array = np.asarray(chunk[key])
+        if key == 'timestamps':
+            values.append(array.astype(np.float64).tolist())
+        elif dtype == 'u1':
+            values.append(array.astype(np.int64).tolist())
+        else:
+            values.append(np.round(array.astype(np.float64), decimals).tolist())
+    return zip(*values)
+
+def _csv_field(value):
+    text = '' if value is None else str(value)
+    if any(c in text for c in ',"\n'):
+        text = '"' + text.replace('"', '""') + '"'
+    return text
+
+def csv_stream(chunks, columns):
+    """Readings as CSV, one yielded string per chunk"""
+    yield ','.join(name for _, name, _ in columns) + '\n'
+    for chunk in chunks:
+        lines = [','.join(map(str, row)) for row in _chunk_rows(chunk, columns)]
+        if lines:
+            yield '\n'.join(lines) + '\n'
+
+def alarms_csv_stream(alarms):
+    """Alarms as CSV"""
+    yield ','.join(ALARM_COLUMNS) + '\n'
+    for alarm in alarms:
+        yield ','.join(_csv_field(alarm.get(name)) for name in ALARM_COLUMNS) + '\n'
+
+def ndjson_stream(chunks, columns, alarms=()):
+    """Readings then alarms as newline-delimited JSON objects tagged with "record" """
+    names = [name for _, name, _ in columns]
+    for chunk in chunks:
+        lines = [json.dumps({'record': 'reading', **dict(zip(names, row))}) for row in _chunk_rows(chunk, columns)]
+        if lines:
+            yield '\n'.join(lines) + '\n'
+    for alarm in alarms:
+        yield json.dumps({'record': 'alarm', **alarm}, default=str) + '\n'
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only, non-seekable file object that collects bytes until drained"""
+
+    def __init__(self):
+        self._parts = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._parts.append(bytes(data))
+        return len(data)
+
+    def drain(self):
+        data = b''.join(self._parts)
+        self._parts = []
+        return data
+
+def npz_stream(count, chunks, columns, alarms=()):
+    """
+    .npz archive (readable with numpy.load) holding a structured `readings`
+    array and an `alarms` array. The zip and .npy headers need the record
+    count up front, so the caller passes it; data is then written chunk by
+    chunk and never held in memory as a whole.
+    """
+    dtype = np.dtype([(name, npz_dtype) for _, name, npz_dtype in columns])
+    sink = _ChunkSink()
+    with zipfile.ZipFile(sink, mode='w', compression=zipfile.ZIP_STORED) as archive:
+        with archive.open('readings.npy', mode='w', force_zip64=True) as member:
+            np.lib.format.write_array_header_1_0(member, {
+                'descr': np.lib.format.dtype_to_descr(dtype), 'fortran_order': False, 'shape': (count,)})
+            written = 0
+            for chunk in chunks:
+                size = min(len(chunk['timestamps']), count - written)
+                if size <= 0:
+                    break
+                records = np.empty(size, dtype=dtype)
+                for key, name, _ in columns:
+                    records[name] = chunk[key][:size]
+                member.write(records.tobytes())
+                written += size
+                yield sink.drain()
+            if written != count:
+                raise RuntimeError(f"History changed during export ({written} of {count} readings)")
+
+        alarm_records = np.array([tuple(alarm.get(name) or ('' if name != 'timestamp' else 0.0)
+                                        for name in ALARM_COLUMNS) for alarm in alarms], dtype=ALARM_DTYPE)
+        with archive.open('alarms.npy', mode='w') as member:
+            np.lib.format.write_array(member, alarm_records)
+    yield sink.drain()
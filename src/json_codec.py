@@ -0,0 +1,85 @@
+"""
+JSON encoding for API responses
+orjson when installed (standard library json otherwise), encoded-bytes caches keyed by state version, and fragment splicing
+"""
+import json
+import logging
+import threading
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+BACKEND = 'orjson' if orjson is not None else 'json'
+
+if orjson is not None:
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+    def dumps(value):
+        """value as compact UTF-8 JSON bytes; anything unknown is encoded as str()"""
+        return orjson.dumps(value, default=str, option=_ORJSON_OPTIONS)
+else:
+    _encoder = json.JSONEncoder(default=str, separators=(',', ':'), ensure_ascii=False)
+
+    def dumps(value):
+        """value as compact UTF-8 JSON bytes; anything unknown is encoded as str()"""
+        return _encoder.encode(value).encode()
+
+def json_object(fragments):
+    """
+    A JSON object spliced from already-encoded member values: fragments maps
+    keys to JSON bytes, which are copied as-is instead of being decoded and
+    encoded again.
+    """
+    members = [dumps(str(key)) + b':' + value for key, value in fragments.items()]
+    return b'{' + b','.join(members) + b'}'
+
+
+class EncodedCache:
+    """
+    Encoded bytes of a value that only changes when its version key changes.
+    encode(key) calls build() and encodes the result only for a key it has
+    not seen last; otherwise it returns the cached bytes. Keys are compared
+    with ==, so a key may hold the object the version belongs to (e.g.
+    (manager, manager.version)) to tell a replaced object's version 0 from
+    the old one's.
+
+    The key must be read before the state it versions: a body built from
+    newer state than its key is re-encoded on the next call, never served
+    in place of a newer version.
+    """
+
+    def __init__(self, build):
+        self.build = build
+        self.hits = 0
+        self.misses = 0
+        self._entry = None  # (key, bytes): replaced as a whole, so readers need no lock
+        self._lock = threading.Lock()
+
+    def encode(self, key):
+        entry = self._entry
+        if entry is not None and entry[0] == key:
+            self.hits += 1
+            return entry[1]
+        with self._lock:
+            # Concurrent misses for the same key encode once
+            entry = self._entry
+            if entry is not None and entry[0] == key:
+                self.hits += 1
+                return entry[1]
+            body = dumps(self.build())
+            self._entry = (key, body)
+            self.misses += 1
+            return body
+
+if __name__ == "__main__":
+    state = {'alarms': [], 'version': 0}
+    cache = EncodedCache(lambda: {'active_alarms_count': len(state['alarms']), 'active_alarms': state['alarms']})
+    print(BACKEND, cache.encode(state['version']), cache.encode(state['version']))
+    state['alarms'].append({'id': 'temperature_1', 'message': '🌡️ 95.0°C'})
+    state['version'] += 1
+    print(cache.encode(state['version']), f"hits={cache.hits} misses={cache.misses}")
+    print(json_object({'sensor_data': b'{"temperature":21.5}', 'alarms': cache.encode(state['version'])}))
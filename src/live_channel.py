@@ -0,0 +1,156 @@
+"""
+Live channel protocol for WebSocket dashboards
+Per-client device/field subscriptions with delta-encoded frames, plus control command dispatch
+"""
+import json
+import logging
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Decimal places sent per field: changes below the sensors' resolution are not changes
+FIELD_PRECISION = {'temperature': 1, 'target_temperature': 2, 'pressure': 4, 'boiling_point': 2}
+
+_MISSING = object()
+
+def reading_fields(snapshot):
+    """Flat channel fields of one SensorSnapshot"""
+    temp_data, pressure_data = snapshot.temp_data, snapshot.pressure_data
+    return {
+        'temperature': temp_data.get('temperature'),
+        'sensor_status': temp_data.get('sensor_status', 'active'),
+        'pressure': pressure_data.get('pressure'),
+        'pressure_unit': pressure_data.get('unit', 'atm'),
+        'boiling_point': snapshot.boiling_point,
+        'timestamp': snapshot.timestamp,
+    }
+
+def status_fields(status):
+    """Flat channel fields of a status payload (see web_app._status_payload); updated as soon as a control changes them"""
+    alarms = status.get('alarms') or {}
+    return {
+        'is_heating': status.get('heating', False),
+        'target_temperature': status.get('target_temperature'),
+        'data_collection': status.get('data_collection'),
+        'alarm_mode': alarms.get('alarm_mode'),
+        'alarm_active': alarms.get('is_active', False),
+        'active_alarms_count': alarms.get('active_alarms_count', 0),
+    }
+
+def _is_string_list(value):
+    return isinstance(value, list) and all(isinstance(item, str) for item in value)
+
+def _rounded(name, value):
+    places = FIELD_PRECISION.get(name)
+    if places is not None and isinstance(value, float):
+        return round(value, places)
+    return value
+
+
+class DeltaEncoder:
+    """Remembers what one client was last sent for one device; diff() returns only what changed"""
+
+    def __init__(self, fields=None):
+        self.fields = frozenset(fields) if fields else None  # None = every field
+        self._last = {}
+
+    def diff(self, values):
+        changed = {}
+        for name, value in values.items():
+            if self.fields is not None and name not in self.fields:
+                continue
+            value = _rounded(name, value)
+            if self._last.get(name, _MISSING) != value:
+                changed[name] = value
+        self._last.update(changed)
+        return changed
+
+
+class ChannelSession:
+    """
+    Protocol state of one client. Client messages are JSON objects:
+
+      {"type": "subscribe", "devices": [...], "fields": [...]}   (both optional: all)
+      {"type": "unsubscribe", "devices": [...]}
+      {"type": "control", "action": "heating", "payload": {"heating": true}, "device": "...", "id": 1}
+
+    Server frames: "subscribed", "delta" (changed fields only; the first frame
+    after subscribing carries every field), "alarm", "control_result" and
+    "error".
+
+    `devices` maps device ids to callables returning the device's current
+    flat fields; `control(action, payload, device)` runs a control command
+    (device None: the default device) and returns (status code, JSON body).
+    """
+
+    def __init__(self, devices, control):
+        self.devices = devices
+        self.control = control
+        self.encoders = {}  # device id -> DeltaEncoder
+        self.seq = 0
+
+    def handle(self, text):
+        """Frames to send in reply to one client message"""
+        try:
+            message = json.loads(text)
+            kind = message.get('type')
+        except (ValueError, AttributeError):
+            return [self._error('Messages must be JSON objects')]
+
+        if kind in ('subscribe', 'unsubscribe'):
+            # Checked before use: a malformed message gets an error frame, the session stays open
+            for key in ('devices', 'fields') if kind == 'subscribe' else ('devices',):
+                if message.get(key) is not None and not _is_string_list(message[key]):
+                    return [self._error(f"'{key}' must be a list of strings")]
+        if kind == 'subscribe':
+            devices = message.get('devices') or list(self.devices)
+            unknown = [device for device in devices if device not in self.devices]
+            if unknown:
+                return [self._error(f"Unknown devices: {', '.join(unknown)}")]
+            for device in devices:
+                self.encoders[device] = DeltaEncoder(message.get('fields'))
+            frames = [{'type': 'subscribed', 'devices': devices, 'fields': message.get('fields')}]
+            return frames + self.updates(devices)
+        if kind == 'unsubscribe':
+            for device in message.get('devices') or list(self.encoders):
+                self.encoders.pop(device, None)
+            return [{'type': 'subscribed', 'devices': list(self.encoders)}]
+        if kind == 'control':
+            device = message.get('device')
+            if device is not None and (not isinstance(device, str) or device not in self.devices):
+                return [self._error(f"Unknown devices: {device}")]
+            status, body = self.control(message.get('action'), message.get('payload') or {}, device)
+            return [{'type': 'control_result', 'id': message.get('id'), 'status': status, 'body': body}]
+        return [self._error(f"Unknown message type: {kind}")]
+
+    def updates(self, devices=None):
+        """Delta frames for subscribed devices whose fields changed since their last frame"""
+        frames = []
+        for device in devices or list(self.encoders):
+            encoder = self.encoders.get(device)
+            if encoder is None:
+                continue
+            changed = encoder.diff(self.devices[device]())
+            if changed:
+                self.seq += 1
+                frames.append({'type': 'delta', 'device': device, 'seq': self.seq, 'fields': changed})
+        return frames
+
+    def alarm(self, device, alarm):
+        if device not in self.encoders:
+            return []
+        return [{'type': 'alarm', 'device': device, 'alarm': alarm}]
+
+    @staticmethod
+    def _error(message):
+        return {'type': 'error', 'message': message}
+
+if __name__ == "__main__":
+    state = {'temperature': 20.04, 'boiling_point': 99.97, 'is_heating': True}
+    session = ChannelSession({'thermo_1': lambda: dict(state)}, lambda action, payload, device: (200, {'ok': True}))
+    print(session.handle('{"type": "subscribe"}'))
+    state['temperature'] = 20.03  # Below 0.1 °C resolution: nothing to send
+    print(session.updates())
+    state['temperature'] = 21.5
+    print(session.updates())
+    print(session.handle('{"type": "control", "action": "heating", "payload": {"heating": false}, "id": 7}'))
@@ -0,0 +1,68 @@
+"""
+Seeded noise source for sensor simulation
+Pre-generates random numbers in large NumPy blocks and hands them out one at a time
+"""
+import numpy as np
+
+class NoiseBuffer:
+    """
+    Drop-in replacement for the random.random / random.gauss / random.uniform
+    calls in the sensor simulators. Values come from a seeded NumPy Generator,
+    so the same seed always produces the same trace, and are drawn in blocks
+    to keep the per-read cost at a list index.
+    """
+
+    def __init__(self, seed=None, block_size=4096):
+        if block_size <= 0:
+            raise ValueError("block_size must be positive")
+        self.seed = seed
+        self.block_size = block_size
+
+        # Independent streams for gaussian noise and uniform rolls (failures, jitter)
+        normal_seq, uniform_seq = np.random.SeedSequence(seed).spawn(2)
+        self._normal_rng = np.random.default_rng(normal_seq)
+        self._uniform_rng = np.random.default_rng(uniform_seq)
+
+        self._normal_block = []
+        self._normal_index = 0
+        self._uniform_block = []
+        self._uniform_index = 0
+
+    def normal(self, mu=0.0, sigma=1.0):
+        """Equivalent to random.gauss(mu, sigma)"""
+        index = self._normal_index
+        block = self._normal_block
+        if index >= len(block):
+            block = self._normal_block = self._normal_rng.standard_normal(self.block_size).tolist()
+            index = 0
+        self._normal_index = index + 1
+        return mu + sigma * block[index]
+
+    def random(self):
+        """Equivalent to random.random()"""
+        index = self._uniform_index
+        block = self._uniform_block
+        if index >= len(block):
+            block = self._uniform_block = self._uniform_rng.random(self.block_size).tolist()
+            index = 0
+        self._uniform_index = index + 1
+        return block[index]
+
+    def uniform(self, low, high):
+        """Equivalent to random.uniform(low, high)"""
+        return low + (high - low) * self.random()
+
+if __name__ == "__main__":
+    import random
+    import timeit
+
+    noise = NoiseBuffer(seed=42)
+    n = 1_000_000
+    stdlib = timeit.timeit(lambda: random.gauss(0, 0.005), number=n)
+    buffered = timeit.timeit(lambda: noise.normal(0, 0.005), number=n)
+    print(f"random.gauss:       {stdlib / n * 1e9:.0f} ns/call")
+    print(f"NoiseBuffer.normal: {buffered / n * 1e9:.0f} ns/call")
+
+    a, b = NoiseBuffer(seed=7), NoiseBuffer(seed=7)
+    assert [a.normal() for _ in range(10000)] == [b.normal() for _ in range(10000)]
+    print("Same seed -> same trace")
@@ -2,24 +2,28 @@
 Pressure Sensor Simulation Module
 Simulates atmospheric pressure readings for different altitudes
 """
-import random
 import time
 import numpy as np
 from datetime import datetime
 import logging
 from .config import Config
+from .clock import get_clock
+from .noise import NoiseBuffer
+from . import barometric
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class PressureSensor:
-    def __init__(self, device_id="pressure_sensor_001"):
+    def __init__(self, device_id="pressure_sensor_001", clock=None, seed=None):
         self.device_id = device_id
+        self.clock = clock or get_clock()
+        self.noise = NoiseBuffer(seed)  # Seeded noise: same seed -> same trace
         self.current_pressure = 1.0  # Start at sea level (1 atm)
         self.altitude_meters = 0.0  # Sea level
         self.noise_level = 0.005  # pressure noise in atm
         self.is_active = True
-        self.last_reading_time = time.time()
+        self.last_reading_time = self.clock.time()
         
         # Failure simulation
         self.failure_probability = 0.0005  # 0.05% chance of failure per reading
@@ -34,19 +38,10 @@ class PressureSensor:
     def set_altitude(self, altitude_meters):
         """
         Set altitude and calculate corresponding atmospheric pressure
-        Using barometric formula: P = P0 * (1 - 0.0065*h/T0)^(g*M/R*0.0065)
-        Simplified version for educational purposes
+        Using the ISA barometric formula: P = P0 * (1 - 0.0065*h/T0)^(g*M/R*0.0065)
         """
         self.altitude_meters = altitude_meters
-        
-        # Simplified pressure calculation based on altitude
-        # Real formula would be more complex
-        if altitude_meters <= 0:
-            self.base_pressure = 1.0  # Sea level
-        else:
-            # Pressure decreases approximately 0.12 atm per 1000m
-            pressure_drop = altitude_meters * 0.00012
-            self.base_pressure = max(0.3, 1.0 - pressure_drop)
+        self.base_pressure = barometric.altitude_to_pressure(altitude_meters)
         
         logger.info(f"Altitude set to {altitude_meters}m, base pressure: {self.base_pressure:.3f} atm")
     
@@ -69,12 +64,12 @@ class PressureSensor:
         """
         Simulate natural pressure variations over time
         """
-        current_time = time.time()
+        current_time = self.clock.time()
         time_delta = current_time - self.last_reading_time
         self.last_reading_time = current_time
         
         # Small random variations (weather micro-changes)
-        random_variation = random.gauss(0, 0.001) * time_delta
+        random_variation = self.noise.normal(0, 0.001) * time_delta
         
         # Gradual trend changes
         trend_change = self.pressure_trend * 0.001 * time_delta
@@ -94,14 +89,14 @@ class PressureSensor:
             return None
         
         # Simulate sensor failure
-        if random.random() < self.failure_probability:
+        if self.noise.random() < self.failure_probability:
             self.is_failed = True
             logger.warning(f"Pressure sensor {self.device_id} failure simulated")
             return None
         
         if self.is_failed:
             # Random chance to recover from failure
-            if random.random() < 0.05:  # 5% chance to recover
+            if self.noise.random() < 0.05:  # 5% chance to recover
                 self.is_failed = False
                 logger.info(f"Pressure sensor {self.device_id} recovered from failure")
             else:
@@ -111,7 +106,7 @@ class PressureSensor:
         self.simulate_pressure_variations()
         
         # Add realistic noise
-        noise = random.gauss(0, self.noise_level)
+        noise = self.noise.normal(0, self.noise_level)
         measured_pressure = self.current_pressure + noise
         
         # Ensure pressure is within realistic bounds
@@ -127,18 +122,18 @@ class PressureSensor:
         pressure = self.get_pressure()
         
         # Calculate equivalent altitude based on current pressure
-        if pressure and pressure > 0.3:
-            estimated_altitude = (1.0 - pressure) / 0.00012
+        if pressure:
+            estimated_altitude = barometric.pressure_to_altitude(pressure)
         else:
             estimated_altitude = None
         
         return {
             'device_id': self.device_id,
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': datetime.fromtimestamp(self.clock.time()).isoformat(),
             'pressure': pressure,
             'pressure_unit': 'atm',
             'altitude_meters': self.altitude_meters,
-            'estimated_altitude': round(estimated_altitude, 1) if estimated_altitude else None,
+            'estimated_altitude': round(estimated_altitude, 1) if estimated_altitude is not None else None,
             'sensor_status': 'failed' if self.is_failed else 'active',
             'weather_trend': self.pressure_trend
         }
@@ -162,20 +157,22 @@ class PressureSensor:
         self.is_failed = False
         logger.info(f"Pressure sensor {self.device_id} reset to initial state")
 
-# Utility functions for pressure calculations
+# Utility functions for pressure calculations (ISA model)
 def altitude_to_pressure(altitude_meters):
     """Convert altitude to atmospheric pressure"""
-    if altitude_meters <= 0:
-        return 1.0
-    pressure_drop = altitude_meters * 0.00012
-    return max(0.3, 1.0 - pressure_drop)
+    return barometric.altitude_to_pressure(altitude_meters)
 
 def pressure_to_altitude(pressure_atm):
     """Convert atmospheric pressure to estimated altitude"""
-    if pressure_atm >= 1.0:
-        return 0.0
-    altitude = (1.0 - pressure_atm) / 0.00012
-    return max(0, altitude)
+    return max(0.0, barometric.pressure_to_altitude(pressure_atm))
+
+def altitudes_to_pressures(altitudes_meters):
+    """Array-in/array-out altitude_to_pressure"""
+    return barometric.altitudes_to_pressures(altitudes_meters)
+
+def pressures_to_altitudes(pressures_atm):
+    """Array-in/array-out pressure_to_altitude (history windows, fleets)"""
+    return np.maximum(barometric.pressures_to_altitudes(pressures_atm), 0.0)
 
 # Predefined altitude presets
 ALTITUDE_PRESETS = {
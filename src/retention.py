@@ -0,0 +1,144 @@
+"""
+Retention policies and background compaction for sensor history
+Drops data past its per-tier retention and merges small segments in a low-priority thread
+"""
+import os
+import re
+import time
+import threading
+import logging
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DEFAULT_RETENTION = 'raw=24h,1s=24h,1m=30d,1h=365d,alarms=365d'
+
+_DURATION_UNITS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400, 'w': 604800, 'y': 31536000}
+
+def parse_duration(text):
+    """'90', '15m', '24h', '30d', '1y' -> seconds; 'forever'/'inf' -> None"""
+    text = text.strip().lower()
+    if text in ('forever', 'inf', 'none', ''):
+        return None
+    match = re.fullmatch(r'(\d+(?:\.\d+)?)([smhdwy]?)', text)
+    if not match:
+        raise ValueError(f"Invalid duration: {text!r}")
+    return float(match.group(1)) * _DURATION_UNITS.get(match.group(2) or 's', 1)
+
+def parse_retention(spec):
+    """'raw=24h,1m=30d,alarms=1y' -> {'raw': 86400.0, '1m': 2592000.0, 'alarms': 31536000.0}"""
+    retention = {}
+    for item in filter(None, (part.strip() for part in spec.split(','))):
+        tier, _, duration = item.partition('=')
+        retention[tier.strip()] = parse_duration(duration)
+    return retention
+
+
+class HistoryCompactor:
+    """
+    Periodically enforces retention on every configured store: raw segments
+    and SQLite readings ('raw'), rollup tier segments (by tier label) and
+    SQLite alarms ('alarms'), then merges short segments. Each step takes
+    only the store's own short-lived locks, so the collector and API reads
+    keep running while it works. Cutoffs use the application clock, the
+    pacing uses real time.
+    """
+
+    def __init__(self, retention, clock, segment_store=None, rollups=None, database=None,
+                 interval=300.0):
+        self.retention = dict(retention)
+        self.clock = clock
+        self.segment_store = segment_store
+        self.rollups = rollups
+        self.database = database
+        self.interval = interval
+
+        self.last_run = None
+        self.last_duration = None
+        self.last_result = {}
+        self.runs = 0
+        self.last_error = None
+
+        self._stop = threading.Event()
+        self._thread = None
+
+    def run_once(self):
+        """One compaction pass; returns what was removed"""
+        started = time.perf_counter()
+        now = self.clock.time()
+        result = {}
+
+        def cutoff(tier):
+            duration = self.retention.get(tier)
+            return None if duration is None else now - duration
+
+        raw_cutoff = cutoff('raw')
+        if raw_cutoff is not None:
+            if self.segment_store is not None:
+                result['raw_records_dropped'] = self.segment_store.drop_before(raw_cutoff)
+            if self.database is not None:
+                result['db_readings_deleted'] = self.database.purge_before('readings', raw_cutoff)
+
+        if self.rollups is not None:
+            for tier in self.rollups.tiers:
+                tier_cutoff = cutoff(tier.label)
+                if tier_cutoff is not None and tier.store is not None:
+                    result[f'rollup_{tier.label}_dropped'] = tier.store.drop_before(tier_cutoff)
+
+        alarm_cutoff = cutoff('alarms')
+        if alarm_cutoff is not None and self.database is not None:
+            result['db_alarms_deleted'] = self.database.purge_before('alarms', alarm_cutoff)
+
+        merged = 0
+        for store in self._segment_stores():
+            merged += store.merge_segments()
+        result['segments_merged'] = merged
+
+        self.last_run = now
+        self.last_duration = time.perf_counter() - started
+        self.last_result = result
+        self.runs += 1
+        return result
+
+    def _segment_stores(self):
+        stores = [self.segment_store] if self.segment_store is not None else []
+        if self.rollups is not None:
+            stores.extend(tier.store for tier in self.rollups.tiers if tier.store is not None)
+        return stores
+
+    def _loop(self):
+        try:
+            # Linux schedules threads individually: lower this one's priority only
+            os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), 10)
+        except (AttributeError, OSError):
+            pass
+        while not self._stop.wait(self.interval):
+            try:
+                result = self.run_once()
+                if any(result.values()):
+                    logger.info(f"History compaction: {result}")
+            except Exception as e:
+                self.last_error = str(e)
+                logger.error(f"History compaction failed: {e}")
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name='history-compactor', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def status(self):
+        return {
+            'running': bool(self._thread and self._thread.is_alive()),
+            'interval_seconds': self.interval,
+            'retention_seconds': self.retention,
+            'runs': self.runs,
+            'last_run': self.last_run,
+            'last_duration_seconds': self.last_duration,
+            'last_result': self.last_result,
+            'last_error': self.last_error,
+        }
@@ -0,0 +1,123 @@
+"""
+Fixed-capacity time-series ring buffer for sensor history
+NumPy-backed storage with O(1) append and contiguous ordered windows
+"""
+import threading
+import numpy as np
+
+HISTORY_FIELDS = ('temperatures', 'pressures', 'boiling_points')
+
+class TimeSeriesRingBuffer:
+    """
+    Preallocated history of float64 epoch timestamps plus float32 values.
+
+    Every sample is written twice, at i and i + capacity, so the live window
+    is always one contiguous slice of the backing arrays. snapshot() and
+    range() copy that slice while holding the lock, so request handlers can
+    serialize the result while the collector keeps appending. `timestamps`
+    and view() are live zero-copy views: once the buffer is full, new appends
+    overwrite their oldest entries.
+    """
+
+    def __init__(self, capacity, fields=HISTORY_FIELDS):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.capacity = int(capacity)
+        self.fields = tuple(fields)
+        self._field_index = {name: i for i, name in enumerate(self.fields)}
+
+        self._timestamps = np.zeros(2 * self.capacity, dtype=np.float64)
+        self._values = np.zeros((len(self.fields), 2 * self.capacity), dtype=np.float32)
+        self._head = 0  # Next write position in [0, capacity)
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return self._size
+
+    def append(self, timestamp, **values):
+        """Appends one sample; fields not given are stored as NaN"""
+        row = [values.get(name, np.nan) for name in self.fields]
+        with self._lock:
+            head = self._head
+            mirror = head + self.capacity
+            self._timestamps[head] = timestamp
+            self._timestamps[mirror] = timestamp
+            self._values[:, head] = row
+            self._values[:, mirror] = row
+            self._head = head + 1 if head + 1 < self.capacity else 0
+            if self._size < self.capacity:
+                self._size += 1
+
+    def _window(self):
+        start = self._head - self._size
+        if start < 0:
+            start += self.capacity
+        return slice(start, start + self._size)
+
+    @property
+    def timestamps(self):
+        """Ordered (oldest first) zero-copy view of the timestamps"""
+        with self._lock:
+            return self._timestamps[self._window()]
+
+    def view(self, field):
+        """Ordered (oldest first) zero-copy view of one value field"""
+        index = self._field_index[field]
+        with self._lock:
+            return self._values[index, self._window()]
+
+    def __getitem__(self, key):
+        if key == 'timestamps':
+            return self.timestamps
+        return self.view(key)
+
+    def snapshot(self):
+        """Consistent ordered copy of the window: {'timestamps': ..., field: ...}"""
+        return self.range()
+
+    def range(self, start=None, end=None):
+        """
+        Like snapshot(), restricted to start <= timestamp <= end. Timestamps are
+        appended in order, so the bounds are found by binary search and only
+        the matching samples are copied (one copy of a contiguous slice).
+        """
+        with self._lock:
+            window = self._window()
+            timestamps = self._timestamps[window]
+            lo = 0 if start is None else int(np.searchsorted(timestamps, start, side='left'))
+            hi = len(timestamps) if end is None else int(np.searchsorted(timestamps, end, side='right'))
+            hi = max(lo, hi)
+            values = self._values[:, window][:, lo:hi].copy()
+            data = {'timestamps': timestamps[lo:hi].copy()}
+        for name, index in self._field_index.items():
+            data[name] = values[index]
+        return data
+
+    def bounds(self):
+        """(first, last) timestamp held, or (None, None) when empty"""
+        with self._lock:
+            if self._size == 0:
+                return None, None
+            window = self._window()
+            return float(self._timestamps[window.start]), float(self._timestamps[window.stop - 1])
+
+    def latest(self):
+        """Most recent sample as a dict, or None when empty"""
+        with self._lock:
+            if self._size == 0:
+                return None
+            last = self._head - 1 if self._head > 0 else self.capacity - 1
+            data = {'timestamp': float(self._timestamps[last])}
+            for name, index in self._field_index.items():
+                data[name] = float(self._values[index, last])
+            return data
+
+    def clear(self):
+        with self._lock:
+            self._head = 0
+            self._size = 0
+
+    @property
+    def nbytes(self):
+        return self._timestamps.nbytes + self._values.nbytes
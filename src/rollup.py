@@ -0,0 +1,165 @@
+"""
+Multi-resolution rollups for sensor history
+Incrementally maintained min/max/mean/count tiers (1 s / 1 min / 1 h by default)
+"""
+import math
+import threading
+import numpy as np
+try:
+    from .ring_buffer import TimeSeriesRingBuffer, HISTORY_FIELDS
+    from .segment_store import SegmentStore
+except ImportError:
+    from ring_buffer import TimeSeriesRingBuffer, HISTORY_FIELDS
+    from segment_store import SegmentStore
+
+# (label, bucket width in seconds, buckets kept in memory)
+DEFAULT_TIERS = (
+    ('1s', 1, 86400),     # 1 day
+    ('1m', 60, 10080),    # 1 week
+    ('1h', 3600, 8760),   # 1 year
+)
+
+ROLLUP_FIELDS = ('count',) + tuple(
+    f"{metric}{suffix}" for metric in HISTORY_FIELDS for suffix in ('', '_min', '_max')
+)
+
+# Persisted bucket: start timestamp, sample count, then mean/min/max per metric (48 bytes)
+ROLLUP_DTYPE = np.dtype(
+    [('timestamp', '<f8'), ('count', '<u4')] + [(name, '<f4') for name in ROLLUP_FIELDS[1:]]
+)
+
+
+class RollupTier:
+    """
+    One resolution. Samples are folded into the open bucket with a handful of
+    float operations; when a sample lands in a later bucket the open one is
+    closed and appended to the in-memory buffer (and to disk when a store is
+    attached). Buckets without samples are simply absent. A prebuilt buffer
+    with the same interface (e.g. a SharedHistoryBuffer) can be passed in.
+    """
+
+    def __init__(self, label, resolution, capacity, store=None, buffer=None):
+        self.label = label
+        self.resolution = resolution
+        self.buffer = buffer if buffer is not None else TimeSeriesRingBuffer(capacity, fields=ROLLUP_FIELDS)
+        self.store = store
+        self._lock = threading.Lock()
+        self._bucket = None  # Start timestamp of the open bucket
+        self._reset()
+
+    def _reset(self):
+        self._count = 0
+        self._sum = [0.0] * len(HISTORY_FIELDS)
+        self._min = [math.inf] * len(HISTORY_FIELDS)
+        self._max = [-math.inf] * len(HISTORY_FIELDS)
+
+    def add(self, timestamp, values):
+        """Folds one sample (values in HISTORY_FIELDS order) into its bucket"""
+        bucket = timestamp - timestamp % self.resolution
+        with self._lock:
+            if bucket != self._bucket:
+                if self._count:
+                    self._close()
+                self._bucket = bucket
+            self._count += 1
+            for i, value in enumerate(values):
+                self._sum[i] += value
+                if value < self._min[i]:
+                    self._min[i] = value
+                if value > self._max[i]:
+                    self._max[i] = value
+
+    def _row(self):
+        row = {'count': self._count}
+        for i, metric in enumerate(HISTORY_FIELDS):
+            row[metric] = self._sum[i] / self._count
+            row[f"{metric}_min"] = self._min[i]
+            row[f"{metric}_max"] = self._max[i]
+        return row
+
+    def _close(self):
+        row = self._row()
+        self.buffer.append(self._bucket, **row)
+        if self.store is not None:
+            self.store.append(self._bucket, *(row[name] for name in ROLLUP_FIELDS))
+        self._reset()
+
+    def flush(self):
+        """Closes the open bucket (e.g. on shutdown)"""
+        with self._lock:
+            if self._count:
+                self._close()
+            self._bucket = None
+
+    def window(self, start=None, end=None):
+        """Closed buckets in [start, end] plus the open (partial) bucket, as arrays"""
+        if self.store is not None:
+            records = self.store.range(start, end)
+            data = {'timestamps': records['timestamp']}
+            data.update({name: records[name] for name in ROLLUP_FIELDS})
+        else:
+            data = self.buffer.range(start, end)
+
+        with self._lock:
+            if not self._count or (end is not None and self._bucket > end) \
+                    or (start is not None and self._bucket < start):
+                return data
+            row = self._row()
+            bucket = self._bucket
+        data['timestamps'] = np.append(data['timestamps'], bucket)
+        for name in ROLLUP_FIELDS:
+            data[name] = np.append(data[name], np.float32(row[name]))
+        return data
+
+
+class HistoryRollups:
+    """
+    All rollup tiers, fed once per collected sample. buffer_factory(label,
+    capacity, fields) supplies each tier's in-memory buffer when given;
+    readonly opens the tier segment stores for reading only.
+    """
+
+    def __init__(self, tiers=DEFAULT_TIERS, directory=None, compression=None, buffer_factory=None,
+                 readonly=False):
+        self.tiers = []
+        for label, resolution, capacity in tiers:
+            store = None
+            if directory:
+                store = SegmentStore(directory, name=f"rollup-{label}", dtype=ROLLUP_DTYPE, compression=compression,
+                                     readonly=readonly)
+            buffer = buffer_factory(label, capacity, ROLLUP_FIELDS) if buffer_factory else None
+            self.tiers.append(RollupTier(label, resolution, capacity, store, buffer))
+
+    def add(self, timestamp, temperatures, pressures, boiling_points):
+        values = (temperatures, pressures, boiling_points)
+        for tier in self.tiers:
+            tier.add(timestamp, values)
+
+    def select(self, span, points, raw_interval):
+        """
+        Coarsest tier that still has at least `points` buckets over `span`
+        seconds (the caller trims the rest with LTTB), or None for raw samples.
+        Tiers finer than the raw sampling interval add nothing over raw data.
+        """
+        chosen = None
+        for tier in self.tiers:
+            if tier.resolution > raw_interval and span >= tier.resolution * points:
+                chosen = tier
+        return chosen
+
+    def flush(self):
+        for tier in self.tiers:
+            tier.flush()
+            if tier.store is not None:
+                tier.store.close()
+
+if __name__ == "__main__":
+    rollups = HistoryRollups()
+    for i in range(3 * 3600 // 3):
+        t = 1_700_000_000 + i * 3
+        rollups.add(t, 20.0 + (i % 100) * 0.5, 1.0, 100.0)
+    for tier in rollups.tiers:
+        data = tier.window()
+        print(f"{tier.label}: {len(data['timestamps'])} buckets, "
+              f"temp {data['temperatures_min'].min():.1f}..{data['temperatures_max'].max():.1f}")
+    print(f"1 week window at 500 points -> {rollups.select(7 * 86400, 500, 3).label}")
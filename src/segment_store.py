@@ -0,0 +1,377 @@
+"""
+Append-only on-disk time-series store for sensor readings
+Fixed-width binary records in rolling segment files, read back through numpy.memmap
+"""
+import os
+import re
+import struct
+import threading
+import logging
+import numpy as np
+from collections import OrderedDict
+try:
+    from .gorilla import encode_block, decode_block, BLOCK_HEADER
+except ImportError:
+    from gorilla import encode_block, decode_block, BLOCK_HEADER
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# One reading: 21 bytes, little-endian, no padding
+READING_DTYPE = np.dtype([
+    ('timestamp', '<f8'),
+    ('temperature', '<f4'),
+    ('pressure', '<f4'),
+    ('boiling_point', '<f4'),
+    ('heating', 'u1'),
+])
+
+_STRUCT_CODES = {'f8': 'd', 'f4': 'f', 'i8': 'q', 'u8': 'Q', 'i4': 'i', 'u4': 'I', 'u1': 'B', 'i1': 'b'}
+
+def _struct_for(dtype):
+    """struct.Struct matching a packed little-endian record dtype"""
+    codes = [_STRUCT_CODES[dtype.fields[name][0].str[1:]] for name in dtype.names]
+    record = struct.Struct('<' + ''.join(codes))
+    if record.size != dtype.itemsize:
+        raise ValueError("dtype must be packed (no alignment padding)")
+    return record
+
+
+class SegmentStore:
+    """
+    Rolling segment files named <name>-<first timestamp in ms>.seg. Records are
+    only ever appended, so a crash can at most leave a torn final record, which
+    is detected from the file size and truncated on open. Timestamps are
+    expected to be non-decreasing; range queries binary-search them.
+
+    With compression='gorilla', each segment is re-encoded as a Gorilla block
+    (<name>-<ms>.gor, see gorilla.py) once it is sealed. Compressed segments
+    are decoded on read, keeping the most recently used few in memory.
+
+    With readonly=True the store only serves reads, e.g. in a web worker
+    process while the collector process owns the files and appends to them.
+    """
+
+    def __init__(self, directory, name='readings', dtype=READING_DTYPE,
+                 segment_records=86400, fsync_interval=10, compression=None, precision=None,
+                 decoded_cache=4, readonly=False):
+        if compression not in (None, 'none', 'gorilla'):
+            raise ValueError(f"Unknown compression: {compression}")
+        self.directory = directory
+        self.name = name
+        self.dtype = np.dtype(dtype)
+        self.segment_records = segment_records
+        self.fsync_interval = fsync_interval  # Appends between fsyncs (0 = never)
+        self.compression = compression if compression != 'none' else None
+        self.precision = precision  # Decimal places per field for compression (see gorilla.encode_block)
+        self.decoded_cache = decoded_cache
+        self.readonly = readonly
+        self._record = _struct_for(self.dtype)
+        self._pattern = re.compile(rf'^{re.escape(name)}-(\d+)\.(seg|gor)$')
+
+        self._lock = threading.Lock()
+        self._file = None
+        self._active_path = None
+        self._active_records = 0
+        self._unsynced = 0
+        self._cache_lock = threading.Lock()
+        self._closed_maps = {}  # path -> ((inode, size), memmap) of a sealed segment
+        self._decoded = OrderedDict()  # path -> ((inode, size), decoded records) of a compressed segment (LRU)
+
+        os.makedirs(directory, exist_ok=True)
+        if not readonly:
+            self._recover()
+        logger.info(f"Segment store '{name}' opened at {directory} ({len(self)} records)")
+
+    # ------------------------------------------------------------------ files
+
+    def segments(self):
+        """Segment paths, oldest first"""
+        entries = []
+        for filename in os.listdir(self.directory):
+            match = self._pattern.match(filename)
+            if match:
+                entries.append((int(match.group(1)), os.path.join(self.directory, filename)))
+        return [path for _, path in sorted(entries)]
+
+    def _segment_start(self, path):
+        return int(self._pattern.match(os.path.basename(path)).group(1)) / 1000.0
+
+    def _recover(self):
+        """Truncates a torn last record left behind by a crash"""
+        segments = self.segments()
+        if not segments:
+            return
+        last = segments[-1]
+        if last.endswith('.gor'):
+            return  # Sealed and compressed: the next append starts a new segment
+        size = os.path.getsize(last)
+        torn = size % self.dtype.itemsize
+        if torn:
+            os.truncate(last, size - torn)
+            logger.warning(f"Truncated torn record ({torn} bytes) in {last}")
+        self._active_path = last
+        self._active_records = (size - torn) // self.dtype.itemsize
+
+    def _open_segment(self, timestamp):
+        if self._file:
+            self._seal()
+        path = os.path.join(self.directory, f"{self.name}-{int(timestamp * 1000):015d}.seg")
+        self._file = open(path, 'ab')
+        self._active_path = path
+        self._active_records = 0
+
+    def _seal(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+        self._file = None
+        if self.compression == 'gorilla':
+            self.compress_segment(self._active_path)
+            self._active_path = None  # Never append to a compressed segment
+
+    def compress_segment(self, path):
+        """Rewrites a sealed .seg file as a Gorilla block; returns the new path"""
+        records = np.fromfile(path, dtype=self.dtype)
+        target = path[:-len('.seg')] + '.gor'
+        temporary = target + '.tmp'
+        with open(temporary, 'wb') as f:
+            f.write(encode_block(records, self.precision))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporary, target)  # Atomic: readers see either file, never a partial block
+        os.remove(path)
+        self._forget(path)
+        logger.info(f"Compressed {os.path.basename(path)}: {records.nbytes} -> {os.path.getsize(target)} bytes")
+        return target
+
+    # ----------------------------------------------------------------- writes
+
+    def append(self, *values):
+        """Appends one record (values in dtype field order)"""
+        if self.readonly:
+            raise RuntimeError(f"Segment store '{self.name}' is read-only")
+        packed = self._record.pack(*values)
+        with self._lock:
+            if self._active_path is None or self._active_records >= self.segment_records:
+                self._open_segment(values[0])
+            elif self._file is None:
+                self._file = open(self._active_path, 'ab')
+            self._file.write(packed)
+            self._file.flush()
+            self._active_records += 1
+            self._unsynced += 1
+            if self.fsync_interval and self._unsynced >= self.fsync_interval:
+                os.fsync(self._file.fileno())
+                self._unsynced = 0
+
+    def append_reading(self, timestamp, temperature, pressure, boiling_point, heating):
+        self.append(timestamp, temperature, pressure, boiling_point, 1 if heating else 0)
+
+    def close(self):
+        with self._lock:
+            if self._file:
+                self._seal()
+
+    # ------------------------------------------------------------------ reads
+
+    def _map(self, path):
+        """
+        Read-only view of a segment: a memmap for .seg files, decoded records
+        for .gor files. Sealed segments are cached, keyed by inode and size so
+        a file replaced by the compactor, or still growing in another process,
+        is never served from a stale entry.
+        """
+        st = os.stat(path)
+        key = (st.st_ino, st.st_size)
+        compressed = path.endswith('.gor')
+        with self._cache_lock:
+            cache = self._decoded if compressed else self._closed_maps
+            cached = cache.get(path)
+            if cached is not None and cached[0] == key:
+                if compressed:
+                    cache.move_to_end(path)
+                return cached[1]
+
+        if compressed:
+            with open(path, 'rb') as f:
+                records = decode_block(f.read())
+            records.flags.writeable = False
+        else:
+            count = st.st_size // self.dtype.itemsize
+            if count == 0:
+                return np.empty(0, dtype=self.dtype)
+            records = np.memmap(path, dtype=self.dtype, mode='r', shape=(count,))
+            if path == self._active_path:
+                return records  # Still growing: map again on the next read
+
+        with self._cache_lock:
+            cache[path] = (key, records)
+            if compressed:
+                while len(cache) > self.decoded_cache:
+                    cache.popitem(last=False)
+        return records
+
+    def _forget(self, path):
+        with self._cache_lock:
+            self._closed_maps.pop(path, None)
+            self._decoded.pop(path, None)
+
+    def _count(self, path):
+        if path.endswith('.gor'):
+            with open(path, 'rb') as f:
+                return BLOCK_HEADER.unpack(f.read(BLOCK_HEADER.size))[1]
+        return os.path.getsize(path) // self.dtype.itemsize
+
+    def _range_parts(self, start=None, end=None):
+        """
+        Per-segment slices with start <= timestamp <= end, oldest first. Each
+        segment is clipped at the first timestamp of the next one, so while
+        the compactor replaces files a record is never returned twice; if a
+        listed file disappears meanwhile, the listing is simply retried.
+        """
+        for _ in range(100):
+            try:
+                return self._collect_parts(self.segments(), start, end)
+            except FileNotFoundError:
+                continue  # Each miss means a rename/delete completed, so this converges quickly
+        return self._collect_parts(self.segments(), start, end)
+
+    def _collect_parts(self, segments, start, end):
+        parts = []
+        following = None
+        for i, path in enumerate(segments):
+            if end is not None and self._segment_start(path) > end:
+                break
+            if start is not None and i + 1 < len(segments) and self._segment_start(segments[i + 1]) < start:
+                continue
+            mapped = following if following is not None else self._map(path)
+            following = self._map(segments[i + 1]) if i + 1 < len(segments) else None
+            if len(mapped) == 0:
+                continue
+            timestamps = mapped['timestamp']
+            lo = 0 if start is None else np.searchsorted(timestamps, start, side='left')
+            hi = len(mapped) if end is None else np.searchsorted(timestamps, end, side='right')
+            if following is not None and len(following):
+                hi = min(hi, np.searchsorted(timestamps, following['timestamp'][0], side='left'))
+            if hi > lo:
+                parts.append(mapped[lo:hi])
+        return parts
+
+    def range(self, start=None, end=None):
+        """
+        Records with start <= timestamp <= end, oldest first. A window inside
+        one uncompressed segment is returned as a zero-copy memmap slice.
+        """
+        parts = self._range_parts(start, end)
+        if not parts:
+            return np.empty(0, dtype=self.dtype)
+        if len(parts) == 1:
+            return parts[0]
+        return np.concatenate(parts)
+
+    def bounds(self):
+        """(first, last) timestamp stored, or (None, None) when empty; nothing is loaded"""
+        parts = self._range_parts()
+        if not parts:
+            return None, None
+        return float(parts[0]['timestamp'][0]), float(parts[-1]['timestamp'][-1])
+
+    def iter_range(self, start=None, end=None, chunk_size=8192):
+        """Same records as range(), as a generator of at most chunk_size records (no concatenation)"""
+        for part in self._range_parts(start, end):
+            for offset in range(0, len(part), chunk_size):
+                yield part[offset:offset + chunk_size]
+
+    def count_range(self, start=None, end=None):
+        return sum(len(part) for part in self._range_parts(start, end))
+
+    # ------------------------------------------------------------ maintenance
+
+    def _sealed_segments(self):
+        """Segments the writer will not touch again (everything but the active one)"""
+        with self._lock:
+            return [path for path in self.segments() if path != self._active_path]
+
+    def drop_before(self, cutoff):
+        """Deletes sealed segments whose records all precede cutoff; returns the records dropped"""
+        sealed = self._sealed_segments()
+        segments = self.segments()
+        dropped = 0
+        for path, following in zip(segments, segments[1:]):
+            if path not in sealed or self._segment_start(following) > cutoff:
+                break
+            dropped += self._count(path)
+            os.remove(path)
+            self._forget(path)
+        return dropped
+
+    def merge_segments(self):
+        """
+        Merges runs of consecutive sealed segments that together fit in one
+        segment (e.g. short segments left by restarts). The merged file is
+        written aside and renamed over the first segment of the run before the
+        others are removed; returns the number of files removed.
+        """
+        runs, run, run_records = [], [], 0
+        for path in self._sealed_segments():
+            count = self._count(path)
+            if run and run_records + count > self.segment_records:
+                runs.append(run)
+                run, run_records = [], 0
+            run.append(path)
+            run_records += count
+        runs.append(run)
+
+        removed = 0
+        for run in runs:
+            if len(run) < 2:
+                continue
+            records = np.concatenate([np.asarray(part) for part in self._collect_parts(run, None, None)])
+            base = os.path.splitext(run[0])[0]
+            target = base + ('.gor' if self.compression == 'gorilla' else '.seg')
+            temporary = target + '.tmp'
+            with open(temporary, 'wb') as f:
+                f.write(encode_block(records, self.precision) if self.compression == 'gorilla' else records.tobytes())
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temporary, target)
+            for path in run:
+                if path != target:
+                    os.remove(path)
+                    self._forget(path)
+                    removed += 1
+            self._forget(target)
+            logger.info(f"Merged {len(run)} segments into {os.path.basename(target)} ({len(records)} records)")
+        return removed
+
+    def stats(self):
+        segments = self.segments()
+        return {
+            'segments': len(segments),
+            'compressed_segments': sum(1 for path in segments if path.endswith('.gor')),
+            'records': sum(self._count(path) for path in segments),
+            'disk_bytes': sum(os.path.getsize(path) for path in segments),
+        }
+
+    def __len__(self):
+        return sum(self._count(path) for path in self.segments())
+
+    def disk_usage(self):
+        return sum(os.path.getsize(path) for path in self.segments())
+
+if __name__ == "__main__":
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = SegmentStore(directory, segment_records=1000)
+        for i in range(2500):
+            store.append_reading(1000.0 + i, 20.0 + i * 0.01, 1.0, 100.0, i % 2)
+        store.close()
+        print(f"{len(store)} records in {len(store.segments())} segments, {store.disk_usage()} bytes")
+
+        with open(store.segments()[-1], 'ab') as f:
+            f.write(b'\x00' * 7)  # Simulated crash mid-write
+        reopened = SegmentStore(directory, segment_records=1000)
+        window = reopened.range(1990.0, 2010.0)
+        print(f"After recovery: {len(reopened)} records, window of {len(window)} from {window['timestamp'][0]}")
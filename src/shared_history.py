@@ -0,0 +1,332 @@
+"""
+Shared-memory sensor history for multi-process serving
+Single-writer ring buffer in multiprocessing.shared_memory, read lock-free by other processes through a seqlock
+"""
+import json
+import time
+import atexit
+import struct
+import threading
+import logging
+from multiprocessing import shared_memory, resource_tracker
+import numpy as np
+try:
+    from .ring_buffer import HISTORY_FIELDS
+except ImportError:
+    from ring_buffer import HISTORY_FIELDS
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Layout: header (magic, capacity, JSON field list), control words, latest-reading
+# payload, then timestamps[2 * capacity] (float64) and values[fields][2 * capacity] (float32)
+MAGIC = b'SHB1'
+HEADER = struct.Struct('<4sQH')  # magic, capacity, field list length
+HEADER_BYTES = 1024
+SEQ, HEAD, SIZE, CLOSED, PAYLOAD_LEN = range(5)  # Control words (uint64)
+CONTROL_BYTES = 5 * 8
+PAYLOAD_BYTES = 16384
+DATA_OFFSET = HEADER_BYTES + CONTROL_BYTES + PAYLOAD_BYTES
+
+def _segment_size(capacity, field_count):
+    return DATA_OFFSET + 2 * capacity * 8 + field_count * 2 * capacity * 4
+
+def _open_untracked(name):
+    """
+    Attaches to an existing segment without registering it with this process's
+    resource tracker, which would otherwise unlink it when a reader exits.
+    """
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:  # Python < 3.13
+        shm = shared_memory.SharedMemory(name=name)
+        resource_tracker.unregister(shm._name, 'shared_memory')
+        return shm
+
+
+class SharedHistoryBuffer:
+    """
+    Same interface as TimeSeriesRingBuffer, stored in a named shared memory
+    segment. The creating process is the only writer; any number of processes
+    attach read-only by name and read it with no locks or IPC.
+
+    A sequence counter is made odd before every write and even again after
+    it. Readers note the counter, copy their window and retry if the counter
+    was odd or changed meanwhile, so a window never holds a half-written or
+    overwritten sample. As with TimeSeriesRingBuffer, snapshot() and range()
+    return copies; `timestamps` and view() are live zero-copy views that the
+    writer overwrites once it wraps around them.
+
+    The writer can also publish a small byte payload (the latest reading as
+    JSON) under the same counter. When the writer closes the segment and a
+    new one appears under the same name (collector restart), readers switch
+    to it on their next read.
+    """
+
+    def __init__(self, name, capacity=None, fields=HISTORY_FIELDS, create=False, attach_timeout=0.0):
+        self.name = name
+        self.writable = create
+        self._lock = threading.Lock()  # Serializes writers within the owning process
+        self._retired = []  # Old mappings that earlier views may still point into
+        self._shm = None
+        if create:
+            if not capacity or capacity <= 0:
+                raise ValueError("capacity must be positive")
+            self._create(int(capacity), tuple(fields))
+        else:
+            self._attach(attach_timeout)
+        atexit.register(self.close)
+
+    # --------------------------------------------------------------- mapping
+
+    def _create(self, capacity, fields):
+        encoded = json.dumps(list(fields)).encode()
+        if HEADER.size + len(encoded) > HEADER_BYTES:
+            raise ValueError("Too many history fields for the shared header")
+        size = _segment_size(capacity, len(fields))
+        try:
+            shm = shared_memory.SharedMemory(name=self.name, create=True, size=size)
+        except FileExistsError:
+            # Left behind by a writer that did not shut down cleanly
+            stale = shared_memory.SharedMemory(name=self.name)
+            stale.close()
+            stale.unlink()
+            logger.warning(f"Replaced stale shared history segment '{self.name}'")
+            shm = shared_memory.SharedMemory(name=self.name, create=True, size=size)
+        HEADER.pack_into(shm.buf, 0, MAGIC, capacity, len(encoded))
+        shm.buf[HEADER.size:HEADER.size + len(encoded)] = encoded
+        self._map(shm)
+        self._control[:] = 0
+        logger.info(f"Shared history '{self.name}' created ({capacity} samples, {size} bytes)")
+
+    def _attach(self, timeout):
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                shm = _open_untracked(self.name)
+                break
+            except FileNotFoundError:
+                if time.monotonic() >= deadline:
+                    raise
+                time.sleep(0.1)
+        self._map(shm)
+        logger.info(f"Attached to shared history '{self.name}' ({self.capacity} samples)")
+
+    def _map(self, shm):
+        magic, capacity, fields_length = HEADER.unpack_from(shm.buf, 0)
+        if magic != MAGIC:
+            shm.close()
+            raise ValueError(f"'{self.name}' is not a shared history segment")
+        fields = tuple(json.loads(bytes(shm.buf[HEADER.size:HEADER.size + fields_length])))
+
+        self._shm = shm
+        self.capacity = capacity
+        self.fields = fields
+        self._field_index = {name: i for i, name in enumerate(fields)}
+        self._control = np.ndarray(5, dtype='<u8', buffer=shm.buf, offset=HEADER_BYTES)
+        self._payload = shm.buf[HEADER_BYTES + CONTROL_BYTES:DATA_OFFSET]
+        self._timestamps = np.ndarray(2 * capacity, dtype='<f8', buffer=shm.buf, offset=DATA_OFFSET)
+        self._values = np.ndarray((len(fields), 2 * capacity), dtype='<f4', buffer=shm.buf,
+                                  offset=DATA_OFFSET + 2 * capacity * 8)
+        if not self.writable:
+            self._timestamps.flags.writeable = False
+            self._values.flags.writeable = False
+
+    def _reattach(self):
+        """Switches to a segment recreated under the same name, if there is one yet"""
+        try:
+            shm = _open_untracked(self.name)
+        except FileNotFoundError:
+            return
+        if shm.buf[:HEADER.size].tobytes()[:4] != MAGIC or \
+                np.ndarray(5, dtype='<u8', buffer=shm.buf, offset=HEADER_BYTES)[CLOSED]:
+            shm.close()
+            return
+        self._retired.append(self._shm)
+        self._payload.release()
+        self._map(shm)
+        logger.info(f"Reattached to recreated shared history '{self.name}'")
+
+    def close(self):
+        """Writer: marks the segment closed and unlinks it. Reader: detaches."""
+        if self._shm is None:
+            return
+        if self.writable:
+            self._control[CLOSED] = 1
+            try:
+                self._shm.unlink()
+            except FileNotFoundError:
+                pass
+        # Drop our own views first, or the mapping cannot be released
+        self._payload.release()
+        self._control = self._timestamps = self._values = None
+        for shm in self._retired + [self._shm]:
+            try:
+                shm.close()
+            except BufferError:
+                pass  # Views handed out earlier keep the mapping alive until they are freed
+        self._retired = []
+        self._shm = None
+
+    # ---------------------------------------------------------------- writes
+
+    def _check_writable(self):
+        if not self.writable:
+            raise RuntimeError(f"Shared history '{self.name}' is read-only in this process")
+
+    def append(self, timestamp, **values):
+        """Appends one sample; fields not given are stored as NaN"""
+        self._check_writable()
+        row = [values.get(name, np.nan) for name in self.fields]
+        control = self._control
+        with self._lock:
+            head = int(control[HEAD])
+            mirror = head + self.capacity
+            control[SEQ] += 1
+            self._timestamps[head] = timestamp
+            self._timestamps[mirror] = timestamp
+            self._values[:, head] = row
+            self._values[:, mirror] = row
+            control[HEAD] = head + 1 if head + 1 < self.capacity else 0
+            if control[SIZE] < self.capacity:
+                control[SIZE] += 1
+            control[SEQ] += 1
+
+    def publish_latest(self, payload):
+        """Publishes a small byte string (e.g. the latest reading as JSON) for readers"""
+        self._check_writable()
+        if len(payload) > PAYLOAD_BYTES:
+            raise ValueError(f"Payload of {len(payload)} bytes exceeds {PAYLOAD_BYTES}")
+        control = self._control
+        with self._lock:
+            control[SEQ] += 1
+            self._payload[:len(payload)] = payload
+            control[PAYLOAD_LEN] = len(payload)
+            control[SEQ] += 1
+
+    def clear(self):
+        self._check_writable()
+        with self._lock:
+            self._control[SEQ] += 1
+            self._control[HEAD] = 0
+            self._control[SIZE] = 0
+            self._control[PAYLOAD_LEN] = 0
+            self._control[SEQ] += 1
+
+    # ----------------------------------------------------------------- reads
+
+    def _read(self, func):
+        """Runs func(head, size) until no write overlapped it (seqlock read side)"""
+        if not self.writable and self._control[CLOSED]:
+            self._reattach()
+        control = self._control
+        deadline = None
+        while True:
+            seq = int(control[SEQ])
+            if not seq & 1:
+                result = func(int(control[HEAD]), int(control[SIZE]))
+                if int(control[SEQ]) == seq:
+                    return result
+            # A write is a handful of stores; only a writer that died mid-write can stall us
+            if deadline is None:
+                deadline = time.monotonic() + 1.0
+            elif time.monotonic() > deadline:
+                raise TimeoutError(f"Shared history '{self.name}' writer stalled mid-update")
+            time.sleep(0)
+
+    def _window(self, head, size):
+        start = head - size
+        if start < 0:
+            start += self.capacity
+        return slice(start, start + size)
+
+    def __len__(self):
+        return int(self._control[SIZE])
+
+    @property
+    def timestamps(self):
+        """Ordered (oldest first) zero-copy view of the timestamps"""
+        return self._read(lambda head, size: self._timestamps[self._window(head, size)])
+
+    def view(self, field):
+        """Ordered (oldest first) zero-copy view of one value field"""
+        index = self._field_index[field]
+        return self._read(lambda head, size: self._values[index, self._window(head, size)])
+
+    def __getitem__(self, key):
+        if key == 'timestamps':
+            return self.timestamps
+        return self.view(key)
+
+    def snapshot(self):
+        """Consistent ordered copy of the window: {'timestamps': ..., field: ...}"""
+        return self.range()
+
+    def range(self, start=None, end=None):
+        """
+        Like TimeSeriesRingBuffer.range(): a copy of the samples with
+        start <= timestamp <= end. The copy is taken inside the seqlock read
+        section, so a write that overlaps it makes the read retry.
+        """
+        def read(head, size):
+            window = self._window(head, size)
+            timestamps = self._timestamps[window]
+            lo = 0 if start is None else int(np.searchsorted(timestamps, start, side='left'))
+            hi = len(timestamps) if end is None else int(np.searchsorted(timestamps, end, side='right'))
+            hi = max(lo, hi)
+            return timestamps[lo:hi].copy(), self._values[:, window][:, lo:hi].copy()
+        timestamps, values = self._read(read)
+        data = {'timestamps': timestamps}
+        for name, index in self._field_index.items():
+            data[name] = values[index]
+        return data
+
+    def bounds(self):
+        """(first, last) timestamp held, or (None, None) when empty"""
+        def read(head, size):
+            if size == 0:
+                return None, None
+            window = self._window(head, size)
+            return float(self._timestamps[window.start]), float(self._timestamps[window.stop - 1])
+        return self._read(read)
+
+    def latest(self):
+        """Most recent sample as a dict, or None when empty"""
+        def read(head, size):
+            if size == 0:
+                return None
+            last = head - 1 if head > 0 else self.capacity - 1
+            data = {'timestamp': float(self._timestamps[last])}
+            for name, index in self._field_index.items():
+                data[name] = float(self._values[index, last])
+            return data
+        return self._read(read)
+
+    def latest_payload(self):
+        """Bytes last passed to publish_latest(), or None"""
+        def read(head, size):
+            length = int(self._control[PAYLOAD_LEN])
+            return bytes(self._payload[:length]) if length else None
+        return self._read(read)
+
+    @property
+    def nbytes(self):
+        return self._timestamps.nbytes + self._values.nbytes
+
+if __name__ == "__main__":
+    import os
+    import subprocess
+    import sys
+
+    name = f"shb_selftest_{os.getpid()}"
+    history = SharedHistoryBuffer(name, capacity=1000, create=True)
+    for i in range(1500):
+        history.append(1_700_000_000 + i * 3.0, temperatures=20.0 + i * 0.01, pressures=1.0, boiling_points=100.0)
+    history.publish_latest(b'{"temperature": 35.0}')
+    # Attach from a separate process, as a web worker would
+    reader = (f"import sys; sys.path.insert(0, {os.path.dirname(os.path.abspath(__file__))!r}); "
+              f"from shared_history import SharedHistoryBuffer; "
+              f"h = SharedHistoryBuffer({name!r}); r = h.range(); "
+              f"print(len(r['timestamps']), r['temperatures'][-1], h.latest_payload().decode())")
+    print(subprocess.run([sys.executable, '-c', reader], capture_output=True, text=True).stdout.strip())
+    history.close()
@@ -2,17 +2,23 @@
 Sensor de Temperatura de Precisão - Smart Food Thermometer
 Sistema de simulação realista de aquecimento até o ponto de ebulição
 """
-import time
 import math
-import random
 import threading
 import logging
+try:
+    from .clock import get_clock
+    from .noise import NoiseBuffer
+except ImportError:
+    from clock import get_clock
+    from noise import NoiseBuffer
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class PrecisionTemperatureSensor:
-    def __init__(self):
+    def __init__(self, clock=None, seed=None):
+        self.clock = clock or get_clock()
+        self.noise = NoiseBuffer(seed)  # Ruído com semente: mesma semente -> mesma curva
         self.temperature = 20.0  # Temperatura inicial (ambiente aproximadamente a temperatura média de santa rita do sapucaí)
         self.is_heating = False
         self.heating_power = 1.0  # Potência de aquecimento
@@ -57,10 +63,10 @@ class PrecisionTemperatureSensor:
     
     def _simulate_heating(self):
         """Simula aquecimento/resfriamento realista"""
-        last_time = time.time()
+        last_time = self.clock.time()
         
         while self.running:
-            current_time = time.time()
+            current_time = self.clock.time()
             dt = current_time - last_time
             last_time = current_time
             
@@ -71,7 +77,7 @@ class PrecisionTemperatureSensor:
                     effective_heating_rate = self.heating_rate * (1 - temp_ratio * 0.7)
                     
                     # Adicionar variação realista
-                    noise = random.uniform(-0.1, 0.1)
+                    noise = self.noise.uniform(-0.1, 0.1)
                     temp_increase = (effective_heating_rate + noise) * dt
                     
                     self.temperature += temp_increase
@@ -88,7 +94,7 @@ class PrecisionTemperatureSensor:
                     # Limitar temperatura mínima
                     if self.temperature < self.ambient_temp:
                         self.temperature = self.ambient_temp            
-            time.sleep(0.1)  # Atualização a cada 100ms
+            self.clock.sleep(0.1)  # Atualização a cada 100ms
     
     def get_temperature(self):
         """Retorna temperatura atual"""
@@ -100,7 +106,7 @@ class PrecisionTemperatureSensor:
             'temperature': self.get_temperature(),
             'is_heating': self.is_heating,
             'heating_power': self.heating_power if self.is_heating else 0.0,
-            'timestamp': time.time(),
+            'timestamp': self.clock.time(),
             'status': 'heating' if self.is_heating else 'cooling' if self.temperature > self.ambient_temp else 'stable'
         }
     
@@ -138,6 +144,96 @@ class PrecisionTemperatureSensor:
             self.stop_heating()
         logger.info(f"Aquecimento {'ligado' if enable else 'desligado'}")
 
+class AnalyticTemperatureSensor(PrecisionTemperatureSensor):
+    """
+    Motor alternativo sem thread de simulação.
+    Guarda apenas a última transição de estado (aquecimento ligado/desligado,
+    mudança de potência, reset) e calcula a temperatura em forma fechada no
+    momento da leitura, então sensores ociosos não consomem CPU.
+
+    O modelo é o mesmo de _simulate_heating sem o ruído por tick:
+    aquecendo, dT/dt = r - k(T - Ta) com k = 0.7r / (Tmax - Ta), limitado a Tmax;
+    resfriando, dT/dt = -c(T - Ta), limitado a Ta.
+    """
+
+    def __init__(self, clock=None, seed=None):
+        self._base_temp = 20.0
+        self._base_time = 0.0
+        super().__init__(clock, seed)
+
+    @property
+    def temperature(self):
+        return self._temperature_at(self.clock.time())
+
+    @temperature.setter
+    def temperature(self, value):
+        self._base_temp = value
+        self._base_time = self.clock.time()
+
+    def _temperature_at(self, now):
+        """Temperatura em forma fechada a partir da última transição"""
+        dt = now - self._base_time
+        base_temp = self._base_temp
+        if not self.running or dt <= 0:
+            return base_temp
+
+        ambient = self.ambient_temp
+        if self.is_heating:
+            span = self.max_temp - ambient
+            k = 0.7 * self.heating_rate / span
+            if k <= 0:
+                return base_temp
+            equilibrium = ambient + span / 0.7
+            temp = equilibrium + (base_temp - equilibrium) * math.exp(-k * dt)
+            return min(temp, self.max_temp)
+
+        if base_temp <= ambient:
+            return ambient
+        return ambient + (base_temp - ambient) * math.exp(-self.heat_loss_coefficient * dt)
+
+    def _rebase(self):
+        """Registra o estado atual como nova transição"""
+        self.temperature = self.temperature
+
+    def start_heating(self):
+        """Inicia o aquecimento (sem thread)"""
+        if not self.is_heating:
+            self._rebase()
+            self.is_heating = True
+            self.running = True
+            logger.info("🔥 Aquecimento iniciado")
+
+    def stop_heating(self):
+        """Para o aquecimento (resfriamento calculado na leitura)"""
+        if self.is_heating:
+            self._rebase()
+            self.is_heating = False
+            logger.info("🧊 Aquecimento parado - iniciando resfriamento")
+
+    def stop_simulation(self):
+        """Congela a temperatura atual"""
+        self._rebase()
+        self.running = False
+        self.is_heating = False
+        logger.info("Simulação de temperatura parada")
+
+    def set_heating_power(self, power):
+        """Define potência de aquecimento (0.0 a 2.0)"""
+        self._rebase()
+        super().set_heating_power(power)
+
+
+TEMPERATURE_ENGINES = {
+    'thread': PrecisionTemperatureSensor,
+    'analytic': AnalyticTemperatureSensor,
+}
+
+def create_temperature_sensor(engine='thread', clock=None, seed=None):
+    """Cria o sensor de temperatura com o motor de simulação escolhido"""
+    if engine not in TEMPERATURE_ENGINES:
+        raise ValueError(f"Motor inválido: {engine}. Motores válidos: {list(TEMPERATURE_ENGINES)}")
+    return TEMPERATURE_ENGINES[engine](clock, seed)
+
 if __name__ == "__main__":
     print("Testing PrecisionTemperatureSensor...")
     sensor = PrecisionTemperatureSensor()
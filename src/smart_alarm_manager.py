@@ -2,20 +2,25 @@
 Smart Alarm Management System - VERSÃO FINAL LIMPA
 Sistema de alarmes inteligente para o Smart Food Thermometer
 """
-import time
 import threading
 import logging
+try:
+    from .clock import get_clock
+except ImportError:
+    from clock import get_clock
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class SmartAlarmManager:
-    def __init__(self, mqtt_client=None, sound_enabled=True):
+    def __init__(self, mqtt_client=None, sound_enabled=True, clock=None):
         self.mqtt_client = mqtt_client
+        self.clock = clock or get_clock()
         self.sound_enabled = sound_enabled
         self.active_alarms = {}
         self.alarm_history = []
         self.is_monitoring = False
+        self.version = 0  # Incrementado a cada mudança visível em get_status() (ETags da API)
         
         # Sistema de cooldown para evitar spam de alarmes
         self.last_alarm_time = {}
@@ -54,6 +59,7 @@ class SmartAlarmManager:
             raise ValueError(f"Modo inválido: {mode}. Modos válidos: {valid_modes}")
           # Configurar novo modo
         self.current_alarm_config['mode'] = mode
+        self.version += 1
         
         if mode == 'temperature_only':
             threshold = kwargs.get('threshold', 95.0)
@@ -88,13 +94,14 @@ class SmartAlarmManager:
             }
         
         self.current_alarm_config['is_active'] = True
+        self.version += 1
         logger.info(f"Alarme configurado: {mode} com parâmetros {kwargs}")
         return True
     
     def _can_trigger_alarm(self, alarm_type):
         """Verifica se pode disparar alarme baseado no cooldown"""
-        current_time = time.time()
-        last_time = self.last_alarm_time.get(alarm_type, 0)
+        current_time = self.clock.time()
+        last_time = self.last_alarm_time.get(alarm_type, float('-inf'))
         
         if current_time - last_time >= self.alarm_cooldown:
             self.last_alarm_time[alarm_type] = current_time
@@ -135,9 +142,9 @@ class SmartAlarmManager:
             elif mode == 'time_only':
                 duration = self.current_alarm_config.get('time_duration', 300)
                 if not hasattr(self, '_time_start'):
-                    self._time_start = time.time()
+                    self._time_start = self.clock.time()
                 
-                elapsed = time.time() - self._time_start
+                elapsed = self.clock.time() - self._time_start
                 if elapsed >= duration and self._can_trigger_alarm('time'):
                     alarm = self._create_alarm('TIME',
                         f"⏰ Tempo de cozimento concluído! ({elapsed:.0f}s / {duration}s)",
@@ -153,8 +160,9 @@ class SmartAlarmManager:
                     if not self.boiling_state['has_boiled']:
                         if current_temp >= boiling_threshold:
                             self.boiling_state['has_boiled'] = True
-                            self.boiling_state['time_started'] = time.time()
+                            self.boiling_state['time_started'] = self.clock.time()
                             self.boiling_state['waiting_for_boiling'] = False
+                            self.version += 1
                             
                             if self._can_trigger_alarm('boiling_start'):
                                 alarm = self._create_alarm('BOILING_START',
@@ -163,9 +171,9 @@ class SmartAlarmManager:
                                 triggered_alarms.append(alarm)
                     
                     # Fase 2: Contar tempo após fervura
-                    elif self.boiling_state['has_boiled'] and self.boiling_state['time_started']:
+                    elif self.boiling_state['has_boiled'] and self.boiling_state['time_started'] is not None:
                         duration = self.current_alarm_config.get('time_duration', 300)
-                        elapsed = time.time() - self.boiling_state['time_started']
+                        elapsed = self.clock.time() - self.boiling_state['time_started']
                         
                         if elapsed >= duration and self._can_trigger_alarm('time_complete'):
                             alarm = self._create_alarm('TIME_COMPLETE',
@@ -180,7 +188,7 @@ class SmartAlarmManager:
     
     def _create_alarm(self, alarm_type, message, data):
         """Cria um novo alarme"""
-        timestamp_ms = int(time.time() * 1000)
+        timestamp_ms = int(self.clock.time() * 1000)
         alarm_id = f"{alarm_type.lower()}_{timestamp_ms}"
         
         alarm = {
@@ -188,7 +196,7 @@ class SmartAlarmManager:
             'type': alarm_type,
             'message': message,
             'priority': 'CRITICAL' if alarm_type == 'BOILING' else 'HIGH',
-            'timestamp': time.time(),
+            'timestamp': self.clock.time(),
             **data
         }
         
@@ -200,6 +208,8 @@ class SmartAlarmManager:
         if len(self.active_alarms) > 50:
             oldest_key = min(self.active_alarms.keys())
             del self.active_alarms[oldest_key]
+        # Só depois de limitar: uma versão corresponde a um único estado
+        self.version += 1
             
         # Publicar via MQTT se disponível
         if self.mqtt_client:
@@ -274,6 +284,7 @@ class SmartAlarmManager:
             'time_started': None,
             'waiting_for_boiling': False
         }
+        self.version += 1
         
         logger.info(f"Cleared {cleared_count} active alarms - system deactivated")
     
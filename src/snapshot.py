@@ -0,0 +1,64 @@
+"""
+Latest-reading snapshot published by the data collector
+Immutable, pre-serialized result of one collector tick, swapped in atomically for request handlers
+"""
+from types import MappingProxyType
+try:
+    from .json_codec import dumps
+except ImportError:
+    from json_codec import dumps
+
+
+class SensorSnapshot:
+    """
+    One collector tick: the temperature and pressure readings exactly as the
+    alarm manager and MQTT saw them, the boiling point, and the response body
+    of /api/sensor_data serialized once. Instances are never modified; the
+    collector publishes a new one by rebinding a single reference, so readers
+    need no lock and always see a complete tick.
+    """
+
+    __slots__ = ('seq', 'timestamp', 'temp_data', 'pressure_data', 'boiling_point', 'body')
+
+    def __init__(self, seq, timestamp, temp_data, pressure_data, boiling_point, payload):
+        values = {
+            'seq': seq,
+            'timestamp': timestamp,
+            'temp_data': MappingProxyType(dict(temp_data or {})),
+            'pressure_data': MappingProxyType(dict(pressure_data or {})),
+            'boiling_point': boiling_point,
+            'body': dumps(payload),
+        }
+        for name, value in values.items():
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("SensorSnapshot is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("SensorSnapshot is immutable")
+
+    @property
+    def temperature(self):
+        return self.temp_data.get('temperature')
+
+    @property
+    def pressure(self):
+        return self.pressure_data.get('pressure')
+
+    def readings(self):
+        """Current readings summary used by the debug endpoints"""
+        return {
+            'temperature': self.temperature,
+            'pressure': self.pressure,
+            'boiling_point': self.boiling_point,
+        }
+
+if __name__ == "__main__":
+    snapshot = SensorSnapshot(1, 1_700_000_000.0, {'temperature': 42.5}, {'pressure': 0.98}, 99.4,
+                              {'temperature': {'temperature': 42.5}, 'boiling_point': 99.4})
+    print(snapshot.readings(), snapshot.body)
+    try:
+        snapshot.boiling_point = 100.0
+    except AttributeError as e:
+        print(f"Immutable: {e}")
@@ -0,0 +1,370 @@
+"""
+SQLite persistence backend for readings and alarms
+WAL-mode database with batched inserts and a (device_id, ts) index, standard library only
+"""
+import os
+import json
+import time
+import queue
+import sqlite3
+import threading
+import logging
+from contextlib import contextmanager
+import numpy as np
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS readings (
+    device_id TEXT NOT NULL,
+    ts REAL NOT NULL,
+    temperature REAL,
+    pressure REAL,
+    boiling_point REAL,
+    heating INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_readings_device_ts ON readings (device_id, ts);
+
+CREATE TABLE IF NOT EXISTS alarms (
+    device_id TEXT NOT NULL,
+    ts REAL NOT NULL,
+    alarm_id TEXT NOT NULL,
+    type TEXT NOT NULL,
+    priority TEXT,
+    message TEXT,
+    data TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_alarms_device_ts ON alarms (device_id, ts);
+"""
+
+# Fixed SQL text, so sqlite3's statement cache reuses the prepared statements
+INSERT_READING = "INSERT INTO readings (device_id, ts, temperature, pressure, boiling_point, heating) VALUES (?, ?, ?, ?, ?, ?)"
+INSERT_ALARM = "INSERT INTO alarms (device_id, ts, alarm_id, type, priority, message, data) VALUES (?, ?, ?, ?, ?, ?, ?)"
+SELECT_READINGS = """
+SELECT ts, temperature, pressure, boiling_point, heating FROM readings
+WHERE device_id = ? AND ts >= ? AND ts <= ? ORDER BY ts LIMIT ?
+"""
+SELECT_LATEST_READINGS = """
+SELECT ts, temperature, pressure, boiling_point, heating FROM readings
+WHERE device_id = ? AND ts >= ? AND ts <= ? ORDER BY ts DESC LIMIT ?
+"""
+SELECT_BOUNDS = "SELECT MIN(ts), MAX(ts) FROM readings WHERE device_id = ?"
+SELECT_READINGS_AFTER = """
+SELECT ts, temperature, pressure, boiling_point, heating, rowid FROM readings
+WHERE device_id = ? AND (ts, rowid) > (?, ?) AND ts <= ? ORDER BY ts, rowid LIMIT ?
+"""
+COUNT_READINGS = "SELECT COUNT(*) FROM readings WHERE device_id = ? AND ts >= ? AND ts <= ?"
+SELECT_ALARMS_AFTER = """
+SELECT ts, alarm_id, type, priority, message, data, rowid FROM alarms
+WHERE device_id = ? AND (ts, rowid) > (?, ?) AND ts <= ? ORDER BY ts, rowid LIMIT ?
+"""
+SELECT_AGGREGATE = """
+SELECT CAST(ts / ? AS INTEGER) * ? AS bucket, COUNT(*),
+       AVG(temperature), MIN(temperature), MAX(temperature),
+       AVG(pressure), MIN(pressure), MAX(pressure),
+       AVG(boiling_point), MIN(boiling_point), MAX(boiling_point)
+FROM readings
+WHERE device_id = ? AND ts >= ? AND ts <= ?
+GROUP BY bucket ORDER BY bucket
+"""
+SELECT_ALARMS = """
+SELECT ts, alarm_id, type, priority, message, data FROM alarms
+WHERE device_id = ? AND ts >= ? AND ts <= ? ORDER BY ts DESC LIMIT ?
+"""
+SELECT_DEVICES = "SELECT DISTINCT device_id FROM readings ORDER BY device_id"
+# Rows are inserted in time order, so the oldest ones sit at the start of the rowid scan
+PURGE_BEFORE = {
+    'readings': "DELETE FROM readings WHERE rowid IN (SELECT rowid FROM readings WHERE ts < ? LIMIT ?)",
+    'alarms': "DELETE FROM alarms WHERE rowid IN (SELECT rowid FROM alarms WHERE ts < ? LIMIT ?)",
+}
+
+READER_POOL_SIZE = 4  # Read connections shared by all request threads
+
+_AGGREGATE_COLUMNS = ('count',
+                      'temperatures', 'temperatures_min', 'temperatures_max',
+                      'pressures', 'pressures_min', 'pressures_max',
+                      'boiling_points', 'boiling_points_min', 'boiling_points_max')
+
+
+class SQLiteHistoryStore:
+    """
+    Readings are buffered in memory and written with one executemany per
+    batch: every `batch_size` readings, or `flush_interval` seconds after the
+    oldest pending one (checked on insert and by a background flusher).
+    Alarms are committed immediately. Writes go through a single connection;
+    reads borrow one of at most `pool_size` connections, which WAL lets run
+    concurrently with the writer. The pool outlives request threads, so each
+    connection's PRAGMAs run once and its statement cache keeps being reused.
+    """
+
+    def __init__(self, path, batch_size=100, flush_interval=1.0, pool_size=READER_POOL_SIZE):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.pool_size = pool_size
+
+        self._write_lock = threading.Lock()
+        self._pending = []
+        self._pending_since = None
+        self._idle_readers = queue.LifoQueue()  # Most recently used first: its pages are still warm
+        self._reader_count = 0
+        self._pool_lock = threading.Lock()
+
+        self._writer = self._connect()
+        self._writer.executescript(SCHEMA)
+        self._writer.commit()
+
+        self._running = True
+        self._flusher = threading.Thread(target=self._flush_loop, daemon=True)
+        self._flusher.start()
+        logger.info(f"SQLite history store opened at {path}")
+
+    def _connect(self):
+        connection = sqlite3.connect(self.path, check_same_thread=False, cached_statements=32)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")  # Durable at checkpoints; WAL keeps it crash-safe
+        return connection
+
+    @contextmanager
+    def _reader(self):
+        """Borrows a pooled read connection, opening one while under pool_size, else waiting for one"""
+        try:
+            connection = self._idle_readers.get_nowait()
+        except queue.Empty:
+            with self._pool_lock:
+                opened = self._reader_count < self.pool_size
+                if opened:
+                    self._reader_count += 1
+            if opened:
+                try:
+                    connection = self._connect()
+                except Exception:
+                    with self._pool_lock:
+                        self._reader_count -= 1
+                    raise
+            else:
+                connection = self._idle_readers.get()
+        try:
+            yield connection
+        finally:
+            self._idle_readers.put(connection)
+
+    def _query(self, sql, parameters=()):
+        """All rows of one read query, on a pooled connection"""
+        with self._reader() as reader:
+            return reader.execute(sql, parameters).fetchall()
+
+    # ----------------------------------------------------------------- writes
+
+    def add_reading(self, device_id, timestamp, temperature, pressure, boiling_point, heating=False):
+        """Queues one reading; committed with the next batch"""
+        with self._write_lock:
+            if not self._pending:
+                self._pending_since = time.monotonic()
+            self._pending.append((device_id, timestamp, temperature, pressure, boiling_point, 1 if heating else 0))
+            if len(self._pending) >= self.batch_size or \
+                    time.monotonic() - self._pending_since >= self.flush_interval:
+                self._flush_locked()
+
+    def add_alarm(self, device_id, alarm):
+        """Stores a triggered alarm (dict from SmartAlarmManager) together with any pending readings"""
+        extra = {k: v for k, v in alarm.items() if k not in ('id', 'type', 'priority', 'message', 'timestamp')}
+        row = (device_id, alarm.get('timestamp', time.time()), alarm.get('id', ''), alarm.get('type', ''),
+               alarm.get('priority'), alarm.get('message'), json.dumps(extra, default=str))
+        with self._write_lock:
+            self._flush_locked(commit=False)
+            self._writer.execute(INSERT_ALARM, row)
+            self._writer.commit()
+
+    def flush(self):
+        with self._write_lock:
+            self._flush_locked()
+
+    def _flush_locked(self, commit=True):
+        if self._pending:
+            self._writer.executemany(INSERT_READING, self._pending)
+            self._pending = []
+            self._pending_since = None
+        if commit:
+            self._writer.commit()
+
+    def _flush_loop(self):
+        while self._running:
+            time.sleep(self.flush_interval)
+            try:
+                with self._write_lock:
+                    if self._pending and time.monotonic() - self._pending_since >= self.flush_interval:
+                        self._flush_locked()
+            except sqlite3.Error as e:
+                logger.error(f"SQLite flush failed: {e}")
+
+    def purge_before(self, table, cutoff, batch_size=5000):
+        """
+        Deletes rows older than cutoff in small batches, each its own short
+        transaction, so queued readings are never held up for long. Returns
+        the number of rows deleted.
+        """
+        deleted = 0
+        while True:
+            with self._write_lock:
+                cursor = self._writer.execute(PURGE_BEFORE[table], (cutoff, batch_size))
+                self._writer.commit()
+            deleted += cursor.rowcount
+            if cursor.rowcount < batch_size:
+                break
+            time.sleep(0)  # Let the collector in between batches
+        if deleted:
+            with self._write_lock:
+                self._writer.execute("PRAGMA wal_checkpoint(PASSIVE)")
+        return deleted
+
+    def stats(self):
+        with self._reader() as reader:
+            page_size = reader.execute("PRAGMA page_size").fetchone()[0]
+            pages = reader.execute("PRAGMA page_count").fetchone()[0]
+            free_pages = reader.execute("PRAGMA freelist_count").fetchone()[0]
+            readings = reader.execute("SELECT COUNT(*) FROM readings").fetchone()[0]
+            alarms = reader.execute("SELECT COUNT(*) FROM alarms").fetchone()[0]
+        wal_path = self.path + '-wal'
+        return {
+            'path': self.path,
+            'readings': readings,
+            'alarms': alarms,
+            'pending_readings': len(self._pending),
+            'disk_bytes': pages * page_size + (os.path.getsize(wal_path) if os.path.exists(wal_path) else 0),
+            'free_bytes': free_pages * page_size,  # Reused by new rows; VACUUM would return it to the OS
+            'reader_connections': self._reader_count,
+        }
+
+    def close(self):
+        self._running = False
+        with self._write_lock:
+            self._flush_locked()
+            self._writer.close()
+        while True:
+            try:
+                self._idle_readers.get_nowait().close()
+            except queue.Empty:
+                break
+
+    # ------------------------------------------------------------------ reads
+
+    def readings(self, device_id, start=None, end=None, limit=None, newest=False):
+        """
+        Committed readings in [start, end], oldest first, as NumPy arrays keyed
+        like the history API. With newest, `limit` keeps the most recent rows.
+        """
+        rows = self._query(SELECT_LATEST_READINGS if newest else SELECT_READINGS, (
+            device_id,
+            float('-inf') if start is None else start,
+            float('inf') if end is None else end,
+            -1 if limit is None else limit,
+        ))
+        if newest:
+            rows.reverse()
+        return self._reading_arrays(rows)
+
+    def bounds(self, device_id):
+        """(first, last) committed reading timestamp, or (None, None); two index lookups"""
+        return tuple(self._query(SELECT_BOUNDS, (device_id,))[0])
+
+    @staticmethod
+    def _reading_arrays(rows):
+        columns = np.array(rows, dtype=np.float64).reshape(-1, 5)
+        return {
+            'timestamps': columns[:, 0],
+            'temperatures': columns[:, 1],
+            'pressures': columns[:, 2],
+            'boiling_points': columns[:, 3],
+            'heating': columns[:, 4].astype(bool),
+        }
+
+    def iter_readings(self, device_id, start=None, end=None, chunk_size=5000):
+        """
+        Like readings(), as a generator of chunks. Each chunk is its own short
+        keyset-paginated query, so no read transaction stays open for the
+        whole export and the writer is never held up.
+        """
+        # The keyset comparison is exclusive, so start just below `start` to include it
+        last_ts = float('-inf') if start is None else float(np.nextafter(start, float('-inf')))
+        last_rowid = -1
+        end = float('inf') if end is None else end
+        while True:
+            rows = self._query(SELECT_READINGS_AFTER, (device_id, last_ts, last_rowid, end, chunk_size))
+            if not rows:
+                return
+            last_ts, last_rowid = rows[-1][0], rows[-1][5]
+            yield self._reading_arrays([row[:5] for row in rows])
+            if len(rows) < chunk_size:
+                return
+
+    def count_readings(self, device_id, start=None, end=None):
+        return self._query(COUNT_READINGS, (
+            device_id,
+            float('-inf') if start is None else start,
+            float('inf') if end is None else end,
+        ))[0][0]
+
+    def aggregate(self, device_id, bucket_seconds, start=None, end=None):
+        """Per-bucket count and mean/min/max, computed by SQLite over the (device_id, ts) index"""
+        rows = self._query(SELECT_AGGREGATE, (
+            bucket_seconds, bucket_seconds, device_id,
+            float('-inf') if start is None else start,
+            float('inf') if end is None else end,
+        ))
+        columns = np.array(rows, dtype=np.float64).reshape(-1, 1 + len(_AGGREGATE_COLUMNS))
+        data = {'timestamps': columns[:, 0]}
+        for i, name in enumerate(_AGGREGATE_COLUMNS, start=1):
+            data[name] = columns[:, i]
+        return data
+
+    def alarms(self, device_id, start=None, end=None, limit=100):
+        """Stored alarms, newest first"""
+        rows = self._query(SELECT_ALARMS, (
+            device_id,
+            float('-inf') if start is None else start,
+            float('inf') if end is None else end,
+            limit,
+        ))
+        return [
+            {'timestamp': ts, 'id': alarm_id, 'type': alarm_type, 'priority': priority,
+             'message': message, **json.loads(data or '{}')}
+            for ts, alarm_id, alarm_type, priority, message, data in rows
+        ]
+
+    def iter_alarms(self, device_id, start=None, end=None, chunk_size=1000):
+        """Stored alarms, oldest first, fetched in keyset-paginated chunks"""
+        last_ts = float('-inf') if start is None else float(np.nextafter(start, float('-inf')))
+        last_rowid = -1
+        end = float('inf') if end is None else end
+        while True:
+            rows = self._query(SELECT_ALARMS_AFTER, (device_id, last_ts, last_rowid, end, chunk_size))
+            for ts, alarm_id, alarm_type, priority, message, data, rowid in rows:
+                yield {'timestamp': ts, 'id': alarm_id, 'type': alarm_type, 'priority': priority,
+                       'message': message, **json.loads(data or '{}')}
+            if len(rows) < chunk_size:
+                return
+            last_ts, last_rowid = rows[-1][0], rows[-1][6]
+
+    def devices(self):
+        return [row[0] for row in self._query(SELECT_DEVICES)]
+
+if __name__ == "__main__":
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = SQLiteHistoryStore(os.path.join(directory, 'history.db'), batch_size=500)
+        n = 50_000
+        start = time.perf_counter()
+        for i in range(n):
+            store.add_reading(f"thermo_{i % 10}", 1000.0 + i, 20.0 + (i % 800) * 0.1, 1.0, 100.0, i % 2)
+        store.flush()
+        elapsed = time.perf_counter() - start
+        print(f"{n:,} readings in {elapsed:.2f} s ({n / elapsed:,.0f}/s)")
+
+        window = store.readings("thermo_3", 2000.0, 3000.0)
+        buckets = store.aggregate("thermo_3", 600, 1000.0, 50000.0)
+        print(f"thermo_3: {len(window['timestamps'])} readings in window, {len(buckets['timestamps'])} 10-minute buckets")
+        print(f"Devices: {store.devices()}")
+        store.close()
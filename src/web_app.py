@@ -2,29 +2,71 @@
 Web Dashboard for IoT Smart Thermometer
 Flask-based web interface for monitoring and controlling the thermometer
 """
-from flask import Flask, request, jsonify, redirect, url_for
+from flask import Flask, Response, request, jsonify, redirect, url_for, stream_with_context
 from flask_cors import CORS
+from werkzeug.exceptions import HTTPException
 import json
 import time
+import functools
+import hashlib
 import threading
 import logging
 import os
 import sys
+import numpy as np
 from datetime import datetime, timedelta
 import plotly.graph_objs as go
 import plotly.utils
-from .config import Config, calculate_boiling_point, DEVICE_ID, DEVICE_NAME
+from .config import Config, calculate_boiling_point, DEVICE_ID, DEVICE_NAME, DEVICE_IDS
 try:
     from .pressure_sensor import PressureSensor, ALTITUDE_PRESETS
     from .mqtt_client import MQTTClient
     from .smart_alarm_manager import SmartAlarmManager
-    from .simple_temperature_sensor_precision import PrecisionTemperatureSensor
+    from .simple_temperature_sensor_precision import PrecisionTemperatureSensor, create_temperature_sensor
+    from .clock import get_clock
+    from .ring_buffer import TimeSeriesRingBuffer, HISTORY_FIELDS
+    from .shared_history import SharedHistoryBuffer
+    from .snapshot import SensorSnapshot
+    from .json_codec import EncodedCache, json_object
+    from .device_registry import Device, DeviceRegistry
+    from .fleet_simulator import FleetTemperatureSimulator
+    from .compression import ResponseCompressor
+    from .broadcaster import format_sse
+    from .ws_protocol import WebSocket, is_upgrade_request, handshake_response
+    from .live_channel import ChannelSession, reading_fields, status_fields
+    from .segment_store import SegmentStore
+    from .rollup import HistoryRollups
+    from .downsample import lttb_indices
+    from .sqlite_store import SQLiteHistoryStore
+    from .gorilla import encode_block, history_to_records
+    from .history_export import (EXPORT_FORMATS, reading_columns, csv_stream, alarms_csv_stream,
+                                 ndjson_stream, npz_stream)
+    from .retention import HistoryCompactor, parse_retention
 except ImportError:
     sys.path.append(os.path.dirname(__file__))
     from pressure_sensor import PressureSensor, ALTITUDE_PRESETS
     from mqtt_client import MQTTClient
     from smart_alarm_manager import SmartAlarmManager
-    from simple_temperature_sensor_precision import PrecisionTemperatureSensor
+    from simple_temperature_sensor_precision import PrecisionTemperatureSensor, create_temperature_sensor
+    from clock import get_clock
+    from ring_buffer import TimeSeriesRingBuffer, HISTORY_FIELDS
+    from shared_history import SharedHistoryBuffer
+    from snapshot import SensorSnapshot
+    from json_codec import EncodedCache, json_object
+    from device_registry import Device, DeviceRegistry
+    from fleet_simulator import FleetTemperatureSimulator
+    from compression import ResponseCompressor
+    from broadcaster import format_sse
+    from ws_protocol import WebSocket, is_upgrade_request, handshake_response
+    from live_channel import ChannelSession, reading_fields, status_fields
+    from segment_store import SegmentStore
+    from rollup import HistoryRollups
+    from downsample import lttb_indices
+    from sqlite_store import SQLiteHistoryStore
+    from gorilla import encode_block, history_to_records
+    from history_export import (EXPORT_FORMATS, reading_columns, csv_stream, alarms_csv_stream,
+                                ndjson_stream, npz_stream)
+    from retention import HistoryCompactor, parse_retention
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -36,40 +78,79 @@ app = Flask(__name__, static_folder=frontend_dir, static_url_path='')
 app.secret_key = 'smart_thermometer_secret_key'
 
 # Enable CORS for frontend communication
+CORS_ORIGINS = ["http://localhost:3000", "http://127.0.0.1:3000", 
+                "http://localhost:8080", "http://127.0.0.1:8080",
+                "http://localhost:8081", "http://127.0.0.1:8081", 
+                "http://localhost:8082", "http://127.0.0.1:8082", 
+                "file://"]
 CORS(app, resources={
     r"/api/*": {
-        "origins": ["http://localhost:3000", "http://127.0.0.1:3000", 
-                   "http://localhost:8080", "http://127.0.0.1:8080",
-                   "http://localhost:8081", "http://127.0.0.1:8081", 
-                   "http://localhost:8082", "http://127.0.0.1:8082", 
-                   "file://"],
+        "origins": CORS_ORIGINS,
         "methods": ["GET", "POST", "PUT", "DELETE"],
-        "allow_headers": ["Content-Type", "Authorization"]
+        "allow_headers": ["Content-Type", "Authorization", "If-None-Match"],
+        "expose_headers": ["ETag"]
     }
 })
 
-# Global variables for sensors and systems
-temperature_sensor = None
-pressure_sensor = None
+# gzip/brotli by Accept-Encoding for bodies above the threshold (history, exports, charts)
+response_compressor = ResponseCompressor(app, min_size=Config.COMPRESSION_MIN_BYTES)
+
+# Shared by every device: one MQTT connection
 mqtt_client = None
-alarm_manager = None
-data_history = {
-    'timestamps': [],
-    'temperatures': [],
-    'pressures': [],
-    'boiling_points': []
-}
+
+# With HISTORY_SHARED_MEMORY set, one collector process owns the history and
+# read-only worker processes (HISTORY_SHARED_ROLE=reader) serve it from shared memory
+HISTORY_READER = bool(Config.HISTORY_SHARED_MEMORY) and Config.HISTORY_SHARED_ROLE == 'reader'
+SHARED_ATTACH_TIMEOUT = 30.0  # Seconds a reader waits for the collector to create the history
+
+def _history_buffer(capacity, fields=HISTORY_FIELDS, suffix=''):
+    """In-process ring buffer, or a shared-memory one when HISTORY_SHARED_MEMORY is set"""
+    if not Config.HISTORY_SHARED_MEMORY:
+        return TimeSeriesRingBuffer(capacity, fields=fields)
+    return SharedHistoryBuffer(Config.HISTORY_SHARED_MEMORY + suffix, capacity, fields,
+                               create=not HISTORY_READER, attach_timeout=SHARED_ATTACH_TIMEOUT)
+
+# Every kettle served by this dashboard; the unscoped /api/* routes serve the default device (DEVICE_ID)
+devices = DeviceRegistry(DEVICE_ID)
+
+def _add_device(device):
+    device.system_status_cache = EncodedCache(lambda: _system_status(device))
+    return devices.add(device)
+
+# The default device keeps the configured history stack (shared memory, segment files); the
+# others keep theirs in memory and, with HISTORY_DB, in the database (rows are keyed by device)
+_add_device(Device(DEVICE_ID, DEVICE_NAME,
+                   data_history=_history_buffer(Config.HISTORY_CAPACITY),
+                   history_store=SegmentStore(Config.HISTORY_DIR, segment_records=Config.HISTORY_SEGMENT_RECORDS,
+                                              compression=Config.HISTORY_COMPRESSION,
+                                              precision={'temperature': 1, 'pressure': 4},
+                                              readonly=HISTORY_READER) if Config.HISTORY_DIR else None,
+                   history_rollups=HistoryRollups(directory=Config.HISTORY_DIR, compression=Config.HISTORY_COMPRESSION,
+                                                  buffer_factory=lambda label, capacity, fields: _history_buffer(capacity, fields, f'-{label}'),
+                                                  readonly=HISTORY_READER)))
+if not HISTORY_READER:
+    # Read-only workers only share the default device's history with the collector
+    for device_id in DEVICE_IDS[1:]:
+        _add_device(Device(device_id, data_history=TimeSeriesRingBuffer(Config.HISTORY_CAPACITY),
+                           history_rollups=HistoryRollups()))
+
+history_db = SQLiteHistoryStore(Config.HISTORY_DB, batch_size=Config.HISTORY_DB_BATCH_SIZE,
+                                flush_interval=Config.HISTORY_DB_FLUSH_MS / 1000.0) if Config.HISTORY_DB else None
+history_compactor = HistoryCompactor(parse_retention(Config.HISTORY_RETENTION), get_clock(),
+                                     segment_store=devices.default.history_store,
+                                     rollups=devices.default.history_rollups,
+                                     database=history_db, interval=Config.COMPACTION_INTERVAL)
+COLLECTION_INTERVAL = 3  # Seconds between collected samples
+STREAM_KEEPALIVE = 15  # Seconds between keepalive comments on an idle stream
+ETAG_EPOCH = os.urandom(4).hex()  # Per process: version counters restart at 0 on every boot
 
 # Data collection thread control
 data_collection_active = False
 data_collection_thread = None
 
 def initialize_systems():
-    """Initialize all system components"""
-    global temperature_sensor, pressure_sensor, mqtt_client, alarm_manager
-    
-    temperature_sensor = PrecisionTemperatureSensor()
-    pressure_sensor = PressureSensor("web_pressure_sensor")
+    """Initialize all system components: sensors and an alarm manager for every device"""
+    global mqtt_client
     
     # Initialize MQTT client
     mqtt_client = MQTTClient("web_dashboard")
@@ -77,124 +158,627 @@ def initialize_systems():
         print("Warning: MQTT connection failed, continuing without MQTT")
         mqtt_client = None
     
-    # Initialize alarm manager
-    alarm_manager = SmartAlarmManager(mqtt_client)
-    alarm_manager.start_monitoring()
+    seed = Config.SIMULATION_SEED
+    # The other kettles share one vectorized simulation thread
+    others = [device.device_id for device in devices if device.device_id != devices.default_id]
+    fleet = FleetTemperatureSimulator(len(others), others, seed=None if seed is None else seed + 2) if others else None
+    fleet_sensors = dict(zip(others, fleet.sensors)) if fleet else {}
+    
+    for index, device in enumerate(devices):
+        device_seed = None if seed is None else seed + 2 * index
+        if device.device_id == devices.default_id:
+            device.temperature_sensor = create_temperature_sensor(Config.TEMPERATURE_ENGINE, seed=device_seed)
+            device.pressure_sensor = PressureSensor("web_pressure_sensor", seed=None if seed is None else seed + 1)
+            # MQTT topics carry DEVICE_ID, so only the default device's alarms are published there
+            device.alarm_manager = SmartAlarmManager(mqtt_client)
+        else:
+            device.temperature_sensor = fleet_sensors[device.device_id]
+            device.pressure_sensor = PressureSensor(f"{device.device_id}_pressure",
+                                                    seed=None if seed is None else device_seed + 1)
+            device.alarm_manager = SmartAlarmManager()
+        device.alarm_manager.start_monitoring()
+        _publish_status(device)  # New sensors and alarm manager: a new status version
+    
+    # Enforce retention on persistent history (in-memory buffers are already bounded)
+    if devices.default.history_store is not None or history_db is not None:
+        history_compactor.start()
     
     print("All systems initialized")
 
 def collect_sensor_data():
-    """Background thread for collecting sensor data"""
+    """Background thread for collecting sensor data: one pass over every device per tick"""
     global data_collection_active
+    clock = get_clock()
     
     while data_collection_active:
+        failed = False
+        for device in devices:
+            try:
+                _collect_device(device, clock)
+            except Exception as e:
+                logger.error(f"Error in data collection ({device.device_id}): {e}")
+                failed = True
+        clock.sleep(5 if failed else COLLECTION_INTERVAL)  # Wait longer on error
+
+def _collect_device(device, clock):
+    """One collector tick for one device"""
+    # Get current pressure
+    pressure_data = device.pressure_sensor.get_sensor_data()
+    current_pressure = pressure_data.get('pressure', 1.0) if pressure_data else 1.0
+    
+    # Get temperature reading
+    temp_data = device.temperature_sensor.get_data(current_pressure)
+    current_temp = temp_data.get('temperature') if temp_data else None
+    
+    # Calculate boiling point
+    boiling_point = calculate_boiling_point(current_pressure)
+    
+    # Update temperature sensor target to match calculated boiling point
+    device.temperature_sensor.set_target_temperature(boiling_point)
+    
+    # Publish this tick for the API: requests never read the sensors themselves
+    timestamp = clock.time()
+    snapshot = _publish_snapshot(device, timestamp, temp_data, pressure_data, boiling_point)
+    
+    if current_temp is None:
+        return
+    
+    # Store in history (fixed-capacity ring buffer, O(1) append)
+    data_history = device.data_history
+    data_history.append(timestamp,
+                        temperatures=current_temp,
+                        pressures=current_pressure,
+                        boiling_points=boiling_point)
+    if isinstance(data_history, SharedHistoryBuffer):
+        # What reader processes serve from /api/sensor_data
+        data_history.publish_latest(snapshot.body)
+    if device.history_store is not None:
+        device.history_store.append_reading(timestamp, current_temp, current_pressure,
+                                            boiling_point, temp_data.get('is_heating', False))
+    device.history_rollups.add(timestamp, current_temp, current_pressure, boiling_point)
+    if history_db is not None:
+        history_db.add_reading(device.device_id, timestamp, current_temp, current_pressure,
+                               boiling_point, temp_data.get('is_heating', False))
+    
+    # Check alarms
+    alarm_manager = device.alarm_manager
+    if alarm_manager and alarm_manager.is_monitoring:
+        triggered = alarm_manager.check_alarms(temp_data, pressure_data, boiling_point)
+        if history_db is not None:
+            for alarm in triggered:
+                history_db.add_alarm(device.device_id, alarm)
+        for alarm in triggered:
+            device.events.publish('alarm', alarm)
+        if triggered:
+            _publish_status(device)
+    
+    # Publish to MQTT (with better error handling); its topics belong to the default device
+    if mqtt_client and device.device_id == devices.default_id:
         try:
-            # Get current pressure
-            pressure_data = pressure_sensor.get_sensor_data()
-            current_pressure = pressure_data.get('pressure', 1.0) if pressure_data else 1.0
-            
-            # Get temperature reading
-            temp_data = temperature_sensor.get_data(current_pressure)
-            current_temp = temp_data.get('temperature') if temp_data else None
-            
-            # Calculate boiling point
-            boiling_point = calculate_boiling_point(current_pressure)
-            
-            # Update temperature sensor target to match calculated boiling point
-            temperature_sensor.set_target_temperature(boiling_point)
-            
-            if current_temp is not None:
-                # Store in history
-                timestamp = datetime.now()
-                data_history['timestamps'].append(timestamp.isoformat())
-                data_history['temperatures'].append(current_temp)
-                data_history['pressures'].append(current_pressure)
-                data_history['boiling_points'].append(boiling_point)
-                
-                # Limit history to last 200 points
-                if len(data_history['timestamps']) > 200:
-                    for key in data_history:
-                        data_history[key] = data_history[key][-200:]
-                
-                # Check alarms
-                if alarm_manager and alarm_manager.is_monitoring:
-                    alarm_manager.check_alarms(temp_data, pressure_data, boiling_point)
-                
-                # Publish to MQTT (with better error handling)
-                if mqtt_client:
-                    try:
-                        if mqtt_client.is_connected:
-                            mqtt_client.publish_temperature_data(temp_data)
-                            mqtt_client.publish_pressure_data(pressure_data)
-                    except Exception as mqtt_error:
-                        logger.warning(f"MQTT publish error: {mqtt_error}")
-            
-            time.sleep(3)  # Collect data every 3 seconds
-            
-        except Exception as e:
-            logger.error(f"Error in data collection: {e}")
-            time.sleep(5)  # Wait longer on error
+            if mqtt_client.is_connected:
+                mqtt_client.publish_temperature_data(temp_data)
+                mqtt_client.publish_pressure_data(pressure_data)
+        except Exception as mqtt_error:
+            logger.warning(f"MQTT publish error: {mqtt_error}")
+
+def _publish_snapshot(device, timestamp, temp_data, pressure_data, boiling_point):
+    """Serializes one tick and makes it the device's latest snapshot (a single reference swap)"""
+    previous = device.latest_snapshot
+    snapshot = SensorSnapshot((previous.seq + 1) if previous else 1, timestamp, temp_data, pressure_data,
+                              boiling_point, _sensor_payload(temp_data, pressure_data, boiling_point, timestamp))
+    device.latest_snapshot = snapshot
+    # A client that falls behind only gets the newest reading
+    device.events.publish('reading', snapshot.body, event_id=snapshot.seq, coalesce_key='reading')
+    return snapshot
+
+def _status_payload(device):
+    """Collection, heating and alarm state, as pushed in 'status' stream events"""
+    temperature_sensor, alarm_manager = device.temperature_sensor, device.alarm_manager
+    return {
+        'data_collection': data_collection_active,
+        'heating': bool(temperature_sensor.is_heating) if temperature_sensor else False,
+        'target_temperature': temperature_sensor.get_target_temperature() if temperature_sensor else None,
+        'alarms': alarm_manager.get_status() if alarm_manager else None,
+    }
+
+def _publish_status(device):
+    """Bumps the device's status version (see _system_status_version) and pushes a 'status' event"""
+    device.status_version += 1
+    device.events.publish('status', _status_payload(device), coalesce_key='status')
+
+# Routes a read-only worker can serve from the shared history and the persistent stores
+READER_ENDPOINTS = {
+    'dashboard', 'static', 'get_sensor_data', 'get_historical_data', 'get_history_aggregate',
+    'get_alarm_history', 'export_history', 'storage_status', 'list_devices',
+}
+
+@app.before_request
+def restrict_reader_routes():
+    """Read-only workers have no sensors or alarm manager: refuse everything else"""
+    if HISTORY_READER and request.endpoint not in READER_ENDPOINTS:
+        return jsonify({'error': 'Read-only history worker: send this request to the collector process'}), 503
+
+def _etag(*versions):
+    """Strong ETag from state version counters"""
+    return '-'.join(map(str, (ETAG_EPOCH,) + versions))
+
+def _conditional(etag, build):
+    """
+    304 Not Modified when the client's If-None-Match already holds `etag`;
+    otherwise build() makes the response. The body is only built (and
+    serialized) when the version changed.
+    """
+    if request.if_none_match.contains_weak(etag):
+        response = Response(status=304)
+    else:
+        response = build()
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+def device_route(rule, **options):
+    """
+    Registers a per-device view at /api/devices/<device_id><rule>, and at
+    the unscoped /api<rule> for the default device. The view is called with
+    the Device; unknown device ids get a 404.
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def device_view(device_id=None):
+            device = devices.default if device_id is None else devices.get(device_id)
+            if device is None:
+                return jsonify({'error': f'Unknown device: {device_id}'}), 404
+            return view(device)
+        app.add_url_rule(f'/api{rule}', view_func=device_view, **options)
+        app.add_url_rule(f'/api/devices/<device_id>{rule}', view_func=device_view, **options)
+        return device_view
+    return decorator
 
 @app.route('/')
 def dashboard():
     """Main dashboard page"""
     return app.send_static_file('index.html')
 
-@app.route('/api/sensor_data')
-def get_sensor_data():
-    """API endpoint for current sensor readings"""
-    try:
-        # Get real sensor data
-        if not temperature_sensor or not pressure_sensor:
-            return jsonify({'error': 'Sensors not initialized'}), 500
-            
-        # Get current pressure reading
-        pressure_data = pressure_sensor.get_sensor_data()
-        current_pressure = pressure_data.get('pressure', 1.0) if pressure_data else 1.0
-          # Get temperature reading
-        temp_data = temperature_sensor.get_data(current_pressure)
-        
-        # Calculate boiling point based on pressure
-        boiling_point = calculate_boiling_point(current_pressure)
-        
-        return jsonify({
-            'temperature': {
-                'temperature': temp_data.get('temperature', 22.0),
-                'unit': temp_data.get('temperature_unit', 'celsius'),
-                'sensor_id': temp_data.get('device_id', 'unknown'),
-                'timestamp': temp_data.get('timestamp', datetime.now().isoformat()),
-                'is_heating': temp_data.get('is_heating', False),
-                'target_temperature': temp_data.get('target_temperature', 100.0),
-                'sensor_status': temp_data.get('sensor_status', 'active')
-            },
-            'pressure': {
-                'pressure': pressure_data.get('pressure', 1.0) if pressure_data else 1.0,
-                'unit': pressure_data.get('unit', 'atm') if pressure_data else 'atm',
-                'sensor_id': pressure_data.get('device_id', 'unknown') if pressure_data else 'unknown',
-                'timestamp': pressure_data.get('timestamp', datetime.now().isoformat()) if pressure_data else datetime.now().isoformat()
-            },
-            'boiling_point': boiling_point,
-            'timestamp': datetime.now().isoformat()
+@app.route('/api/devices')
+def list_devices():
+    """Registered devices, the default one first, with their last reading"""
+    result = []
+    for device in devices:
+        snapshot = device.latest_snapshot
+        result.append({
+            'device_id': device.device_id,
+            'name': device.name,
+            'default': device.device_id == devices.default_id,
+            'temperature': snapshot.temperature if snapshot is not None else None,
+            'timestamp': snapshot.timestamp if snapshot is not None else None,
         })
+    return jsonify({'devices': result, 'default': devices.default_id, 'count': len(result)})
+
+@device_route('/sensor_data')
+def get_sensor_data(device):
+    """API endpoint for current sensor readings (the collector's latest snapshot, served as-is)"""
+    if HISTORY_READER:
+        # Published by the collector process after each sample; no sequence number to tag it with
+        body = device.data_history.latest_payload()
+        etag = hashlib.blake2b(body, digest_size=8).hexdigest() if body is not None else None
+    else:
+        snapshot = device.latest_snapshot
+        body = snapshot.body if snapshot is not None else None
+        etag = _etag(snapshot.seq) if snapshot is not None else None
+    if body is None:
+        return jsonify({'error': 'No reading collected yet'}), 503
+    return _conditional(etag, lambda: Response(body, mimetype='application/json'))
+
+@device_route('/stream')
+def stream_events(device):
+    """
+    Server-Sent Events: 'reading' after every collector tick (same body as
+    /api/sensor_data), 'alarm' for each triggered alarm and 'status' when
+    collection, heating or alarm state changes. 'resync' tells a client that
+    fell too far behind to reload state over REST.
+    """
+    event_broadcaster = device.events
+    
+    def events():
+        subscription = event_broadcaster.subscribe()
+        try:
+            yield 'retry: 3000\n\n'
+            snapshot = device.latest_snapshot
+            if snapshot is not None:
+                yield format_sse('reading', snapshot.body, snapshot.seq)
+            yield format_sse('status', _status_payload(device))
+            while not subscription.closed:
+                message = subscription.get(timeout=STREAM_KEEPALIVE)
+                dropped = subscription.take_dropped()
+                if dropped:
+                    yield format_sse('resync', {'dropped': dropped})
+                # The keepalive also surfaces disconnected clients, which ends this generator
+                yield message if message is not None else ': keepalive\n\n'
+        finally:
+            event_broadcaster.unsubscribe(subscription)
+    
+    return Response(events(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+def _device_fields(device):
+    """Current flat live-channel fields of one device: last reading plus status"""
+    snapshot = device.latest_snapshot
+    fields = reading_fields(snapshot) if snapshot is not None else {}
+    fields.update(status_fields(_status_payload(device)))
+    return fields
+
+def _dispatch_control(action, payload, device_id=None):
+    """Runs a live-channel control command through the matching POST /api/[devices/<id>/]control/<action> route"""
+    if not isinstance(action, str) or not action.isidentifier():
+        return 400, {'error': 'Invalid control action'}
+    try:
+        app.url_map.bind('localhost').match(f'/api/control/{action}', method='POST')
+    except HTTPException:
+        return 404, {'error': f'Unknown control action: {action}'}
+    path = f'/api/control/{action}' if device_id is None else f'/api/devices/{device_id}/control/{action}'
+    with app.test_request_context(path, method='POST', json=payload):
+        response = app.full_dispatch_request()
+    return response.status_code, response.get_json(silent=True)
+
+def _channel_session():
+    """Live-channel protocol state for one client, over every registered device"""
+    return ChannelSession({device.device_id: functools.partial(_device_fields, device) for device in devices},
+                          _dispatch_control)
+
+@app.route('/api/ws', websocket=True)
+def live_channel():
+    """
+    WebSocket live channel (see live_channel.ChannelSession): clients subscribe
+    to devices and fields and get only the fields that changed since their
+    last frame; control messages run the /api/control/* handlers.
+    """
+    if not is_upgrade_request(request.headers):
+        return jsonify({'error': 'WebSocket handshake without Sec-WebSocket-Key'}), 400
+    sock = request.environ.get('werkzeug.socket')
+    if sock is None:
+        return jsonify({'error': 'WebSocket requires the built-in server'}), 501
+    sock.sendall(handshake_response(request.headers['Sec-WebSocket-Key']))
+    
+    ws = WebSocket(sock)
+    session = _channel_session()
+    session_lock = threading.Lock()
+    # One subscription per device, all waking this thread
+    wake = threading.Event()
+    closed = threading.Event()
+    subscriptions = [(device, device.events.subscribe(raw=True, notify=wake.set)) for device in devices]
+    
+    def send(frames):
+        for frame in frames:
+            ws.send(json.dumps(frame, default=str))
+    
+    def receive_loop():
+        try:
+            while True:
+                text = ws.receive()
+                if text is None:
+                    break
+                with session_lock:
+                    frames = session.handle(text)
+                send(frames)
+        except OSError:
+            pass
+        finally:
+            closed.set()
+            wake.set()
+    
+    threading.Thread(target=receive_loop, name='ws-receive', daemon=True).start()
+    try:
+        while not closed.is_set():
+            if not wake.wait(STREAM_KEEPALIVE):
+                ws.ping()
+                continue
+            wake.clear()
+            frames = []
+            with session_lock:
+                for device, subscription in subscriptions:
+                    while True:
+                        item = subscription.get(timeout=0)
+                        if item is None:
+                            break
+                        event, data, _ = item
+                        if event == 'alarm':
+                            frames += session.alarm(device.device_id, data)
+                        else:
+                            frames += session.updates([device.device_id])
+            send(frames)
+    except OSError:
+        pass
+    finally:
+        for device, subscription in subscriptions:
+            device.events.unsubscribe(subscription)
+        ws.close()
+    # The connection is finished; the server's attempt to send this is dropped
+    return Response(status=200)
+
+def _sensor_payload(temp_data, pressure_data, boiling_point, timestamp):
+    """/api/sensor_data response body for one collector tick"""
+    tick_time = datetime.fromtimestamp(timestamp).isoformat()
+    return {
+        'temperature': {
+            'temperature': temp_data.get('temperature', 22.0),
+            'unit': temp_data.get('temperature_unit', 'celsius'),
+            'sensor_id': temp_data.get('device_id', 'unknown'),
+            'timestamp': temp_data.get('timestamp', tick_time),
+            'is_heating': temp_data.get('is_heating', False),
+            'target_temperature': temp_data.get('target_temperature', 100.0),
+            'sensor_status': temp_data.get('sensor_status', 'active')
+        },
+        'pressure': {
+            'pressure': pressure_data.get('pressure', 1.0) if pressure_data else 1.0,
+            'unit': pressure_data.get('unit', 'atm') if pressure_data else 'atm',
+            'sensor_id': pressure_data.get('device_id', 'unknown') if pressure_data else 'unknown',
+            'timestamp': pressure_data.get('timestamp', tick_time) if pressure_data else tick_time
+        },
+        'boiling_point': boiling_point,
+        'timestamp': tick_time
+    }
+
+def _to_json_floats(values, decimals=4):
+    """float32 history values -> rounded Python floats for JSON"""
+    return np.round(values.astype(np.float64), decimals).tolist()
+
+# Decimal places kept by ?format=packed (sensor resolution: 0.1 °C, 1e-4 atm)
+PACKED_PRECISION = {'temperatures': 1, 'pressures': 4, 'boiling_points': 2}
+
+def _parse_time_arg(name):
+    """Query argument as epoch seconds; accepts epoch numbers or ISO 8601 (local time unless offset given)"""
+    value = request.args.get(name)
+    if value is None or value == '':
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp()
+
+# No time zone changes its UTC offset twice within this span, so equal offsets at both ends cover it
+UTC_OFFSET_CHECK_SPAN = 86400
+
+def _utc_offsets(timestamps):
+    """Local UTC offset of every timestamp, from a few localtime() calls at the ends of ranges"""
+    offsets = np.empty(len(timestamps))
+    ranges = [(0, len(timestamps))]
+    while ranges:
+        lo, hi = ranges.pop()
+        first = time.localtime(float(timestamps[lo])).tm_gmtoff
+        last = time.localtime(float(timestamps[hi - 1])).tm_gmtoff
+        if first == last and timestamps[hi - 1] - timestamps[lo] <= UTC_OFFSET_CHECK_SPAN:
+            offsets[lo:hi] = first
+        elif hi - lo <= 2:
+            offsets[lo], offsets[hi - 1] = first, last
+        else:
+            # Longer span or an offset change inside: split until each part has a single offset
+            mid = (lo + hi) // 2
+            ranges.append((lo, mid))
+            ranges.append((mid, hi))
+    return offsets
+
+def _iso_timestamps(timestamps):
+    """Epoch seconds -> local ISO strings in one vectorized pass"""
+    if len(timestamps) == 0:
+        return []
+    timestamps = np.asarray(timestamps, dtype=np.float64)
+    local_us = np.round((timestamps + _utc_offsets(timestamps)) * 1e6)
+    return np.datetime_as_string(local_us.astype('datetime64[us]'), unit='us').tolist()
+
+def _history_window(device, start=None, end=None):
+    """Raw history arrays in [start, end], from SQLite or the segment store when enabled, else the ring buffer"""
+    if history_db is not None:
+        # Same bound as the in-memory history: the newest HISTORY_CAPACITY readings of the window
+        return history_db.readings(device.device_id, start, end, limit=Config.HISTORY_CAPACITY, newest=True)
+    if device.history_store is None:
+        return device.data_history.range(start, end)
+    records = device.history_store.range(start, end)  # memmap-backed, nothing loaded until sliced
+    return _records_to_history(records)
+
+def _history_bounds(device, start=None, end=None):
+    """Span [first, last] a window covers, found without loading its raw readings (None when empty)"""
+    if start is not None and end is not None:
+        return start, end
+    if history_db is not None:
+        first, last = history_db.bounds(device.device_id)
+    elif device.history_store is not None:
+        first, last = device.history_store.bounds()
+    else:
+        first, last = device.data_history.bounds()
+    if first is None:
+        return None, None
+    return (first if start is None else start), (last if end is None else end)
+
+def _records_to_history(records, heating=False):
+    """Segment store records -> history arrays keyed like the API"""
+    history = {
+        'timestamps': records['timestamp'],
+        'temperatures': records['temperature'],
+        'pressures': records['pressure'],
+        'boiling_points': records['boiling_point'],
+    }
+    if heating:
+        history['heating'] = records['heating']
+    return history
+
+def _history_version(device):
+    """Every history store only changes when the collector appends a reading or a compaction pass runs"""
+    latest = device.data_history.latest()
+    return (latest['timestamp'] if latest else 0, len(device.data_history), history_compactor.runs)
+
+@device_route('/historical_data')
+def get_historical_data(device):
+    """API endpoint for historical sensor data (?from=&to=, ?points= budget, ?time_format=iso|epoch, ?format=json|packed)"""
+    try:
+        start = _parse_time_arg('from')
+        end = _parse_time_arg('to')
+    except ValueError as e:
+        return jsonify({'error': f'Invalid time range: {e}'}), 400
+    points = request.args.get('points', type=int)
+    time_format = request.args.get('time_format', 'iso')
+    try:
+        # Versioned like the live endpoints: 304 while no reading arrived, and the
+        # compressed body of a multi-hour window is reused by every polling client
+        return _conditional(_etag('history', *_history_version(device)),
+                            lambda: _historical_response(device, start, end, points, time_format))
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
-@app.route('/api/historical_data')
-def get_historical_data():
-    """API endpoint for historical sensor data"""
+def _historical_response(device, start, end, points, time_format):
+    """Raw or rollup window trimmed to the `points` budget, as JSON or a packed block"""
+    history = None
+    resolution = 'raw'
+    
+    # Long windows are served from a rollup tier (which also covers data older than the raw history).
+    # The tier is chosen from the span alone, so raw readings are only loaded when they are served.
+    if points:
+        first, last = _history_bounds(device, start, end)
+        tier = device.history_rollups.select(last - first, points, COLLECTION_INTERVAL) if first is not None else None
+        if tier is not None:
+            if tier.store is None and history_db is not None:
+                # In-memory tiers start empty after a restart; the database has the full history
+                history = history_db.aggregate(device.device_id, tier.resolution, start, end)
+            else:
+                history = tier.window(start, end)
+            resolution = tier.label
+    if history is None:
+        history = _history_window(device, start, end)
+    
+    # Trim whatever is left to the budget, keeping the shape of the temperature curve
+    if points and len(history['timestamps']) > points:
+        indices = lttb_indices(history['timestamps'], history['temperatures'], points)
+        history = {name: values[indices] for name, values in history.items()}
+    
+    if request.args.get('format') == 'packed':
+        # Gorilla-encoded block (see gorilla.decode_block), rounded to the sensors' resolution
+        fields = [name for name in history if name != 'timestamps']
+        precision = {}
+        for name in fields:
+            metric = name[:-4] if name.endswith(('_min', '_max')) else name
+            if metric in PACKED_PRECISION:
+                precision[name] = PACKED_PRECISION[metric]
+        block = encode_block(history_to_records(history, fields), precision)
+        return Response(block, mimetype='application/octet-stream',
+                        headers={'X-History-Resolution': resolution})
+    
+    if time_format == 'epoch':
+        timestamps_out = history['timestamps'].tolist()
+    else:
+        timestamps_out = _iso_timestamps(history['timestamps'])
+    
+    response = {
+        'timestamps': timestamps_out,
+        'temperatures': _to_json_floats(history['temperatures']),
+        'pressures': _to_json_floats(history['pressures']),
+        'boiling_points': _to_json_floats(history['boiling_points']),
+        'resolution': resolution
+    }
+    if resolution != 'raw':
+        for name in ('temperatures', 'pressures', 'boiling_points'):
+            response[f'{name}_min'] = _to_json_floats(history[f'{name}_min'])
+            response[f'{name}_max'] = _to_json_floats(history[f'{name}_max'])
+        response['counts'] = history['count'].astype(np.int64).tolist()
+    return jsonify(response)
+
+@device_route('/history/aggregate')
+def get_history_aggregate(device):
+    """Per-bucket mean/min/max/count from the SQLite history (?bucket= seconds, ?from=&to=)"""
+    if history_db is None:
+        return jsonify({'error': 'History database not enabled (set HISTORY_DB)'}), 404
     try:
-        # Convert timestamps to strings for JSON serialization
-        timestamps_str = [ts.isoformat() for ts in data_history['timestamps']]
-        
-        return jsonify({
-            'timestamps': timestamps_str,
-            'temperatures': data_history['temperatures'],
-            'pressures': data_history['pressures'],
-            'boiling_points': data_history['boiling_points']
-        })
+        start = _parse_time_arg('from')
+        end = _parse_time_arg('to')
+    except ValueError as e:
+        return jsonify({'error': f'Invalid time range: {e}'}), 400
+    bucket = request.args.get('bucket', 60, type=float)
+    if bucket <= 0:
+        return jsonify({'error': 'bucket must be positive'}), 400
+    try:
+        data = history_db.aggregate(device.device_id, bucket, start, end)
+        response = {'timestamps': data.pop('timestamps').tolist(), 'bucket': bucket}
+        response['counts'] = data.pop('count').astype(np.int64).tolist()
+        response.update({name: _to_json_floats(values) for name, values in data.items()})
+        return jsonify(response)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@device_route('/alarms/history')
+def get_alarm_history(device):
+    """Stored alarms from the SQLite history, newest first (?from=&to=&limit=)"""
+    if history_db is None:
+        return jsonify({'error': 'History database not enabled (set HISTORY_DB)'}), 404
+    try:
+        start = _parse_time_arg('from')
+        end = _parse_time_arg('to')
+    except ValueError as e:
+        return jsonify({'error': f'Invalid time range: {e}'}), 400
+    try:
+        alarms = history_db.alarms(device.device_id, start, end, limit=request.args.get('limit', 100, type=int))
+        return jsonify({'alarms': alarms, 'count': len(alarms)})
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+EXPORT_CHUNK_SIZE = 5000  # Readings per streamed chunk
+
+def _export_readings(device, start, end):
+    """(count, chunk generator, has_heating) over the active history backend"""
+    if history_db is not None:
+        history_db.flush()  # Include readings still waiting for their batch commit
+        return (history_db.count_readings(device.device_id, start, end),
+                history_db.iter_readings(device.device_id, start, end, EXPORT_CHUNK_SIZE), True)
+    history_store = device.history_store
+    if history_store is not None:
+        chunks = (_records_to_history(records, heating=True)
+                  for records in history_store.iter_range(start, end, EXPORT_CHUNK_SIZE))
+        return history_store.count_range(start, end), chunks, True
+    window = device.data_history.range(start, end)  # Copied under the buffer's lock, bounded by its capacity
+    count = len(window['timestamps'])
+    chunks = ({name: values[i:i + EXPORT_CHUNK_SIZE] for name, values in window.items()}
+              for i in range(0, count, EXPORT_CHUNK_SIZE))
+    return count, chunks, False
+
+def _export_alarms(device, start, end):
+    if history_db is not None:
+        return history_db.iter_alarms(device.device_id, start, end)
+    alarm_manager = device.alarm_manager
+    alarms = list(alarm_manager.active_alarms.values()) if alarm_manager else []
+    return sorted((alarm for alarm in alarms
+                   if (start is None or alarm['timestamp'] >= start) and (end is None or alarm['timestamp'] <= end)),
+                  key=lambda alarm: alarm['timestamp'])
+
+@device_route('/export')
+def export_history(device):
+    """Streams readings and alarms (?from=&to=, ?format=csv|ndjson|npz, ?include=readings,alarms)"""
+    export_format = request.args.get('format', 'csv')
+    if export_format not in EXPORT_FORMATS:
+        return jsonify({'error': f"format must be one of {', '.join(EXPORT_FORMATS)}"}), 400
+    try:
+        start = _parse_time_arg('from')
+        end = _parse_time_arg('to')
+    except ValueError as e:
+        return jsonify({'error': f'Invalid time range: {e}'}), 400
+    include = set(request.args.get('include', 'readings,alarms').split(','))
+    if end is None:
+        end = get_clock().time()  # Freeze the range so counts and streamed rows agree
+    
+    count, chunks, has_heating = _export_readings(device, start, end) if 'readings' in include else (0, iter(()), True)
+    columns = reading_columns(has_heating)
+    alarms = _export_alarms(device, start, end) if 'alarms' in include else ()
+    
+    if export_format == 'csv':
+        # CSV holds one table: readings, or alarms when only alarms were requested
+        body = alarms_csv_stream(alarms) if include == {'alarms'} else csv_stream(chunks, columns)
+    elif export_format == 'ndjson':
+        body = ndjson_stream(chunks, columns, alarms)
+    else:
+        body = npz_stream(count, chunks, columns, list(alarms))
+    
+    mimetype, extension = EXPORT_FORMATS[export_format]
+    return Response(stream_with_context(body), mimetype=mimetype, headers={
+        'Content-Disposition': f'attachment; filename="{device.device_id}_history.{extension}"',
+        'X-Export-Readings': str(count) if 'readings' in include else '0',
+    })
+
 @app.route('/api/chart_data')
 def get_chart_data():
     """API endpoint for chart data"""
@@ -231,14 +815,15 @@ def get_chart_data():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
-@app.route('/api/control/heating', methods=['POST'])
-def control_heating():
+@device_route('/control/heating', methods=['POST'])
+def control_heating(device):
     """API endpoint for controlling heating element"""
     try:
         data = request.get_json()
         heating_state = data.get('heating', False)
         
-        temperature_sensor.set_heating(heating_state)
+        device.temperature_sensor.set_heating(heating_state)
+        _publish_status(device)
         
         return jsonify({
             'success': True,
@@ -248,14 +833,15 @@ def control_heating():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
-@app.route('/api/control/target_temperature', methods=['POST'])
-def set_target_temperature():
+@device_route('/control/target_temperature', methods=['POST'])
+def set_target_temperature(device):
     """API endpoint for setting target temperature"""
     try:
         data = request.get_json()
         target_temp = float(data.get('temperature', 100.0))
         
-        temperature_sensor.set_target_temperature(target_temp)
+        device.temperature_sensor.set_target_temperature(target_temp)
+        _publish_status(device)
         
         return jsonify({
             'success': True,
@@ -265,8 +851,8 @@ def set_target_temperature():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
-@app.route('/api/control/altitude', methods=['POST'])
-def set_altitude():
+@device_route('/control/altitude', methods=['POST'])
+def set_altitude(device):
     """API endpoint for setting altitude/location"""
     try:
         data = request.get_json()
@@ -277,7 +863,8 @@ def set_altitude():
             altitude = ALTITUDE_PRESETS[preset]
         
         if altitude is not None:
-            pressure_sensor.set_altitude(float(altitude))
+            device.pressure_sensor.set_altitude(float(altitude))
+            _publish_status(device)
             
             return jsonify({
                 'success': True,
@@ -291,12 +878,18 @@ def set_altitude():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
-@app.route('/api/alarms')
-def get_alarms():
+def _alarm_status_body(device):
+    manager = device.alarm_manager
+    return device.alarm_status_cache.encode((manager, manager.version))
+
+def _alarm_status_response(device):
+    return Response(_alarm_status_body(device), mimetype='application/json')
+
+@device_route('/alarms')
+def get_alarms(device):
     """API endpoint for alarm status"""
     try:
-        status = alarm_manager.get_status()
-        return jsonify(status)
+        return _conditional(_etag(device.alarm_manager.version), lambda: _alarm_status_response(device))
     except Exception as e:
         return jsonify({
             'error': str(e),
@@ -306,9 +899,10 @@ def get_alarms():
             'active_alarms': []
         }), 500
 
-@app.route('/api/alarms/configure', methods=['POST'])
-def configure_alarms():
+@device_route('/alarms/configure', methods=['POST'])
+def configure_alarms(device):
     """API endpoint for configuring alarms with NEW EXCLUSIVE LOGIC"""
+    alarm_manager = device.alarm_manager
     try:
         data = request.get_json()
         if not data:
@@ -341,6 +935,7 @@ def configure_alarms():
             return jsonify({'error': f'Invalid alarm mode: {alarm_mode}'}), 400
         
         if success:
+            _publish_status(device)
             return jsonify({
                 'success': True,
                 'message': f'Alarm configured: {alarm_mode}',
@@ -356,25 +951,59 @@ def configure_alarms():
 
 # Alarm acknowledgment removed - new system uses automatic alarms
 
-@app.route('/api/alarms/clear', methods=['POST'])
-def clear_alarms():
+@device_route('/alarms/clear', methods=['POST'])
+def clear_alarms(device):
     """API endpoint for clearing all alarms"""
     try:
-        alarm_manager.clear_all_alarms()
+        device.alarm_manager.clear_all_alarms()
+        _publish_status(device)
         return jsonify({
             'success': True,
             'message': 'All alarms cleared',
-            'status': alarm_manager.get_status()
+            'status': device.alarm_manager.get_status()
         })
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
-@app.route('/api/system/status')
-def system_status():
-    """API endpoint for system status"""
+@device_route('/storage/status')
+def storage_status(device):
+    """Memory and disk usage of the history stores, plus retention/compaction state"""
+    data_history, history_store = device.data_history, device.history_store
     try:
-        mqtt_status = mqtt_client.get_connection_status() if mqtt_client else {'connected': False}
+        tiers = {}
+        for tier in device.history_rollups.tiers:
+            tiers[tier.label] = {
+                'buckets': len(tier.buffer),
+                'capacity': tier.buffer.capacity,
+                'memory_bytes': tier.buffer.nbytes,
+                'disk': tier.store.stats() if tier.store is not None else None,
+            }
+        segments = history_store.stats() if history_store is not None else None
+        database = history_db.stats() if history_db is not None else None
+        disk_bytes = sum(tier['disk']['disk_bytes'] for tier in tiers.values() if tier['disk'])
+        disk_bytes += (segments['disk_bytes'] if segments else 0) + (database['disk_bytes'] if database else 0)
         return jsonify({
+            'ring_buffer': {
+                'shared_memory': Config.HISTORY_SHARED_MEMORY,
+                'role': ('reader' if HISTORY_READER else 'collector') if Config.HISTORY_SHARED_MEMORY else None,
+                'samples': len(data_history),
+                'capacity': data_history.capacity,
+                'memory_bytes': data_history.nbytes,
+            },
+            'rollups': tiers,
+            'segment_store': segments,
+            'database': database,
+            'memory_bytes': data_history.nbytes + sum(tier['memory_bytes'] for tier in tiers.values()),
+            'disk_bytes': disk_bytes,
+            'compaction': history_compactor.status(),
+        })
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+def _system_status(device):
+    temperature_sensor, pressure_sensor = device.temperature_sensor, device.pressure_sensor
+    mqtt_status = mqtt_client.get_connection_status() if mqtt_client else {'connected': False}
+    return {
         'sensors': {
             'temperature': {
                 'active': hasattr(temperature_sensor, 'running') and temperature_sensor.running,
@@ -390,8 +1019,27 @@ def system_status():
         },
         'mqtt': mqtt_status,
         'data_collection': data_collection_active,
-        'data_points': len(data_history['timestamps'])
-    })
+        'data_points': len(device.data_history),
+        'stream': device.events.stats()
+    }
+
+def _system_status_version(device):
+    """Sensor state moves with collector ticks, controls bump status_version; MQTT and stream state are counted directly"""
+    snapshot = device.latest_snapshot
+    return (snapshot.seq if snapshot else 0, len(device.data_history), device.status_version,
+            int(mqtt_client.is_connected) if mqtt_client else 0,
+            len(mqtt_client.message_queue) if mqtt_client else 0,
+            len(device.events), device.events.published)
+
+def _system_status_body(device):
+    return device.system_status_cache.encode(_system_status_version(device))
+
+@device_route('/system/status')
+def system_status(device):
+    """API endpoint for system status"""
+    try:
+        return _conditional(_etag(*_system_status_version(device)), lambda: Response(
+            _system_status_body(device), mimetype='application/json'))
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -402,17 +1050,16 @@ def debug_alarms():
         return jsonify({
             'message': 'Debug alarm route working',
             'timestamp': time.time(),
-            'alarm_manager_exists': alarm_manager is not None
+            'alarm_manager_exists': devices.default.alarm_manager is not None
         })
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
-@app.route('/api/alarms/status')
-def get_alarm_status():
+@device_route('/alarms/status')
+def get_alarm_status(device):
     """API endpoint for alarm status - specific endpoint"""
     try:
-        status = alarm_manager.get_status()
-        return jsonify(status)
+        return _conditional(_etag(device.alarm_manager.version), lambda: _alarm_status_response(device))
     except Exception as e:
         return jsonify({
             'error': str(e),
@@ -422,10 +1069,60 @@ def get_alarm_status():
             'active_alarms': []
         }), 500
 
+def _snapshot_seq(device):
+    snapshot = device.latest_snapshot
+    return (snapshot.seq if snapshot else 0,)
+
+def _snapshot_body(device):
+    snapshot = device.latest_snapshot
+    return snapshot.body if snapshot else b'null'
+
+# /api/dashboard sections: versions of the device state behind it (a tuple), and its encoded JSON (bytes)
+DASHBOARD_SECTIONS = {
+    'sensor_data': (_snapshot_seq, _snapshot_body),
+    'alarms': (lambda device: (device.alarm_manager.version,), _alarm_status_body),
+    'system_status': (_system_status_version, _system_status_body),
+}
+DASHBOARD_ATTEMPTS = 3  # Rebuilds when the collector or a control changes state mid-build
+
+@device_route('/dashboard')
+def get_dashboard(device):
+    """
+    Sensor data, alarm status and system status in one response, e.g.
+    ?fields=sensor_data,alarms (default: all). The sections are built from
+    one consistent state: if any version changes while building, the
+    response is rebuilt. Every section is already-encoded JSON (the
+    snapshot's body, the status caches), spliced in as-is.
+    """
+    try:
+        fields = request.args.get('fields')
+        names = [name.strip() for name in fields.split(',') if name.strip()] if fields else list(DASHBOARD_SECTIONS)
+        unknown = [name for name in names if name not in DASHBOARD_SECTIONS]
+        if unknown:
+            return jsonify({'error': f"Unknown fields: {', '.join(unknown)}",
+                            'fields': list(DASHBOARD_SECTIONS)}), 400
+
+        def versions():
+            return sum((DASHBOARD_SECTIONS[name][0](device) for name in names), ())
+
+        def build():
+            for _ in range(DASHBOARD_ATTEMPTS):
+                before = versions()
+                body = json_object({name: DASHBOARD_SECTIONS[name][1](device) for name in names})
+                if versions() == before:
+                    break
+            return Response(body, mimetype='application/json')
+
+        etag = _etag(*names, *versions())
+        return _conditional(etag, build)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/api/system/start', methods=['POST'])
 def start_system():
-    """API endpoint to start the system"""
+    """API endpoint to start the system (collection for every device, heating on the default one)"""
     global data_collection_active
+    temperature_sensor = devices.default.temperature_sensor
     try:
         data_collection_active = True
         
@@ -437,6 +1134,8 @@ def start_system():
             print("🔥 Sistema e aquecimento ativados - simulando cozimento")
         
         print("🚀 Sistema iniciado via API")
+        for device in devices:
+            _publish_status(device)  # data_collection changed for all of them
         
         return jsonify({
             'status': 'success',
@@ -450,8 +1149,9 @@ def start_system():
 
 @app.route('/api/system/stop', methods=['POST'])
 def stop_system():
-    """API endpoint to stop the system"""
+    """API endpoint to stop the system (collection for every device, heating on the default one)"""
     global data_collection_active
+    temperature_sensor = devices.default.temperature_sensor
     try:
         data_collection_active = False
         
@@ -461,6 +1161,8 @@ def stop_system():
             print("❄️ Aquecimento desativado")
         
         print("⏹️ Sistema parado via API")
+        for device in devices:
+            _publish_status(device)
         
         return jsonify({
             'status': 'success',
@@ -491,23 +1193,25 @@ def stop_data_collection():
         data_collection_thread.join(timeout=5)
     print("Data collection stopped")
 
-@app.route('/api/debug/force_alarm_check', methods=['POST'])
-def force_alarm_check():
+@device_route('/debug/force_alarm_check', methods=['POST'])
+def force_alarm_check(device):
     """Force manual alarm check for debugging"""
-    try:        # Get current sensor data
-        pressure_data = pressure_sensor.get_sensor_data()
-        current_pressure = pressure_data.get('pressure', 1.0) if pressure_data else 1.0
-        temp_data = temperature_sensor.get_data(current_pressure)
-        boiling_point = calculate_boiling_point(current_pressure)
+    alarm_manager = device.alarm_manager
+    try:
+        # Re-check the readings of the last collector tick (no extra sensor read)
+        snapshot = device.latest_snapshot
+        if snapshot is None:
+            return jsonify({'error': 'No reading collected yet'}), 503
         
         # Force alarm check
-        triggered_alarms = alarm_manager.check_alarms(temp_data, pressure_data, boiling_point)
+        triggered_alarms = alarm_manager.check_alarms(snapshot.temp_data, snapshot.pressure_data,
+                                                      snapshot.boiling_point)
         
         return jsonify({
             'success': True,
             'message': 'Manual alarm check completed',
-            'temperature': temp_data.get('temperature') if temp_data else None,
-            'boiling_point': boiling_point,
+            'temperature': snapshot.temperature,
+            'boiling_point': snapshot.boiling_point,
             'triggered_alarms': len(triggered_alarms),
             'alarm_config': alarm_manager.current_alarm_config,
             'data_collection_active': data_collection_active
@@ -515,9 +1219,10 @@ def force_alarm_check():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
-@app.route('/api/debug/test_alarm_system', methods=['POST'])
-def test_alarm_system():
+@device_route('/debug/test_alarm_system', methods=['POST'])
+def test_alarm_system(device):
     """Testa todo o sistema de alarmes passo a passo"""
+    alarm_manager = device.alarm_manager
     try:
         results = []
         
@@ -542,7 +1247,7 @@ def test_alarm_system():
             
         # Passo 4: Simular temperatura alta para disparar alarme
         simulated_temp_data = {'temperature': 80.0}  # Acima do threshold de 50°C
-        pressure_data = pressure_sensor.get_sensor_data()
+        pressure_data = device.pressure_sensor.get_sensor_data()
         boiling_point = calculate_boiling_point(pressure_data.get('pressure', 1.0) if pressure_data else 1.0)
         
         triggered_alarms = alarm_manager.check_alarms(simulated_temp_data, pressure_data, boiling_point)
@@ -565,20 +1270,21 @@ def test_alarm_system():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
-import importlib
 def reload_sensor_module():
-    """Force reload of sensor modules for development"""
-    global temperature_sensor
+    """Force reload of sensor modules for development (default device)"""
     try:
         # Reimport the module
         from importlib import reload
-        import sys
-        if 'simple_temperature_sensor_precision' in sys.modules:
-            reload(sys.modules['simple_temperature_sensor_precision'])
+        module = reload(sys.modules[create_temperature_sensor.__module__])
         
-        # Recreate sensor instance
-        from simple_temperature_sensor_precision import PrecisionTemperatureSensor
-        temperature_sensor = PrecisionTemperatureSensor()
+        # Recreate the sensor as initialize_systems does (engine and seed from the config)
+        device = devices.default
+        previous = device.temperature_sensor
+        if previous is not None:
+            previous.stop_simulation()
+        device.temperature_sensor = module.create_temperature_sensor(Config.TEMPERATURE_ENGINE,
+                                                                     seed=Config.SIMULATION_SEED)
+        _publish_status(device)  # New sensor: a new status version
         logger.info("Sensor module reloaded successfully")
         return True
     except Exception as e:
@@ -599,35 +1305,30 @@ def reload_sensor():
 @app.route('/api/debug/system_full_status')
 def debug_system_full_status():
     """Debug completo do estado do sistema"""
+    device = devices.default
+    alarm_manager = device.alarm_manager
     try:
         status = {
             'timestamp': datetime.now().isoformat(),
             'data_collection_active': data_collection_active,
             'sensors': {
-                'temperature_sensor_exists': temperature_sensor is not None,
-                'pressure_sensor_exists': pressure_sensor is not None,
+                'temperature_sensor_exists': device.temperature_sensor is not None,
+                'pressure_sensor_exists': device.pressure_sensor is not None,
             },
             'alarm_manager': {
                 'exists': alarm_manager is not None,
                 'is_monitoring': alarm_manager.is_monitoring if alarm_manager else False,
                 'config': alarm_manager.current_alarm_config if alarm_manager else None,
                 'active_alarms': len(alarm_manager.active_alarms) if alarm_manager else 0
-            }
+            },
+            'devices': devices.ids(),
+            'compression': response_compressor.stats()
         }
         
-        if temperature_sensor and pressure_sensor:
-            try:
-                pressure_data = pressure_sensor.get_sensor_data()
-                temp_data = temperature_sensor.get_data(pressure_data.get('pressure', 1.0) if pressure_data else 1.0)
-                boiling_point = calculate_boiling_point(pressure_data.get('pressure', 1.0) if pressure_data else 1.0)
-                
-                status['current_readings'] = {
-                    'temperature': temp_data.get('temperature') if temp_data else None,
-                    'pressure': pressure_data.get('pressure') if pressure_data else None,
-                    'boiling_point': boiling_point
-                }
-            except Exception as e:
-                status['sensor_error'] = str(e)
+        snapshot = device.latest_snapshot
+        if snapshot is not None:
+            status['current_readings'] = snapshot.readings()
+            status['current_readings']['collected_at'] = datetime.fromtimestamp(snapshot.timestamp).isoformat()
         
         return jsonify(status)
     except Exception as e:
@@ -636,8 +1337,9 @@ def debug_system_full_status():
 # Auto-initialize systems when module is imported (for development/testing)
 def ensure_systems_initialized():
     """Ensure systems are initialized, call if needed"""
-    global temperature_sensor, pressure_sensor, mqtt_client, alarm_manager
-    if temperature_sensor is None or pressure_sensor is None:
+    if HISTORY_READER:
+        return  # The collector process owns the sensors
+    if any(device.temperature_sensor is None or device.pressure_sensor is None for device in devices):
         logger.info("Auto-initializing systems...")
         initialize_systems()
 
@@ -649,11 +1351,12 @@ except Exception as e:
 
 if __name__ == '__main__':
     try:
-        # Initialize systems
-        initialize_systems()
-        
-        # Start data collection
-        start_data_collection()
+        if not HISTORY_READER:
+            # Initialize systems
+            initialize_systems()
+            
+            # Start data collection
+            start_data_collection()
         
         # Run Flask app
         print(f"Starting web dashboard on {Config.WEB_HOST}:{Config.WEB_PORT}")
@@ -664,7 +1367,8 @@ if __name__ == '__main__':
     finally:
         # Cleanup
         stop_data_collection()
-        if alarm_manager:
-            alarm_manager.stop_monitoring()
+        for device in devices:
+            if device.alarm_manager:
+                device.alarm_manager.stop_monitoring()
         if mqtt_client:
             mqtt_client.disconnect()
@@ -0,0 +1,226 @@
+"""
+Minimal RFC 6455 WebSocket support, standard library only
+Handshake, frame encoding and an incremental frame parser shared by the threaded and asyncio servers
+"""
+import base64
+import hashlib
+import socket
+import struct
+import threading
+
+GUID = '258EAFA5-E914-47DA-95CA-C5AB0DC85B11'
+
+OP_CONTINUATION = 0x0
+OP_TEXT = 0x1
+OP_BINARY = 0x2
+OP_CLOSE = 0x8
+OP_PING = 0x9
+OP_PONG = 0xA
+
+CLOSE_NORMAL = 1000
+CLOSE_PROTOCOL_ERROR = 1002
+CLOSE_TOO_BIG = 1009
+
+MAX_MESSAGE_SIZE = 1 << 20
+
+
+class WebSocketError(Exception):
+    """Protocol violation by the peer; carries the close code to answer with"""
+
+    def __init__(self, message, code=CLOSE_PROTOCOL_ERROR):
+        super().__init__(message)
+        self.code = code
+
+
+def accept_key(key):
+    """Sec-WebSocket-Accept value for a client's Sec-WebSocket-Key"""
+    return base64.b64encode(hashlib.sha1((key + GUID).encode()).digest()).decode()
+
+def is_upgrade_request(headers):
+    """True for a WebSocket handshake (headers: any case-insensitive mapping)"""
+    return headers.get('Upgrade', '').lower() == 'websocket' and bool(headers.get('Sec-WebSocket-Key'))
+
+def handshake_response(key):
+    return ("HTTP/1.1 101 Switching Protocols\r\n"
+            "Upgrade: websocket\r\n"
+            "Connection: Upgrade\r\n"
+            f"Sec-WebSocket-Accept: {accept_key(key)}\r\n\r\n").encode()
+
+def encode_frame(payload, opcode=None):
+    """One unfragmented, unmasked (server-to-client) frame; str payloads are sent as text"""
+    if isinstance(payload, str):
+        payload = payload.encode()
+        opcode = OP_TEXT if opcode is None else opcode
+    elif opcode is None:
+        opcode = OP_BINARY
+    length = len(payload)
+    if length < 126:
+        header = struct.pack('!BB', 0x80 | opcode, length)
+    elif length < 1 << 16:
+        header = struct.pack('!BBH', 0x80 | opcode, 126, length)
+    else:
+        header = struct.pack('!BBQ', 0x80 | opcode, 127, length)
+    return header + payload
+
+def close_frame(code=CLOSE_NORMAL, reason=''):
+    return encode_frame(struct.pack('!H', code) + reason.encode(), OP_CLOSE)
+
+
+class FrameParser:
+    """
+    Incremental parser: feed() raw bytes as they arrive and get back complete
+    messages as (opcode, payload) pairs. Unmasks client frames, reassembles
+    fragmented messages and passes control frames (close/ping/pong) through
+    as they come, even in the middle of a fragmented message.
+    """
+
+    def __init__(self, max_size=MAX_MESSAGE_SIZE):
+        self.max_size = max_size
+        self._buffer = bytearray()
+        self._fragments = None  # (opcode, bytearray) of a message in progress
+
+    def feed(self, data):
+        self._buffer.extend(data)
+        messages = []
+        while True:
+            frame = self._next_frame()
+            if frame is None:
+                return messages
+            fin, opcode, payload = frame
+            if opcode >= OP_CLOSE:
+                if not fin or len(payload) > 125:
+                    raise WebSocketError("Invalid control frame")
+                messages.append((opcode, payload))
+            elif opcode == OP_CONTINUATION:
+                if self._fragments is None:
+                    raise WebSocketError("Continuation without a message")
+                self._fragments[1].extend(payload)
+                if len(self._fragments[1]) > self.max_size:
+                    raise WebSocketError("Message too big", CLOSE_TOO_BIG)
+                if fin:
+                    messages.append((self._fragments[0], bytes(self._fragments[1])))
+                    self._fragments = None
+            elif opcode in (OP_TEXT, OP_BINARY):
+                if self._fragments is not None:
+                    raise WebSocketError("New message before the previous one ended")
+                if fin:
+                    messages.append((opcode, payload))
+                else:
+                    self._fragments = (opcode, bytearray(payload))
+            else:
+                raise WebSocketError(f"Unknown opcode {opcode}")
+
+    def _next_frame(self):
+        buffer = self._buffer
+        if len(buffer) < 2:
+            return None
+        first, second = buffer[0], buffer[1]
+        offset = 2
+        length = second & 0x7F
+        if length == 126:
+            if len(buffer) < 4:
+                return None
+            length = struct.unpack_from('!H', buffer, 2)[0]
+            offset = 4
+        elif length == 127:
+            if len(buffer) < 10:
+                return None
+            length = struct.unpack_from('!Q', buffer, 2)[0]
+            offset = 10
+        if length > self.max_size:
+            raise WebSocketError("Message too big", CLOSE_TOO_BIG)
+        masked = second & 0x80
+        mask_end = offset + (4 if masked else 0)
+        if len(buffer) < mask_end + length:
+            return None
+        payload = bytes(buffer[mask_end:mask_end + length])
+        if masked:
+            mask = int.from_bytes(buffer[offset:mask_end] * ((length + 3) // 4), 'big') >> (8 * (-length % 4))
+            payload = (int.from_bytes(payload, 'big') ^ mask).to_bytes(length, 'big') if length else b''
+        del buffer[:mask_end + length]
+        return bool(first & 0x80), first & 0x0F, payload
+
+
+class WebSocket:
+    """
+    Blocking server-side connection over an already upgraded socket. send()
+    may be called from several threads; receive() from one reader thread.
+    """
+
+    def __init__(self, sock, max_size=MAX_MESSAGE_SIZE):
+        self.sock = sock
+        self.closed = False
+        self._parser = FrameParser(max_size)
+        self._pending = []
+        self._send_lock = threading.Lock()
+
+    def send(self, message, opcode=None):
+        self._send_raw(encode_frame(message, opcode))
+
+    def _send_raw(self, data):
+        with self._send_lock:
+            if self.closed:
+                raise ConnectionError("WebSocket closed")
+            self.sock.sendall(data)
+
+    def ping(self, payload=b''):
+        self.send(payload, OP_PING)
+
+    def receive(self):
+        """Next text (str) or binary (bytes) message; None once the connection is closed"""
+        while not self.closed:
+            if not self._pending:
+                try:
+                    data = self.sock.recv(65536)
+                except OSError:
+                    data = b''
+                if not data:
+                    self._shutdown()
+                    return None
+                try:
+                    self._pending.extend(self._parser.feed(data))
+                except WebSocketError as e:
+                    self.close(e.code, str(e))
+                    return None
+                continue
+            opcode, payload = self._pending.pop(0)
+            if opcode == OP_TEXT:
+                return payload.decode('utf-8', errors='replace')
+            if opcode == OP_BINARY:
+                return payload
+            if opcode == OP_PING:
+                try:
+                    self.send(payload, OP_PONG)
+                except OSError:
+                    pass
+            elif opcode == OP_CLOSE:
+                code = struct.unpack('!H', payload[:2])[0] if len(payload) >= 2 else CLOSE_NORMAL
+                self.close(code)
+                return None
+        return None
+
+    def close(self, code=CLOSE_NORMAL, reason=''):
+        with self._send_lock:
+            if self.closed:
+                return
+            try:
+                self.sock.sendall(close_frame(code, reason[:100]))
+            except OSError:
+                pass
+            self.closed = True
+        self._shutdown()
+
+    def _shutdown(self):
+        self.closed = True
+        try:
+            # Shut down rather than close: the HTTP server still owns the socket object
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+
+if __name__ == "__main__":
+    assert accept_key('dGhlIHNhbXBsZSBub25jZQ==') == 's3pPLMBiTxaQ9kYGzzhZRbK+xOo='  # RFC 6455 example
+    client_frame = bytes([0x81, 0x85, 0x37, 0xfa, 0x21, 0x3d, 0x7f, 0x9f, 0x4d, 0x51, 0x58])  # Masked "Hello"
+    parser = FrameParser()
+    print(parser.feed(client_frame[:4]), parser.feed(client_frame[4:]))
+    print(encode_frame('Hello'))
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Teste do motor analítico de temperatura (sem thread)
+"""
+import sys
+sys.path.insert(0, 'src')
+
+from clock import VirtualClock
+from simple_temperature_sensor_precision import AnalyticTemperatureSensor
+
+def euler_heating(temp, seconds, sensor, dt=0.01):
+    """Integração de referência do modelo de _simulate_heating, sem ruído"""
+    for _ in range(int(seconds / dt)):
+        temp_ratio = (temp - sensor.ambient_temp) / (sensor.max_temp - sensor.ambient_temp)
+        temp = min(sensor.max_temp, temp + sensor.heating_rate * (1 - temp_ratio * 0.7) * dt)
+    return temp
+
+def test_analytic_temperature():
+    print("🔍 Testando motor analítico de temperatura...")
+
+    clock = VirtualClock(speed=None, start_time=0.0)
+    sensor = AnalyticTemperatureSensor(clock)
+    assert sensor.simulation_thread is None
+
+    sensor.set_heating(True)
+    clock.advance(60)
+    expected = euler_heating(20.0, 60, sensor)
+    print(f"🌡️ Após 60s: {sensor.get_temperature()}°C (Euler: {expected:.1f}°C)")
+    assert abs(sensor.temperature - expected) < 0.1
+
+    # Mudança de potência no meio do aquecimento
+    sensor.set_heating_power(2.0)
+    clock.advance(30)
+    expected = euler_heating(expected, 30, sensor)
+    assert abs(sensor.temperature - expected) < 0.1
+
+    clock.advance(3600)
+    assert sensor.get_temperature() == sensor.max_temp
+
+    # Resfriamento nunca passa da temperatura ambiente
+    sensor.set_heating(False)
+    clock.advance(60)
+    assert sensor.ambient_temp < sensor.temperature < sensor.max_temp
+    clock.advance(36000)
+    assert sensor.get_temperature() == sensor.ambient_temp
+
+    sensor.reset_temperature(50.0)
+    assert sensor.get_temperature() == 50.0
+    print("✅ Motor analítico funcionando!")
+
+if __name__ == "__main__":
+    test_analytic_temperature()
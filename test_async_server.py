@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Teste do modo de servidor asyncio (rotas ao vivo no event loop, demais via Flask)
+"""
+import io
+import time
+import socket
+import numpy as np
+
+def request(sock, path, headers=''):
+    sock.sendall(f"GET {path} HTTP/1.1\r\nHost: teste\r\n{headers}\r\n".encode())
+    data = b''
+    while b'\r\n\r\n' not in data:
+        data += sock.recv(65536)
+    head, body = data.split(b'\r\n\r\n', 1)
+    head = head.decode()
+    length = int(head.split('Content-Length: ')[1].split('\r\n')[0]) if 'Content-Length' in head else 0
+    while len(body) < length:
+        body += sock.recv(65536)
+    return head, body
+
+def test_async_server_routes():
+    print("🔍 Testando servidor asyncio...")
+    from src import web_app
+    from src.async_server import start_in_thread
+    server = start_in_thread()
+    web_app._publish_snapshot(web_app.devices.default, 3000.0, {'temperature': 77.0}, {'pressure': 1.0}, 100.0)
+
+    # Várias requisições na mesma conexão (keep-alive)
+    sock = socket.create_connection(server.address, timeout=5)
+    head, body = request(sock, '/api/sensor_data')
+    assert head.startswith('HTTP/1.1 200') and body == web_app.devices.default.latest_snapshot.body
+    etag = head.split('ETag: ')[1].split('\r\n')[0]
+    assert request(sock, '/api/sensor_data', f'If-None-Match: {etag}\r\n')[0].startswith('HTTP/1.1 304')
+    # Rota servida pelo Flask no pool de threads: mesma resposta do modo threaded
+    head, body = request(sock, '/api/alarms/status')
+    assert head.startswith('HTTP/1.1 200') and b'"alarm_mode"' in body
+    sock.close()
+
+    # SSE: cada cliente é uma corrotina, não uma thread
+    stream = socket.create_connection(server.address, timeout=5)
+    stream.sendall(b"GET /api/stream HTTP/1.1\r\nHost: teste\r\n\r\n")
+    received = b''
+    while b'event: status' not in received:
+        received += stream.recv(65536)
+    web_app._publish_snapshot(web_app.devices.default, 3003.0, {'temperature': 78.5}, {'pressure': 1.0}, 100.0)
+    deadline = time.time() + 5
+    while b'78.5' not in received and time.time() < deadline:
+        received += stream.recv(65536)
+    assert b'id: %d\nevent: reading' % web_app.devices.default.latest_snapshot.seq in received
+    assert server.stats()['stream']['subscribers'] == 1
+    stream.close()
+    print("✅ Servidor asyncio funcionando!")
+
+def test_async_server_streamed_export():
+    print("🔍 Testando exportação transmitida pelo servidor asyncio...")
+    from src import web_app
+    from src.async_server import start_in_thread
+    from src.ring_buffer import TimeSeriesRingBuffer
+    server = start_in_thread()
+    device = web_app.devices.default
+    data_history, device.data_history = device.data_history, TimeSeriesRingBuffer(20000)
+    try:
+        for i in range(20000):
+            device.data_history.append(1000.0 + i * 3, temperatures=20.0 + i % 100, pressures=1.0,
+                                       boiling_points=100.0)
+        # O corpo é gerado em várias threads do pool: sem Content-Length, até o fim da conexão
+        for _ in range(3):
+            sock = socket.create_connection(server.address, timeout=10)
+            sock.sendall(b"GET /api/export?format=npz&include=readings HTTP/1.1\r\nHost: teste\r\n"
+                         b"Connection: close\r\n\r\n")
+            data = b''
+            while True:
+                chunk = sock.recv(65536)
+                if not chunk:
+                    break
+                data += chunk
+            sock.close()
+            head, body = data.split(b'\r\n\r\n', 1)
+            assert head.startswith(b'HTTP/1.1 200') and b'X-Export-Readings: 20000' in head
+            readings = np.load(io.BytesIO(body))['readings']
+            assert len(readings) == 20000 and readings['timestamp'][-1] == 1000.0 + 19999 * 3
+    finally:
+        device.data_history = data_history
+    print("✅ Exportação completa!")
+
+if __name__ == "__main__":
+    test_async_server_routes()
+    test_async_server_streamed_export()
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Teste do modelo barométrico ISA (altitude <-> pressão, troposfera e camada isotérmica)
+"""
+import numpy as np
+
+from src import barometric
+from src.barometric import altitude_to_pressure, pressure_to_altitude, altitudes_to_pressures, pressures_to_altitudes
+from src.pressure_sensor import PressureSensor
+
+def test_isa_reference_points():
+    print("🔍 Testando pontos de referência ISA...")
+    assert altitude_to_pressure(0) == 1.0
+    assert abs(altitude_to_pressure(1609) - 0.8234) < 1e-3  # Denver
+    assert abs(altitude_to_pressure(11000) - 0.2234) < 1e-3  # Tropopausa
+    assert abs(altitude_to_pressure(20000) - 0.0540) < 1e-3  # Topo da camada isotérmica
+
+    # Limites do modelo
+    assert altitude_to_pressure(25000) == altitude_to_pressure(barometric.MAX_ALTITUDE_M)
+    assert altitude_to_pressure(-2000) == altitude_to_pressure(barometric.MIN_ALTITUDE_M)
+    assert pressure_to_altitude(0) == barometric.MAX_ALTITUDE_M
+    print("✅ Pontos de referência corretos!")
+
+def test_round_trip():
+    print("🔍 Testando conversão ida e volta...")
+    altitudes = np.array([-610.0, 0.0, 1609.0, 5364.0, 10999.0, 11000.0, 11001.0, 15000.0, 20000.0])
+    for altitude in altitudes:
+        assert abs(pressure_to_altitude(altitude_to_pressure(altitude)) - altitude) < 1e-6
+
+    # Versões vetorizadas iguais às escalares
+    pressures = altitudes_to_pressures(altitudes)
+    assert np.allclose(pressures, [altitude_to_pressure(a) for a in altitudes])
+    assert np.allclose(pressures_to_altitudes(pressures), altitudes)
+    assert np.isnan(pressures_to_altitudes([np.nan]))[0]
+
+    # O sensor usa o mesmo modelo
+    sensor = PressureSensor("barometric_test", seed=1)
+    sensor.set_altitude(15000)
+    assert sensor.base_pressure == altitude_to_pressure(15000)
+    print("✅ Conversão ida e volta funcionando!")
+
+if __name__ == "__main__":
+    test_isa_reference_points()
+    test_round_trip()
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Teste do ponto de ebulição da água (equação de Antoine e tabela interpolada)
+"""
+import sys
+import numpy as np
+sys.path.insert(0, 'src')
+
+from boiling_point import antoine_boiling_point, antoine_boiling_points, BoilingPointTable
+from config import calculate_boiling_point, calculate_boiling_points
+
+def test_antoine_boiling_point():
+    print("🔍 Testando equação de Antoine...")
+    assert abs(antoine_boiling_point(1.0) - 100.0) < 0.05  # Nível do mar
+    assert abs(antoine_boiling_point(0.5) - 81.7) < 0.3  # ~5500 m
+    assert abs(antoine_boiling_point(2.0) - 120.2) < 0.5  # Panela de pressão
+    assert antoine_boiling_point(0.8) < antoine_boiling_point(0.9) < antoine_boiling_point(1.0)
+    assert antoine_boiling_point(0) == 0 and calculate_boiling_point(-1.0) == 0
+    assert calculate_boiling_point(0.837) == antoine_boiling_point(0.837)
+
+    pressures = np.array([0.0, 0.5, 1.0, 2.0])
+    expected = [0.0] + [antoine_boiling_point(p) for p in pressures[1:]]
+    assert np.allclose(calculate_boiling_points(pressures), expected)
+    assert np.allclose(antoine_boiling_points(pressures), expected)
+    print("✅ Antoine funcionando!")
+
+def test_boiling_point_table():
+    print("🔍 Testando tabela interpolada...")
+    table = BoilingPointTable()
+    pressures = np.linspace(0.06, 2.9, 1000)
+    exact = antoine_boiling_points(pressures)
+    assert np.abs(table.lookup_array(pressures) - exact).max() < 1e-3
+    assert all(abs(table.lookup(p) - antoine_boiling_point(p)) < 1e-3 for p in pressures[::50])
+
+    # Fora da tabela: avaliação direta
+    outside = np.array([0.01, 3.5])
+    assert np.allclose(table.lookup_array(outside), antoine_boiling_points(outside))
+    assert table.lookup(3.5) == antoine_boiling_point(3.5)
+    print("✅ Tabela funcionando!")
+
+if __name__ == "__main__":
+    test_antoine_boiling_point()
+    test_boiling_point_table()
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Teste do broadcaster de eventos (SSE) com filas limitadas por cliente
+"""
+import sys
+sys.path.insert(0, 'src')
+
+from broadcaster import Broadcaster
+
+def drain(subscription):
+    messages = []
+    while True:
+        message = subscription.get(timeout=0)
+        if message is None:
+            return messages
+        messages.append(message)
+
+def test_broadcaster_slow_clients():
+    print("🔍 Testando broadcaster de eventos...")
+    broadcaster = Broadcaster(queue_size=4)
+    fast = broadcaster.subscribe()
+    slow = broadcaster.subscribe()
+
+    broadcaster.publish('reading', b'{"temperature": 20.0}', event_id=1, coalesce_key='reading')
+    assert drain(fast) == ['id: 1\nevent: reading\ndata: {"temperature": 20.0}\n\n']
+
+    # Cliente lento: leituras pendentes são substituídas pela mais nova
+    delivered = 0
+    for i in range(2, 10):
+        broadcaster.publish('reading', {'temperature': 20.0 + i}, event_id=i, coalesce_key='reading')
+        delivered += len(drain(fast))
+    assert delivered == 8
+    pending = drain(slow)
+    assert len(pending) == 1 and 'id: 9\n' in pending[0]
+    assert slow.coalesced == 8
+
+    # Alarmes não são agrupados: com a fila cheia, os mais antigos são descartados e contados
+    for i in range(6):
+        broadcaster.publish('alarm', {'id': f'alarm_{i}'})
+    pending = drain(slow)
+    assert [m.split('"')[3] for m in pending] == ['alarm_2', 'alarm_3', 'alarm_4', 'alarm_5']
+    assert slow.take_dropped() == 2 and slow.take_dropped() == 0
+
+    broadcaster.unsubscribe(slow)
+    assert slow.closed and len(broadcaster) == 1
+    assert broadcaster.publish('status', {'heating': True}) == 1
+    print("✅ Broadcaster funcionando!")
+
+if __name__ == "__main__":
+    test_broadcaster_slow_clients()
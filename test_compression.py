@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Teste da compressão negociada das respostas (gzip/brotli, limite de tamanho, cache por ETag)
+"""
+import sys
+import gzip
+import json
+sys.path.insert(0, 'src')
+
+from compression import negotiate, compress
+
+def test_negotiate():
+    print("🔍 Testando negociação do Accept-Encoding...")
+    assert negotiate('gzip, deflate', ('br', 'gzip')) == 'gzip'
+    assert negotiate('gzip;q=0.5, br', ('br', 'gzip')) == 'br'
+    assert negotiate('br;q=0, gzip;q=0.1', ('br', 'gzip')) == 'gzip'
+    assert negotiate('*', ('br', 'gzip')) == 'br'
+    assert negotiate('gzip;q=0, identity', ('gzip',)) is None
+    assert negotiate(None) is None
+    assert gzip.decompress(compress(b'x' * 5000, 'gzip')) == b'x' * 5000
+    print("✅ Negociação funcionando!")
+
+def test_compressed_responses():
+    print("🔍 Testando compressão das respostas...")
+    from src import web_app
+    web_app.initialize_systems()
+    client = web_app.app.test_client()
+    history = web_app.devices.default.data_history
+    for i in range(300):
+        history.append(2000.0 + i * 3, temperatures=20.0 + i * 0.25, pressures=1.0, boiling_points=100.0)
+    gzip_only = {'Accept-Encoding': 'gzip'}
+
+    # Histórico grande: comprimido, ETag fraco, 304 com o ETag recebido
+    plain = client.get('/api/historical_data')
+    response = client.get('/api/historical_data', headers=gzip_only)
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in response.headers['Vary']
+    assert json.loads(gzip.decompress(response.data)) == plain.get_json()
+    assert len(response.data) < len(plain.data) / 3
+    etag = response.headers['ETag']
+    assert etag.startswith('W/"')
+    assert client.get('/api/historical_data', headers={**gzip_only, 'If-None-Match': etag}).status_code == 304
+
+    # Mesma versão: bytes comprimidos vêm do cache
+    stats = web_app.response_compressor.stats()
+    again = client.get('/api/historical_data', headers=gzip_only)
+    assert again.data == response.data
+    assert web_app.response_compressor.stats()['cache_hits'] == stats['cache_hits'] + 1
+
+    # Nova leitura: nova versão
+    history.append(2900.0, temperatures=95.0, pressures=1.0, boiling_points=100.0)
+    assert client.get('/api/historical_data', headers=gzip_only).headers['ETag'] != etag
+
+    # Abaixo do limite ou sem Accept-Encoding: sem compressão
+    web_app._publish_snapshot(web_app.devices.default, 3000.0, {'temperature': 20.0}, {'pressure': 1.0}, 100.0)
+    small = client.get('/api/sensor_data', headers=gzip_only)
+    assert 'Content-Encoding' not in small.headers and small.headers['ETag'].startswith('"')
+    assert 'Content-Encoding' not in plain.headers
+
+    # Exportação transmitida: comprimida em blocos, sem Content-Length
+    export = client.get('/api/export?format=csv&include=readings', headers=gzip_only)
+    assert export.headers['Content-Encoding'] == 'gzip' and 'Content-Length' not in export.headers
+    rows = gzip.decompress(export.data).decode().splitlines()
+    assert len(rows) == int(export.headers['X-Export-Readings']) + 1
+    print("✅ Compressão funcionando!")
+
+if __name__ == "__main__":
+    test_negotiate()
+    test_compressed_responses()
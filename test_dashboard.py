@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+"""
+Teste do endpoint agregado /api/dashboard
+"""
+import json
+
+def test_dashboard_endpoint():
+    print("🔍 Testando /api/dashboard...")
+    from src import web_app
+    web_app.initialize_systems()
+    client = web_app.app.test_client()
+    web_app._publish_snapshot(web_app.devices.default, 2000.0, {'temperature': 42.0}, {'pressure': 1.0}, 100.0)
+
+    data = client.get('/api/dashboard').json
+    assert sorted(data) == ['alarms', 'sensor_data', 'system_status']
+    # Mesmo corpo das rotas individuais
+    assert data['sensor_data'] == json.loads(web_app.devices.default.latest_snapshot.body)
+    assert data['alarms'] == client.get('/api/alarms/status').json
+    assert data['system_status']['data_collection'] == client.get('/api/system/status').json['data_collection']
+
+    response = client.get('/api/dashboard?fields=sensor_data,alarms')
+    assert sorted(response.json) == ['alarms', 'sensor_data']
+    assert response.json['sensor_data']['temperature']['temperature'] == 42.0
+    assert client.get('/api/dashboard?fields=sensor_data,alarms',
+                      headers={'If-None-Match': response.headers['ETag']}).status_code == 304
+
+    web_app._publish_snapshot(web_app.devices.default, 2003.0, {'temperature': 43.0}, {'pressure': 1.0}, 100.0)
+    updated = client.get('/api/dashboard?fields=sensor_data,alarms', headers={'If-None-Match': response.headers['ETag']})
+    assert updated.status_code == 200 and updated.json['sensor_data']['temperature']['temperature'] == 43.0
+
+    assert client.get('/api/dashboard?fields=sensor_data,bogus').status_code == 400
+    print("✅ /api/dashboard funcionando!")
+
+if __name__ == "__main__":
+    test_dashboard_endpoint()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Teste do registro de dispositivos (várias panelas, um coletor, rotas por dispositivo)
+"""
+import sys
+import json
+sys.path.insert(0, 'src')
+
+from device_registry import Device, DeviceRegistry
+
+def test_registry():
+    print("🔍 Testando registro de dispositivos...")
+    registry = DeviceRegistry('kettle_01')
+    for i in range(1, 4):
+        registry.add(Device(f'kettle_{i:02d}'))
+    assert registry.default.device_id == 'kettle_01'
+    assert registry.get('kettle_03').device_id == 'kettle_03' and registry.get('outra') is None
+    assert registry.ids() == ['kettle_01', 'kettle_02', 'kettle_03'] and 'kettle_02' in registry
+    try:
+        registry.add(Device('kettle_02'))
+        assert False, "id repetido"
+    except ValueError:
+        pass
+    print("✅ Registro funcionando!")
+
+def test_device_routes():
+    print("🔍 Testando rotas por dispositivo...")
+    from src import web_app
+    from src.clock import get_clock
+    from src.ring_buffer import TimeSeriesRingBuffer
+    from src.rollup import HistoryRollups
+    if 'kettle_teste' not in web_app.devices:
+        web_app._add_device(Device('kettle_teste', data_history=TimeSeriesRingBuffer(100),
+                                   history_rollups=HistoryRollups()))
+    web_app.initialize_systems()
+    client = web_app.app.test_client()
+    default, kettle = web_app.devices.default, web_app.devices.get('kettle_teste')
+    assert kettle.temperature_sensor is not None and kettle.alarm_manager is not default.alarm_manager
+    kettle.alarm_manager.sound_enabled = False
+
+    listed = client.get('/api/devices').json
+    assert listed['default'] == default.device_id and listed['devices'][0]['default']
+    assert 'kettle_teste' in [device['device_id'] for device in listed['devices']]
+
+    # Um coletor: uma passada por todos os dispositivos
+    default_alarms = default.alarm_manager.version
+    client.post('/api/devices/kettle_teste/alarms/configure', json={'mode': 'temperature_only', 'threshold': 10.0})
+    for device in web_app.devices:
+        web_app._collect_device(device, get_clock())
+    assert len(kettle.data_history) == 1
+
+    body = client.get('/api/devices/kettle_teste/sensor_data').data
+    assert body == kettle.latest_snapshot.body
+    assert client.get('/api/sensor_data').data == default.latest_snapshot.body  # Alias do dispositivo padrão
+    assert client.get('/api/devices/kettle_teste/historical_data').json['temperatures'] == \
+        [round(kettle.latest_snapshot.temperature, 4)]
+
+    # Alarmes e controles ficam no próprio dispositivo
+    status = client.get('/api/devices/kettle_teste/alarms/status').json
+    assert status['alarm_mode'] == 'temperature_only' and status['active_alarms_count'] == 1
+    assert default.alarm_manager.version == default_alarms
+    heating = default.temperature_sensor.is_heating
+    assert client.post('/api/devices/kettle_teste/control/heating', json={'heating': True}).status_code == 200
+    assert kettle.temperature_sensor.is_heating and default.temperature_sensor.is_heating == heating
+
+    # Canal ao vivo: todos os dispositivos, controle por dispositivo
+    session = web_app._channel_session()
+    frames = session.handle(json.dumps({'type': 'subscribe', 'fields': ['is_heating']}))
+    assert {frame['device'] for frame in frames[1:]} == set(web_app.devices.ids())
+    reply = session.handle(json.dumps({'type': 'control', 'action': 'heating', 'payload': {'heating': False},
+                                       'device': 'kettle_teste'}))
+    assert reply[0]['status'] == 200 and not kettle.temperature_sensor.is_heating
+
+    assert client.get('/api/devices/outra/sensor_data').status_code == 404
+    print("✅ Rotas por dispositivo funcionando!")
+
+if __name__ == "__main__":
+    test_registry()
+    test_device_routes()
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Teste do downsampling LTTB (extremos preservados, número de pontos, forma da curva)
+"""
+import sys
+import numpy as np
+sys.path.insert(0, 'src')
+
+from downsample import lttb, lttb_indices
+
+def test_lttb_indices():
+    print("🔍 Testando LTTB...")
+    n = 10_000
+    x = np.arange(n, dtype=np.float64)
+    y = np.sin(x / 500.0)
+    y[4321] = 50.0  # Pico isolado
+
+    indices = lttb_indices(x, y, 200)
+    assert len(indices) == 200
+    assert indices[0] == 0 and indices[-1] == n - 1  # Extremos sempre mantidos
+    assert np.all(np.diff(indices) > 0)
+    assert 4321 in indices  # O pico define a forma da curva
+
+    # Orçamento maior que a série, ou menor que 3: série inteira
+    assert lttb_indices(x[:50], y[:50], 100).tolist() == list(range(50))
+    assert len(lttb_indices(x, y, 2)) == n
+
+    xs, ys = lttb(x, y, 3)
+    assert xs.tolist() == [0.0, 4321.0, n - 1.0] and ys[1] == 50.0
+    print("✅ LTTB funcionando!")
+
+def test_historical_data_points_budget():
+    print("🔍 Testando ?points= em /api/historical_data...")
+    from src import web_app
+    from src.ring_buffer import TimeSeriesRingBuffer
+    web_app.initialize_systems()
+    client = web_app.app.test_client()
+    device = web_app.devices.default
+    data_history, device.data_history = device.data_history, TimeSeriesRingBuffer(1000)
+    try:
+        for i in range(400):
+            device.data_history.append(5000.0 + i * 3, temperatures=20.0 + (i % 40), pressures=1.0,
+                                       boiling_points=100.0)
+        window = '?from=5000&to=6197&time_format=epoch'
+        full = client.get(f'/api/historical_data{window}').json
+        trimmed = client.get(f'/api/historical_data{window}&points=100').json
+    finally:
+        device.data_history = data_history
+    assert len(full['timestamps']) == 400 and len(trimmed['timestamps']) == 100
+    assert trimmed['resolution'] == 'raw'  # 20 min: nenhum nível de agregação tem 100 intervalos
+    assert trimmed['timestamps'][0] == 5000.0 and trimmed['timestamps'][-1] == 6197.0
+    assert max(trimmed['temperatures']) == max(full['temperatures'])
+    print("✅ Orçamento de pontos respeitado!")
+
+if __name__ == "__main__":
+    test_lttb_indices()
+    test_historical_data_points_budget()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Teste de ETags e 304 Not Modified nos endpoints consultados periodicamente
+"""
+import sys
+sys.path.insert(0, 'src')
+
+from smart_alarm_manager import SmartAlarmManager
+from clock import VirtualClock
+
+def test_alarm_manager_version():
+    print("🔍 Testando versão do gerenciador de alarmes...")
+    manager = SmartAlarmManager(sound_enabled=False)
+    version = manager.version
+    manager.check_alarms({'temperature': 90.0}, {'pressure': 1.0}, 100.0)
+    assert manager.version == version, "nada configurado: nada muda"
+
+    manager.configure_alarm('temperature_only', threshold=85.0)
+    assert manager.version > version
+    version = manager.version
+    assert manager.check_alarms({'temperature': 80.0}, {'pressure': 1.0}, 100.0) == []
+    assert manager.version == version
+    assert len(manager.check_alarms({'temperature': 90.0}, {'pressure': 1.0}, 100.0)) == 1
+    assert manager.version > version
+    version = manager.version
+    manager.clear_all_alarms()
+    assert manager.version > version
+
+    # Acima de 50 alarmes o mais antigo sai antes da nova versão: cada versão é um único estado
+    class RecordingManager(SmartAlarmManager):
+        @property
+        def version(self):
+            return self._version
+
+        @version.setter
+        def version(self, value):
+            self._version = value
+            self.alarm_counts = getattr(self, 'alarm_counts', []) + [len(getattr(self, 'active_alarms', {}))]
+
+    clock = VirtualClock(speed=None, start_time=1000.0)
+    manager = RecordingManager(sound_enabled=False, clock=clock)
+    for i in range(55):
+        clock.advance(1)
+        manager._create_alarm('TEMPERATURE', f'Alarme {i}', {})
+    assert len(manager.active_alarms) == 50 and max(manager.alarm_counts) == 50
+    print("✅ Versão dos alarmes funcionando!")
+
+def test_conditional_requests():
+    print("🔍 Testando If-None-Match...")
+    from src import web_app
+    web_app.initialize_systems()
+    client = web_app.app.test_client()
+    web_app._publish_snapshot(web_app.devices.default, 1000.0, {'temperature': 20.0}, {'pressure': 1.0}, 100.0)
+
+    for path in ['/api/sensor_data', '/api/alarms', '/api/alarms/status', '/api/system/status']:
+        response = client.get(path)
+        etag = response.headers['ETag']
+        assert response.status_code == 200 and etag.startswith('"')
+        cached = client.get(path, headers={'If-None-Match': etag})
+        assert cached.status_code == 304 and cached.data == b'' and cached.headers['ETag'] == etag
+
+    # Nova leitura, novo alarme ou controle: nova versão
+    etag = client.get('/api/sensor_data').headers['ETag']
+    web_app._publish_snapshot(web_app.devices.default, 1003.0, {'temperature': 21.0}, {'pressure': 1.0}, 100.0)
+    assert client.get('/api/sensor_data', headers={'If-None-Match': etag}).status_code == 200
+
+    etag = client.get('/api/alarms/status').headers['ETag']
+    client.post('/api/alarms/configure', json={'mode': 'temperature_only', 'threshold': 90})
+    assert client.get('/api/alarms/status', headers={'If-None-Match': etag}).status_code == 200
+
+    etag = client.get('/api/system/status').headers['ETag']
+    client.post('/api/control/heating', json={'heating': True})
+    response = client.get('/api/system/status', headers={'If-None-Match': etag})
+    assert response.status_code == 200 and response.json['sensors']['temperature']['heating']
+
+    # Sensor recarregado: novo status, mesmo motor de temperatura
+    etag = response.headers['ETag']
+    engine = type(web_app.devices.default.temperature_sensor)
+    assert client.get('/api/system/reload_sensor').json['success']
+    assert type(web_app.devices.default.temperature_sensor).__name__ == engine.__name__
+    assert client.get('/api/system/status', headers={'If-None-Match': etag}).status_code == 200
+    print("✅ ETags funcionando!")
+
+if __name__ == "__main__":
+    test_alarm_manager_version()
+    test_conditional_requests()
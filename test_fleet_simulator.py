@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Teste do simulador vetorizado de frota de sensores
+"""
+import sys
+sys.path.append('src')
+
+from fleet_simulator import FleetTemperatureSimulator
+
+def test_fleet_simulator():
+    print("🔍 Testando simulador de frota...")
+
+    fleet = FleetTemperatureSimulator(100, autostart=False)
+    heating = fleet.sensors[:50]
+    idle = fleet.sensors[50:]
+
+    for sensor in heating:
+        sensor.set_heating(True)
+
+    for _ in range(100):
+        fleet.step(0.1)
+
+    temps = [s.get_temperature() for s in heating]
+    print(f"🌡️ Aquecendo: {min(temps):.1f}°C - {max(temps):.1f}°C")
+    assert all(t > 25.0 for t in temps)
+    assert all(s.get_temperature() == 20.0 for s in idle)
+
+    # Resfriamento nunca passa da temperatura ambiente
+    for sensor in heating:
+        sensor.set_heating(False)
+    for _ in range(5000):
+        fleet.step(1.0)
+    assert all(s.get_temperature() == 20.0 for s in heating)
+
+    data = heating[0].get_data()
+    assert set(data) == {'temperature', 'is_heating', 'heating_power', 'timestamp', 'status'}
+    assert data['is_heating'] is False and data['heating_power'] == 0.0
+    print("✅ Simulador de frota funcionando!")
+
+if __name__ == "__main__":
+    test_fleet_simulator()
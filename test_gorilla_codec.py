@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Teste do codec Gorilla (delta-of-delta + XOR) para blocos de histórico
+"""
+import sys
+import numpy as np
+sys.path.insert(0, 'src')
+
+from gorilla import encode_block, decode_block
+
+def test_gorilla_round_trip():
+    """Codificação sem perdas, com precisão declarada e com valores extremos"""
+    print("🧪 TESTE DO CODEC GORILLA")
+    print("=" * 50)
+
+    rng = np.random.default_rng(3)
+    n = 2000
+    records = np.zeros(n, dtype=[('timestamp', '<f8'), ('temperature', '<f4'),
+                                 ('pressure', '<f8'), ('heating', 'u1'), ('counter', '<i8')])
+    records['timestamp'] = 1_700_000_000 + np.arange(n) * 3.0 + rng.integers(0, 50, n) / 1000.0
+    records['temperature'] = np.round(20 + np.cumsum(rng.normal(0, 0.3, n)), 1)
+    records['pressure'] = 1.0 + rng.normal(0, 0.001, n)
+    records['heating'] = (np.arange(n) // 300) % 2
+    records['counter'] = rng.integers(-2 ** 63, 2 ** 63 - 1, n, dtype=np.int64)
+    records['pressure'][5] = np.nan
+
+    block = encode_block(records)
+    assert decode_block(block).tobytes() == records.tobytes()  # Bit a bit, inclusive NaN
+    print(f"✅ Sem perdas: {records.nbytes} -> {len(block)} bytes")
+
+    rounded = decode_block(encode_block(records[['timestamp', 'temperature', 'heating']], {'temperature': 1}))
+    assert np.array_equal(rounded['temperature'], records['temperature'])
+    assert np.array_equal(rounded['heating'], records['heating'])
+    print("✅ Precisão declarada (0.1 °C) preserva leituras já arredondadas")
+
+    empty = decode_block(encode_block(records[:0]))
+    assert len(empty) == 0 and empty.dtype == records.dtype
+    print("✅ Bloco vazio")
+
+    print("\n🎉 CODEC GORILLA OK!")
+
+if __name__ == "__main__":
+    test_gorilla_round_trip()
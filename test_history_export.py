@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Teste da exportação em massa do histórico (CSV, NDJSON e .npz transmitidos em blocos)
+"""
+import io
+import sys
+import json
+import numpy as np
+sys.path.insert(0, 'src')
+
+from history_export import csv_stream, alarms_csv_stream, ndjson_stream, npz_stream, reading_columns
+
+def history_chunks(count, chunk_size):
+    timestamps = 1000.0 + np.arange(count) * 3.0
+    for i in range(0, count, chunk_size):
+        window = timestamps[i:i + chunk_size]
+        yield {'timestamps': window,
+               'temperatures': (20.0 + np.arange(i, i + len(window)) * 0.5).astype(np.float32),
+               'pressures': np.full(len(window), 0.9, dtype=np.float32),
+               'boiling_points': np.full(len(window), 96.75, dtype=np.float32),
+               'heating': np.arange(i, i + len(window)) % 2 == 0}
+
+ALARMS = [{'timestamp': 1003.0, 'id': 'a1', 'type': 'temperature', 'priority': 'high',
+           'message': 'Quente, "muito" quente', 'temperature': 95.0}]
+
+def test_csv_and_ndjson_streams():
+    print("🔍 Testando CSV e NDJSON...")
+    columns = reading_columns(has_heating=True)
+    chunks = list(csv_stream(history_chunks(10, 4), columns))
+    assert len(chunks) == 4  # Cabeçalho + um bloco por pedaço do histórico
+    lines = ''.join(chunks).splitlines()
+    assert lines[0] == 'timestamp,temperature,pressure,boiling_point,heating'
+    assert lines[1] == '1000.0,20.0,0.9,96.75,1' and lines[2] == '1003.0,20.5,0.9,96.75,0'
+    assert len(lines) == 11
+
+    assert ''.join(alarms_csv_stream(ALARMS)).splitlines()[1] == \
+        '1003.0,a1,temperature,high,"Quente, ""muito"" quente"'
+    assert 'heating' not in [name for _, name, _ in reading_columns(has_heating=False)]
+
+    records = [json.loads(line) for line in ''.join(ndjson_stream(history_chunks(5, 2), columns, ALARMS)).splitlines()]
+    assert [record['record'] for record in records] == ['reading'] * 5 + ['alarm']
+    assert records[4]['temperature'] == 22.0 and records[-1]['temperature'] == 95.0
+    print("✅ CSV e NDJSON funcionando!")
+
+def test_npz_stream():
+    print("🔍 Testando .npz transmitido...")
+    columns = reading_columns(has_heating=True)
+    parts = list(npz_stream(10000, history_chunks(10000, 3000), columns, ALARMS))
+    assert len(parts) > 4  # Bytes enviados a cada bloco, não no fim
+    archive = np.load(io.BytesIO(b''.join(parts)))
+    readings = archive['readings']
+    assert len(readings) == 10000 and readings['timestamp'][-1] == 1000.0 + 9999 * 3.0
+    assert readings['temperature'][100] == 70.0 and readings['heating'][:3].tolist() == [1, 0, 1]
+    assert archive['alarms']['id'].tolist() == ['a1']
+
+    # Menos leituras que o anunciado: erro em vez de arquivo truncado
+    try:
+        list(npz_stream(10, history_chunks(5, 5), columns))
+        assert False, "contagem divergente"
+    except RuntimeError:
+        pass
+    print("✅ .npz funcionando!")
+
+def test_export_route():
+    print("🔍 Testando /api/export...")
+    from src import web_app
+    from src.ring_buffer import TimeSeriesRingBuffer
+    web_app.initialize_systems()
+    client = web_app.app.test_client()
+    device = web_app.devices.default
+    data_history, device.data_history = device.data_history, TimeSeriesRingBuffer(20000)
+    try:
+        for i in range(20000):
+            device.data_history.append(1000.0 + i * 3, temperatures=20.0 + i % 100, pressures=1.0,
+                                       boiling_points=100.0)
+        response = client.get('/api/export?format=npz&include=readings')
+        assert response.headers['X-Export-Readings'] == '20000'
+        readings = np.load(io.BytesIO(response.data))['readings']
+        assert len(readings) == 20000 and readings['timestamp'][-1] == 1000.0 + 19999 * 3
+
+        rows = client.get('/api/export?format=csv&include=readings&from=1000&to=1297').data.decode().splitlines()
+        assert len(rows) == 101 and rows[-1].startswith('1297.0,')
+        assert client.get('/api/export?format=xml').status_code == 400
+    finally:
+        device.data_history = data_history
+    print("✅ Exportação funcionando!")
+
+if __name__ == "__main__":
+    test_csv_and_ndjson_streams()
+    test_npz_stream()
+    test_export_route()
@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+"""
+Teste da formatação ISO vetorizada do histórico (fuso local, mudanças de horário de verão)
+"""
+import os
+import time
+import numpy as np
+from datetime import datetime
+
+def test_iso_timestamps_across_dst():
+    print("🔍 Testando timestamps ISO com horário de verão...")
+    from src import web_app
+    previous = os.environ.get('TZ')
+    os.environ['TZ'] = 'America/New_York'
+    time.tzset()
+    try:
+        # ~400 dias: duas mudanças de horário, mesmo deslocamento nas extremidades
+        timestamps = np.arange(1_700_000_000, 1_700_000_000 + 400 * 86400, 600, dtype=np.float64)
+        assert time.localtime(timestamps[0]).tm_gmtoff == time.localtime(timestamps[-1]).tm_gmtoff
+        expected = [datetime.fromtimestamp(ts).strftime('%Y-%m-%dT%H:%M:%S.%f') for ts in timestamps.tolist()]
+        assert web_app._iso_timestamps(timestamps) == expected
+        assert web_app._iso_timestamps(timestamps[:1]) == expected[:1]
+        assert web_app._iso_timestamps(np.array([])) == []
+    finally:
+        if previous is None:
+            os.environ.pop('TZ', None)
+        else:
+            os.environ['TZ'] = previous
+        time.tzset()
+    print("✅ Timestamps ISO corretos!")
+
+if __name__ == "__main__":
+    test_iso_timestamps_across_dst()
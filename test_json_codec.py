@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Teste da camada de codificação JSON (orjson opcional, cache por versão, fragmentos)
+"""
+import sys
+import json
+import importlib.util
+sys.path.insert(0, 'src')
+
+import json_codec
+from json_codec import EncodedCache, json_object
+
+def load_stdlib_codec():
+    """json_codec como se o orjson não estivesse instalado"""
+    saved = sys.modules.get('orjson')
+    sys.modules['orjson'] = None  # import orjson -> ImportError
+    try:
+        spec = importlib.util.spec_from_file_location('json_codec_stdlib', 'src/json_codec.py')
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module
+    finally:
+        if saved is None:
+            del sys.modules['orjson']
+        else:
+            sys.modules['orjson'] = saved
+
+def test_backends_agree():
+    print("🔍 Testando backends JSON...")
+    stdlib = load_stdlib_codec()
+    assert stdlib.BACKEND == 'json'
+    value = {'temperature': 21.5, 'message': '💧 Fervura detectada! 100.0°C', 'alarms': [{'id': 1}], 'none': None}
+    for codec in (json_codec, stdlib):
+        assert json.loads(codec.dumps(value)) == value
+    assert stdlib.dumps(value) == json_codec.dumps(value)  # Mesmos bytes: JSON compacto em UTF-8
+    print(f"✅ Backends funcionando ({json_codec.BACKEND})!")
+
+def test_encoded_cache():
+    print("🔍 Testando cache de bytes codificados...")
+    state = {'version': 0, 'alarms': []}
+    builds = []
+    cache = EncodedCache(lambda: builds.append(1) or {'alarms': list(state['alarms'])})
+
+    first = cache.encode(state['version'])
+    assert cache.encode(state['version']) is first and len(builds) == 1
+    state['alarms'].append('boiling')
+    state['version'] += 1
+    assert json.loads(cache.encode(state['version'])) == {'alarms': ['boiling']}
+    assert (cache.hits, cache.misses) == (1, 2)
+
+    # Um objeto recriado recomeça na versão 0: o próprio objeto faz parte da chave
+    old, new = object(), object()
+    cache.encode((old, 0))
+    cache.encode((new, 0))
+    assert cache.misses == 4
+
+    body = json_object({'sensor_data': b'{"temperature":21.5}', 'alarms': first})
+    assert json.loads(body) == {'sensor_data': {'temperature': 21.5}, 'alarms': {'alarms': []}}
+    print("✅ Cache de bytes funcionando!")
+
+if __name__ == "__main__":
+    test_backends_agree()
+    test_encoded_cache()
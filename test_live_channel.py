@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Teste do canal WebSocket: quadros RFC 6455 e codificação delta por cliente
+"""
+import os
+import sys
+import json
+import struct
+sys.path.insert(0, 'src')
+
+from ws_protocol import FrameParser, WebSocketError, accept_key, encode_frame, OP_TEXT, OP_PING
+from live_channel import ChannelSession
+
+def client_frame(payload, opcode=OP_TEXT, fin=True):
+    """Quadro mascarado, como um navegador envia"""
+    mask = os.urandom(4)
+    length = len(payload)
+    if length < 126:
+        header = struct.pack('!BB', (0x80 if fin else 0) | opcode, 0x80 | length)
+    else:
+        header = struct.pack('!BBH', (0x80 if fin else 0) | opcode, 0x80 | 126, length)
+    return header + mask + bytes(b ^ mask[i % 4] for i, b in enumerate(payload))
+
+def test_websocket_frames():
+    print("🔍 Testando quadros WebSocket...")
+    assert accept_key('dGhlIHNhbXBsZSBub25jZQ==') == 's3pPLMBiTxaQ9kYGzzhZRbK+xOo='
+
+    parser = FrameParser(max_size=1000)
+    long_text = b'x' * 300
+    data = client_frame(b'{"type": "subscribe"}') + client_frame(long_text)
+    # Entrega byte a byte: o parser só devolve mensagens completas
+    messages = []
+    for i in range(len(data)):
+        messages += parser.feed(data[i:i + 1])
+    assert messages == [(OP_TEXT, b'{"type": "subscribe"}'), (OP_TEXT, long_text)]
+
+    # Mensagem fragmentada com um ping no meio
+    fragmented = client_frame(b'Hel', fin=False) + client_frame(b'ping', OP_PING) + client_frame(b'lo', opcode=0)
+    assert parser.feed(fragmented) == [(OP_PING, b'ping'), (OP_TEXT, b'Hello')]
+
+    assert encode_frame('Hi') == b'\x81\x02Hi'
+    assert encode_frame('y' * 200)[:4] == b'\x81\x7e\x00\xc8'
+    try:
+        parser.feed(client_frame(b'z' * 2000))
+        assert False, "mensagem acima do limite"
+    except WebSocketError as e:
+        assert e.code == 1009
+    print("✅ Quadros WebSocket funcionando!")
+
+def test_delta_encoding():
+    print("🔍 Testando codificação delta...")
+    state = {'temperature': 20.04, 'pressure': 1.0132, 'boiling_point': 100.03, 'target_temperature': 100.0}
+    controls = []
+    session = ChannelSession({'thermo_1': lambda: dict(state)},
+                             lambda action, payload, device: controls.append((action, payload, device)) or (200, {'success': True}))
+
+    frames = session.handle(json.dumps({'type': 'subscribe', 'fields': ['temperature', 'boiling_point', 'target_temperature']}))
+    assert frames[0]['type'] == 'subscribed'
+    assert frames[1]['fields'] == {'temperature': 20.0, 'boiling_point': 100.03, 'target_temperature': 100.0}
+
+    # Só campos que mudaram (na resolução do sensor) e que foram assinados
+    state.update(temperature=20.03, pressure=0.99)
+    assert session.updates() == []
+    state.update(temperature=23.5)
+    assert session.updates()[0]['fields'] == {'temperature': 23.5}
+
+    reply = session.handle(json.dumps({'type': 'control', 'action': 'heating', 'payload': {'heating': True}, 'id': 3}))
+    assert reply == [{'type': 'control_result', 'id': 3, 'status': 200, 'body': {'success': True}}]
+    assert controls == [('heating', {'heating': True}, None)]
+    session.handle(json.dumps({'type': 'control', 'action': 'heating', 'payload': {}, 'device': 'thermo_1'}))
+    assert controls[-1] == ('heating', {}, 'thermo_1')
+    assert session.handle(json.dumps({'type': 'control', 'action': 'heating', 'device': 'outro'}))[0]['type'] == 'error'
+
+    assert session.handle(json.dumps({'type': 'subscribe', 'devices': ['outro']}))[0]['type'] == 'error'
+    assert session.handle('not json')[0]['type'] == 'error'
+    # Tipos inválidos: quadro de erro, a sessão continua
+    for message in ({'type': 'subscribe', 'devices': 'thermo_1'}, {'type': 'subscribe', 'devices': 5},
+                    {'type': 'subscribe', 'devices': [['thermo_1']]}, {'type': 'subscribe', 'fields': 'temperature'},
+                    {'type': 'unsubscribe', 'devices': 5}, {'type': 'control', 'action': 'heating', 'device': ['a']}):
+        assert session.handle(json.dumps(message))[0]['type'] == 'error'
+    assert session.encoders['thermo_1'].fields == frozenset(['temperature', 'boiling_point', 'target_temperature'])
+    session.handle(json.dumps({'type': 'unsubscribe'}))
+    state.update(temperature=50.0)
+    assert session.updates() == []
+    print("✅ Codificação delta funcionando!")
+
+if __name__ == "__main__":
+    test_websocket_frames()
+    test_delta_encoding()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Teste da retenção por nível e da compactação do histórico em segmentos
+"""
+import sys
+import tempfile
+import numpy as np
+sys.path.insert(0, 'src')
+
+from retention import parse_duration, parse_retention, HistoryCompactor, DEFAULT_RETENTION
+from segment_store import SegmentStore
+from rollup import HistoryRollups, ROLLUP_DTYPE
+from clock import VirtualClock
+
+def test_parse_retention():
+    print("🔍 Testando políticas de retenção...")
+    assert parse_duration('90') == 90.0 and parse_duration('15m') == 900.0
+    assert parse_duration('1.5h') == 5400.0 and parse_duration('30d') == 30 * 86400.0
+    assert parse_duration('forever') is None and parse_duration('inf') is None
+    try:
+        parse_duration('10 dias')
+        assert False, "duração inválida"
+    except ValueError:
+        pass
+    retention = parse_retention(DEFAULT_RETENTION)
+    assert retention == {'raw': 86400.0, '1s': 86400.0, '1m': 30 * 86400.0, '1h': 365 * 86400.0,
+                         'alarms': 365 * 86400.0}
+    assert parse_retention('raw=forever, alarms=1y') == {'raw': None, 'alarms': 31536000.0}
+    print("✅ Políticas de retenção corretas!")
+
+def test_compactor_drops_and_merges():
+    print("🔍 Testando compactação...")
+    with tempfile.TemporaryDirectory() as directory:
+        # Segmentos curtos deixados por reinícios (10 registros), depois segmentos de 100
+        store = SegmentStore(directory, segment_records=10)
+        for i in range(30):
+            store.append_reading(1000.0 + i, 20.0, 1.0, 100.0, False)
+        store.close()
+        store = SegmentStore(directory, segment_records=100)
+        for i in range(30, 320):
+            store.append_reading(1000.0 + i, 20.0 + i, 1.0, 100.0, False)
+        assert len(store.segments()) == 5  # 10 + 10 + 100 + 100 + 100 (ativo)
+
+        rollups = HistoryRollups(tiers=(('1m', 60, 100),))
+        tier = rollups.tiers[0]
+        tier.store = SegmentStore(directory, name='rollup-1m', dtype=ROLLUP_DTYPE, segment_records=2)
+        for i in range(320):
+            rollups.add(1000.0 + i, 20.0, 1.0, 100.0)
+        assert len(tier.store) == 5
+
+        clock = VirtualClock(speed=None, start_time=1000.0)
+        compactor = HistoryCompactor({'raw': None, '1m': 100.0}, clock, segment_store=store, rollups=rollups)
+        result = compactor.run_once()
+        assert result['segments_merged'] == 1  # Os dois segmentos curtos viram um
+        assert len(store.segments()) == 4 and len(store) == 320
+        assert np.array_equal(store.range()['timestamp'], 1000.0 + np.arange(320))
+        assert 'raw_records_dropped' not in result  # raw=forever
+
+        # Retenção: só segmentos selados inteiramente antes do corte são apagados
+        clock.advance(220.0)
+        compactor.retention['raw'] = 100.0
+        result = compactor.run_once()
+        assert result['raw_records_dropped'] == 120  # Corte em 1120: segmentos 1000-1019 e 1020-1119
+        assert store.range()['timestamp'][0] == 1120.0
+        assert result['rollup_1m_dropped'] == 2  # Intervalos de 960 e 1020 (corte em 1120)
+        assert tier.window()['timestamps'][0] == 1080.0
+
+        status = compactor.status()
+        assert status['runs'] == 2 and status['last_result'] == result and not status['running']
+        store.close()
+    print("✅ Compactação funcionando!")
+
+if __name__ == "__main__":
+    test_parse_retention()
+    test_compactor_drops_and_merges()
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Teste do buffer circular de histórico
+"""
+import sys
+sys.path.insert(0, 'src')
+
+from ring_buffer import TimeSeriesRingBuffer
+
+def test_ring_buffer_wraparound():
+    print("🔍 Testando buffer circular...")
+
+    history = TimeSeriesRingBuffer(capacity=5)
+    assert len(history) == 0
+    assert history.latest() is None and history.bounds() == (None, None)
+
+    for i in range(3):
+        history.append(1000.0 + i, temperatures=20.0 + i, pressures=1.0, boiling_points=100.0)
+    assert history.timestamps.tolist() == [1000.0, 1001.0, 1002.0]
+
+    for i in range(3, 12):
+        history.append(1000.0 + i, temperatures=20.0 + i, pressures=1.0, boiling_points=100.0)
+
+    snapshot = history.snapshot()
+    assert len(history) == 5
+    assert snapshot['timestamps'].tolist() == [1007.0, 1008.0, 1009.0, 1010.0, 1011.0]
+    assert snapshot['temperatures'].tolist() == [27.0, 28.0, 29.0, 30.0, 31.0]
+    assert history.latest()['temperatures'] == 31.0
+
+    # Consultas por intervalo (busca binária nos timestamps)
+    window = history.range(1008.0, 1010.0)
+    assert window['timestamps'].tolist() == [1008.0, 1009.0, 1010.0]
+    assert window['temperatures'].tolist() == [28.0, 29.0, 30.0]
+    assert history.range(1009.5)['timestamps'].tolist() == [1010.0, 1011.0]
+    assert history.range(end=1007.0)['timestamps'].tolist() == [1007.0]
+    assert len(history.range(2000.0)['timestamps']) == 0
+    assert len(history.range(1010.0, 1008.0)['timestamps']) == 0
+
+    # Cópias: novas leituras não alteram uma janela já retornada
+    history.append(1012.0, temperatures=32.0, pressures=1.0, boiling_points=100.0)
+    assert snapshot['timestamps'].tolist() == [1007.0, 1008.0, 1009.0, 1010.0, 1011.0]
+    assert snapshot['temperatures'].tolist() == [27.0, 28.0, 29.0, 30.0, 31.0]
+    assert history.timestamps.tolist() == [1008.0, 1009.0, 1010.0, 1011.0, 1012.0]
+    assert history.bounds() == (1008.0, 1012.0)
+    print("✅ Buffer circular funcionando!")
+
+if __name__ == "__main__":
+    test_ring_buffer_wraparound()
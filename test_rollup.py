@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Teste dos níveis de agregação do histórico (1s/1m/1h) e da escolha do nível por ?points=
+"""
+import sys
+import numpy as np
+sys.path.insert(0, 'src')
+
+from rollup import HistoryRollups, RollupTier
+
+def test_rollup_buckets():
+    print("🔍 Testando agregação por intervalo...")
+    tier = RollupTier('1m', 60, capacity=10)
+    for i, temperature in enumerate([20.0, 22.0, 24.0, 30.0]):
+        tier.add(1200.0 + i * 20, (temperature, 1.0, 100.0))  # 1200, 1220, 1240 | 1260
+
+    # Intervalo fechado + intervalo aberto (parcial)
+    window = tier.window()
+    assert window['timestamps'].tolist() == [1200.0, 1260.0]
+    assert window['count'].tolist() == [3, 1]
+    assert window['temperatures'].tolist() == [22.0, 30.0]
+    assert window['temperatures_min'][0] == 20.0 and window['temperatures_max'][0] == 24.0
+
+    # O intervalo aberto respeita a janela pedida
+    assert tier.window(end=1259.0)['timestamps'].tolist() == [1200.0]
+    tier.flush()
+    assert tier.window()['count'].tolist() == [3, 1]
+    print("✅ Agregação funcionando!")
+
+def test_tier_selection():
+    print("🔍 Testando escolha do nível de agregação...")
+    rollups = HistoryRollups()
+    assert rollups.select(3600, 500, 3) is None  # 1 h em 500 pontos: dados brutos
+    assert rollups.select(86400, 500, 3).label == '1m'  # 1 dia: 1440 intervalos de 1 min
+    assert rollups.select(7 * 86400, 500, 3).label == '1m'
+    assert rollups.select(30 * 86400, 500, 3).label == '1h'
+    assert rollups.select(86400, 500, 0.5).label == '1m'
+    assert rollups.select(3600, 500, 0.5).label == '1s'  # Coleta rápida: 1s acrescenta algo
+    print("✅ Escolha do nível funcionando!")
+
+def test_historical_data_uses_tier():
+    print("🔍 Testando /api/historical_data com ?points=...")
+    from src import web_app
+    from src.rollup import HistoryRollups as Rollups
+    web_app.initialize_systems()
+    client = web_app.app.test_client()
+    device = web_app.devices.default
+    rollups, device.history_rollups = device.history_rollups, Rollups()
+    try:
+        start = 1_699_999_200.0  # Múltiplo de 1 h
+        for i in range(2 * 86400 // 60):
+            device.history_rollups.add(start + i * 60, 20.0 + (i % 60), 1.0, 100.0)
+        body = client.get(f'/api/historical_data?from={start}&to={start + 86400}&points=500'
+                          '&time_format=epoch').json
+        assert body['resolution'] == '1m'
+        assert len(body['timestamps']) == 500
+        assert body['timestamps'][0] == start and np.all(np.diff(body['timestamps']) > 0)
+    finally:
+        device.history_rollups = rollups
+    print("✅ Nível de agregação servido!")
+
+if __name__ == "__main__":
+    test_rollup_buckets()
+    test_tier_selection()
+    test_historical_data_uses_tier()
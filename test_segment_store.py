@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Teste do armazenamento persistente em segmentos (append-only + memmap)
+"""
+import os
+import sys
+import tempfile
+import numpy as np
+sys.path.insert(0, 'src')
+
+from segment_store import SegmentStore, READING_DTYPE
+
+def test_segment_store():
+    """Escrita, rotação de segmentos, consultas por intervalo e recuperação após falha"""
+    print("🧪 TESTE DO SEGMENT STORE")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = SegmentStore(directory, segment_records=100)
+        for i in range(250):
+            store.append_reading(1000.0 + i, 20.0 + i, 0.9, 96.7, i % 2 == 0)
+        store.close()
+
+        assert len(store) == 250
+        assert len(store.segments()) == 3
+        assert READING_DTYPE.itemsize == 21
+        assert store.disk_usage() == 250 * 21
+        print("✅ 250 registros em 3 segmentos de 21 bytes/registro")
+
+        everything = store.range()
+        assert np.array_equal(everything['timestamp'], 1000.0 + np.arange(250))
+        window = store.range(1095.0, 1105.0)  # Atravessa a fronteira entre segmentos
+        assert window['timestamp'].tolist() == [1000.0 + i for i in range(95, 106)]
+        assert window['heating'].tolist() == [1 if i % 2 == 0 else 0 for i in range(95, 106)]
+        inside = store.range(1010.0, 1020.0)
+        assert isinstance(inside, np.memmap)  # Janela dentro de um segmento: sem cópia
+        assert len(store.range(5000.0, 6000.0)) == 0
+        print("✅ Consultas por intervalo corretas (inclusive entre segmentos)")
+
+        # Simula queda no meio de uma escrita: registro final incompleto
+        last = store.segments()[-1]
+        with open(last, 'ab') as f:
+            f.write(b'\xff' * 10)
+        reopened = SegmentStore(directory, segment_records=100)
+        assert os.path.getsize(last) % READING_DTYPE.itemsize == 0
+        assert len(reopened) == 250
+
+        reopened.append_reading(1250.0, 42.0, 1.0, 100.0, True)
+        reopened.close()
+        tail = reopened.range(1249.0)
+        assert tail['timestamp'].tolist() == [1249.0, 1250.0]
+        assert abs(float(tail['temperature'][-1]) - 42.0) < 1e-6
+        print("✅ Registro corrompido truncado e escrita retomada após reabrir")
+
+    print("\n🎉 SEGMENT STORE OK!")
+
+if __name__ == "__main__":
+    test_segment_store()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Teste do histórico em memória compartilhada (um coletor, vários leitores)
+"""
+import os
+import sys
+import subprocess
+sys.path.insert(0, 'src')
+
+from shared_history import SharedHistoryBuffer
+
+# Processo leitor: confere que cada janela lida é consistente enquanto o coletor escreve
+READER = """
+import sys
+sys.path.insert(0, 'src')
+from shared_history import SharedHistoryBuffer
+history = SharedHistoryBuffer(sys.argv[1], attach_timeout=5)
+checked = 0
+while checked < 2000:
+    # Janela inteira copiada na seção de leitura: nenhuma amostra sobrescrita depois
+    window = history.range()
+    timestamps, temperatures = window['timestamps'], window['temperatures']
+    if len(timestamps) > 1:
+        assert (timestamps[1:] > timestamps[:-1]).all()
+        assert (temperatures == timestamps * 0.5).all()
+        checked += 1
+print(checked)
+"""
+
+def test_shared_history_across_processes():
+    print("🔍 Testando histórico compartilhado entre processos...")
+    name = f"test_shb_{os.getpid()}"
+    history = SharedHistoryBuffer(name, capacity=500, create=True)
+    try:
+        reader = subprocess.Popen([sys.executable, '-c', READER, name], stdout=subprocess.PIPE, text=True)
+        i = 0
+        while reader.poll() is None and i < 5_000_000:
+            history.append(float(i), temperatures=i * 0.5, pressures=1.0, boiling_points=100.0)
+            i += 1
+        output, _ = reader.communicate(timeout=30)
+        assert reader.returncode == 0 and output.strip() == '2000'
+        assert len(history) == 500
+
+        # Leitor no mesmo processo: views ao vivo somente leitura, janelas copiadas
+        attached = SharedHistoryBuffer(name)
+        assert attached.capacity == 500 and attached.fields == history.fields
+        assert attached.range()['timestamps'].tolist() == history.range()['timestamps'].tolist()
+        assert not attached.timestamps.flags.writeable
+        try:
+            attached.append(0.0)
+            assert False, "leitor não pode escrever"
+        except RuntimeError:
+            pass
+
+        # Reinício do coletor: o leitor passa para o novo segmento
+        history.publish_latest(b'{"temperature": 21.5}')
+        assert attached.latest_payload() == b'{"temperature": 21.5}'
+        history.close()
+        history = SharedHistoryBuffer(name, capacity=500, create=True)
+        history.append(1.0, temperatures=99.0, pressures=1.0, boiling_points=100.0)
+        assert attached.latest()['temperatures'] == 99.0
+        assert attached.latest_payload() is None
+        attached.close()
+    finally:
+        history.close()
+    print("✅ Histórico compartilhado funcionando!")
+
+if __name__ == "__main__":
+    test_shared_history_across_processes()
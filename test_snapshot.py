@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Teste do snapshot imutável da última leitura (serializado uma vez por tick do coletor)
+"""
+import sys
+import json
+sys.path.insert(0, 'src')
+
+from snapshot import SensorSnapshot
+
+def test_snapshot_encoding():
+    print("🔍 Testando snapshot da leitura...")
+    temp_data = {'temperature': 42.5, 'is_heating': True}
+    payload = {'temperature': temp_data, 'pressure': {'pressure': 0.98}, 'boiling_point': 99.4,
+               'timestamp': '2026-10-17T12:00:00'}
+    snapshot = SensorSnapshot(7, 1_700_000_000.0, temp_data, {'pressure': 0.98}, 99.4, payload)
+
+    assert isinstance(snapshot.body, bytes) and json.loads(snapshot.body) == payload
+    assert snapshot.seq == 7 and snapshot.temperature == 42.5 and snapshot.pressure == 0.98
+    assert snapshot.readings() == {'temperature': 42.5, 'pressure': 0.98, 'boiling_point': 99.4}
+
+    # Imutável, inclusive as leituras copiadas do coletor
+    temp_data['temperature'] = 99.0
+    assert snapshot.temperature == 42.5
+    for change in (lambda: setattr(snapshot, 'boiling_point', 100.0),
+                   lambda: delattr(snapshot, 'body')):
+        try:
+            change()
+            assert False, "snapshot alterado"
+        except AttributeError:
+            pass
+    try:
+        snapshot.temp_data['temperature'] = 0.0
+        assert False, "leituras alteradas"
+    except TypeError:
+        pass
+
+    empty = SensorSnapshot(1, 0.0, None, None, None, {})
+    assert empty.temperature is None and empty.pressure is None and empty.body == b'{}'
+    print("✅ Snapshot funcionando!")
+
+def test_sensor_data_serves_snapshot():
+    print("🔍 Testando /api/sensor_data a partir do snapshot...")
+    from src import web_app
+    web_app.initialize_systems()
+    client = web_app.app.test_client()
+    device = web_app.devices.default
+    first = web_app._publish_snapshot(device, 4000.0, {'temperature': 30.0}, {'pressure': 1.0}, 100.0)
+    second = web_app._publish_snapshot(device, 4003.0, {'temperature': 31.0}, {'pressure': 1.0}, 100.0)
+    assert second.seq == first.seq + 1 and device.latest_snapshot is second
+
+    response = client.get('/api/sensor_data')
+    assert response.data == second.body  # Bytes servidos como foram codificados, sem nova serialização
+    assert response.json['temperature']['temperature'] == 31.0
+    assert json.loads(first.body)['temperature']['temperature'] == 30.0  # O anterior não muda
+    print("✅ Snapshot servido!")
+
+if __name__ == "__main__":
+    test_snapshot_encoding()
+    test_sensor_data_serves_snapshot()
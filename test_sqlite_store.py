@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Teste do histórico em SQLite (inserção em lotes, paginação por chave, limpeza e compactação)
+"""
+import os
+import sys
+import tempfile
+import threading
+import numpy as np
+sys.path.insert(0, 'src')
+
+from sqlite_store import SQLiteHistoryStore
+from retention import HistoryCompactor
+from clock import VirtualClock
+
+def test_batched_inserts():
+    print("🔍 Testando inserção em lotes...")
+    with tempfile.TemporaryDirectory() as directory:
+        store = SQLiteHistoryStore(os.path.join(directory, 'history.db'), batch_size=10, flush_interval=60.0)
+        for i in range(25):
+            store.add_reading('kettle', 1000.0 + i, 20.0 + i, 1.0, 100.0, heating=i % 2 == 0)
+        assert store.count_readings('kettle') == 20  # Dois lotes gravados, 5 leituras pendentes
+        assert store.stats()['pending_readings'] == 5
+
+        # Um alarme grava também as leituras pendentes
+        store.add_alarm('kettle', {'id': 'a1', 'type': 'temperature', 'priority': 'high',
+                                   'message': 'Quente', 'timestamp': 1024.5, 'temperature': 44.0})
+        assert store.count_readings('kettle') == 25
+        window = store.readings('kettle', 1010.0, 1012.0)
+        assert window['timestamps'].tolist() == [1010.0, 1011.0, 1012.0]
+        assert window['heating'].tolist() == [True, False, True]
+        assert store.readings('kettle', limit=3)['timestamps'].tolist() == [1000.0, 1001.0, 1002.0]
+        assert store.alarms('kettle')[0]['temperature'] == 44.0
+        assert store.devices() == ['kettle']
+        store.close()
+    print("✅ Inserção em lotes funcionando!")
+
+def test_keyset_pagination():
+    print("🔍 Testando paginação por chave...")
+    with tempfile.TemporaryDirectory() as directory:
+        store = SQLiteHistoryStore(os.path.join(directory, 'history.db'), batch_size=1000)
+        for i in range(1000):
+            store.add_reading('kettle', 1000.0 + i // 2, float(i), 1.0, 100.0)  # Timestamps repetidos
+            store.add_reading('outra', 1000.0 + i, 0.0, 1.0, 100.0)
+        for i in range(30):
+            store.add_alarm('kettle', {'id': f'a{i}', 'type': 'time', 'timestamp': 1000.0 + i // 3})
+        store.flush()
+
+        chunks = list(store.iter_readings('kettle', 1100.0, 1399.0, chunk_size=64))
+        temperatures = np.concatenate([chunk['temperatures'] for chunk in chunks])
+        assert all(len(chunk['timestamps']) <= 64 for chunk in chunks)
+        assert temperatures.tolist() == [float(i) for i in range(200, 800)]  # Nenhuma linha repetida ou perdida
+        assert store.count_readings('kettle', 1100.0, 1399.0) == 600
+        alarms = list(store.iter_alarms('kettle', 1002.0, chunk_size=4))
+        assert [alarm['id'] for alarm in alarms] == [f'a{i}' for i in range(6, 30)]
+        store.close()
+    print("✅ Paginação funcionando!")
+
+def test_purge_and_compaction():
+    print("🔍 Testando limpeza e compactação...")
+    with tempfile.TemporaryDirectory() as directory:
+        store = SQLiteHistoryStore(os.path.join(directory, 'history.db'), batch_size=500)
+        for i in range(3000):
+            store.add_reading('kettle', 1000.0 + i, 20.0, 1.0, 100.0)
+        store.add_alarm('kettle', {'id': 'antigo', 'type': 'time', 'timestamp': 1000.0})
+        store.add_alarm('kettle', {'id': 'novo', 'type': 'time', 'timestamp': 3900.0})
+        store.flush()
+
+        assert store.purge_before('readings', 1500.0, batch_size=128) == 500  # Em vários lotes
+        assert store.readings('kettle')['timestamps'][0] == 1500.0
+
+        compactor = HistoryCompactor({'raw': 1000.0, 'alarms': 500.0}, VirtualClock(speed=None, start_time=4000.0),
+                                     database=store)
+        result = compactor.run_once()
+        assert result['db_readings_deleted'] == 1500 and result['db_alarms_deleted'] == 1
+        assert store.count_readings('kettle') == 1000
+        assert [alarm['id'] for alarm in store.alarms('kettle')] == ['novo']
+        store.close()
+    print("✅ Limpeza e compactação funcionando!")
+
+def test_reader_pool():
+    print("🔍 Testando conexões de leitura compartilhadas...")
+    with tempfile.TemporaryDirectory() as directory:
+        store = SQLiteHistoryStore(os.path.join(directory, 'history.db'), pool_size=2)
+        store.add_reading('kettle', 1000.0, 20.0, 1.0, 100.0)
+        store.flush()
+        counts = []
+
+        def request():
+            for _ in range(20):
+                counts.append(store.count_readings('kettle'))
+
+        threads = [threading.Thread(target=request) for _ in range(8)]  # Uma thread por requisição
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert counts == [1] * 160
+        assert store.stats()['reader_connections'] <= 2
+        store.close()
+    print("✅ Conexões reutilizadas!")
+
+def test_historical_data_from_database():
+    print("🔍 Testando /api/historical_data com HISTORY_DB...")
+    from src import web_app
+    web_app.initialize_systems()
+    client = web_app.app.test_client()
+    with tempfile.TemporaryDirectory() as directory:
+        store = SQLiteHistoryStore(os.path.join(directory, 'history.db'), batch_size=5000)
+        device_id = web_app.devices.default.device_id
+        start = 1_699_999_200.0
+        for i in range(2 * 86400 // 3):  # 2 dias, uma leitura a cada 3 s
+            store.add_reading(device_id, start + i * 3, 20.0 + (i % 100) * 0.1, 1.0, 100.0)
+        store.flush()
+        raw_reads = []
+        readings = store.readings
+
+        def counted_readings(*args, **kwargs):
+            raw_reads.append(kwargs)
+            return readings(*args, **kwargs)
+
+        store.readings = counted_readings
+        history_db, web_app.history_db = web_app.history_db, store
+        try:
+            # Nível escolhido pelo intervalo, sem carregar as leituras brutas
+            body = client.get('/api/historical_data?points=500&time_format=epoch').json
+            assert body['resolution'] == '1m' and len(body['timestamps']) == 500
+            assert raw_reads == []
+
+            # Dados brutos: limitados às leituras mais recentes
+            body = client.get('/api/historical_data?time_format=epoch').json
+            assert raw_reads[0]['limit'] == web_app.Config.HISTORY_CAPACITY
+            assert len(body['timestamps']) == min(web_app.Config.HISTORY_CAPACITY, 57600)
+            assert body['timestamps'][-1] == start + (57600 - 1) * 3
+        finally:
+            web_app.history_db = history_db
+            store.close()
+    print("✅ Histórico do banco servido sem leituras desnecessárias!")
+
+if __name__ == "__main__":
+    test_batched_inserts()
+    test_keyset_pagination()
+    test_purge_and_compaction()
+    test_reader_pool()
+    test_historical_data_from_database()
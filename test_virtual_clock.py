@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+Teste do relógio virtual com o sistema de alarmes
+"""
+import sys
+sys.path.append('src')
+
+from clock import VirtualClock, parse_speed
+from smart_alarm_manager import SmartAlarmManager
+
+def test_boiling_then_time_with_virtual_clock():
+    print("🔍 Testando fervura de 10 minutos com relógio virtual...")
+
+    clock = VirtualClock(speed=None, start_time=0.0)
+    alarm_manager = SmartAlarmManager(sound_enabled=False, clock=clock)
+    alarm_manager.start_monitoring()
+    alarm_manager.configure_alarm('boiling_then_time', duration=600)
+
+    # Fase 1: fervura detectada
+    triggered = alarm_manager.check_alarms({'temperature': 100.5}, {'pressure': 1.0}, 100.0)
+    assert [a['type'] for a in triggered] == ['BOILING_START']
+
+    # Fase 2: ainda não completou o tempo
+    clock.advance(599)
+    assert alarm_manager.check_alarms({'temperature': 100.5}, {'pressure': 1.0}, 100.0) == []
+
+    clock.advance(1)
+    triggered = alarm_manager.check_alarms({'temperature': 100.5}, {'pressure': 1.0}, 100.0)
+    assert [a['type'] for a in triggered] == ['TIME_COMPLETE']
+    assert triggered[0]['elapsed_time'] == 600
+    print("✅ Cozimento de 10 minutos simulado instantaneamente!")
+
+def test_parse_speed():
+    assert parse_speed('100x') == 100.0
+    assert parse_speed('2.5') == 2.5
+    assert parse_speed('max') is None
+
+if __name__ == "__main__":
+    test_boiling_then_time_with_virtual_clock()
+    test_parse_speed()